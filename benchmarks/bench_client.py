@@ -0,0 +1,126 @@
+"""
+Measures the throughput and latency of `Client` and `AsyncClient` against a local stand-in server, at several levels
+of concurrency.
+
+The server is a `FakePasteMyst` listening on localhost from its own thread, so requests go through real sockets and
+connection pooling. It shares the process, and so the GIL, with the client: the numbers are comparable between runs
+on the same machine, not with the real API.
+
+    $ python benchmarks/bench_client.py
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+import trio
+
+from harness import Result, format_seconds
+from pastemyst import AsyncClient, Client
+from pastemyst.testing import FakePasteMyst, generate_dataset
+
+
+CONCURRENCY: Tuple[int, ...] = (1, 8, 32)
+
+
+class LocalServer:
+    """
+    Runs a fake API server on a background thread for the duration of a `with` block.
+    """
+
+    __slots__ = ("fake", "port", "__thread", "__token", "__scope")
+
+    def __init__(self, fake: FakePasteMyst):
+        self.fake = fake
+        self.port: Optional[int] = None
+        self.__thread: Optional[threading.Thread] = None
+        self.__token: Optional[trio.lowlevel.TrioToken] = None
+        self.__scope: Optional[trio.CancelScope] = None
+
+    @property
+    def endpoint(self) -> str:
+        return f"http://127.0.0.1:{self.port}/api/v2"
+
+    def __enter__(self) -> "LocalServer":
+        started: threading.Event = threading.Event()
+        self.__thread = threading.Thread(target=trio.run, args=(self.__main, started), name="fake-pastemyst", daemon=True)
+        self.__thread.start()
+        started.wait()
+        return self
+
+    async def __main(self, started: threading.Event) -> None:
+        async with trio.open_nursery() as nursery:
+            self.port = await nursery.start(self.fake.serve)
+            self.__token = trio.lowlevel.current_trio_token()
+            self.__scope = nursery.cancel_scope
+            started.set()
+
+    def __exit__(self, *args) -> None:
+        trio.from_thread.run_sync(self.__scope.cancel, trio_token=self.__token)
+        self.__thread.join()
+
+
+def bench_sync(server: LocalServer, paste_ids: List[str], concurrency: int, calls: int) -> Result:
+    latencies: List[float] = []
+
+    with Client(endpoint=server.endpoint, coalesce=False) as client:
+        # the first call starts the loop and opens a connection, keep it out of the measurement
+        client.get_paste(paste_ids[0])
+
+        def call(index: int) -> None:
+            started_at: float = time.perf_counter()
+            client.get_paste(paste_ids[index % len(paste_ids)])
+            latencies.append(time.perf_counter() - started_at)
+
+        started_at: float = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as executor:
+            list(executor.map(call, range(calls)))
+        elapsed: float = time.perf_counter() - started_at
+
+    return Result(f"client.sync_get_paste[c={concurrency}]", latencies, concurrency=concurrency, calls=calls, throughput=calls / elapsed)
+
+
+def bench_async(server: LocalServer, paste_ids: List[str], concurrency: int, calls: int) -> Result:
+    latencies: List[float] = []
+
+    async def main() -> float:
+        async with AsyncClient(endpoint=server.endpoint, coalesce=False) as client:
+            await client.get_paste(paste_ids[0])
+
+            async def worker(start: int) -> None:
+                for index in range(start, calls, concurrency):
+                    started_at: float = time.perf_counter()
+                    await client.get_paste(paste_ids[index % len(paste_ids)])
+                    latencies.append(time.perf_counter() - started_at)
+
+            started_at: float = time.perf_counter()
+            async with trio.open_nursery() as nursery:
+                for start in range(concurrency):
+                    nursery.start_soon(worker, start)
+            return time.perf_counter() - started_at
+
+    elapsed: float = trio.run(main)
+    return Result(f"client.async_get_paste[c={concurrency}]", latencies, concurrency=concurrency, calls=calls, throughput=calls / elapsed)
+
+
+def run(quick: bool = False) -> List[Result]:
+    calls: int = 200 if quick else 2000
+    fake: FakePasteMyst = FakePasteMyst(generate_dataset(seed=0, pastes=100, pasties=3, code_size=1024))
+    paste_ids: List[str] = sorted(fake.pastes)
+
+    results: List[Result] = []
+    with LocalServer(fake) as server:
+        for concurrency in CONCURRENCY:
+            results.append(bench_sync(server, paste_ids, concurrency, calls))
+        for concurrency in CONCURRENCY:
+            results.append(bench_async(server, paste_ids, concurrency, calls))
+    return results
+
+
+def main() -> None:
+    for result in run():
+        print(f"{result.name:<36} {result.extra['throughput']:>10.1f} calls/s  median {format_seconds(result.median):>9}  p95 {format_seconds(result.percentile(95)):>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Compares the installed JSON codecs on realistic paste payloads.
+
+Each payload is decoded from the bytes of a response body and encoded back to bytes, like `HttpClient` does.
+
+    $ python benchmarks/bench_codec.py
+"""
+import random
+import string
+import time
+from typing import Any, Callable, Dict, List
+
+from pastemyst.utils.codec import JsonCodec, available_codecs
+
+
+def make_code(size: int, rng: random.Random) -> str:
+    lines: List[str] = []
+    length: int = 0
+    while length < size:
+        indent: str = "    " * rng.randint(0, 3)
+        line: str = indent + " ".join("".join(rng.choices(string.ascii_lowercase, k=rng.randint(2, 10))) for _ in range(rng.randint(1, 8)))
+        if rng.random() < 0.1:
+            line += '  # "quoted" \\ üñíçødé'
+        lines.append(line)
+        length += len(line) + 1
+    return "\n".join(lines)
+
+
+def make_paste(pasties: int, code_size: int, edits: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "_id": "".join(rng.choices(string.ascii_lowercase + string.digits, k=8)),
+        "ownerId": "",
+        "title": "benchmark paste",
+        "createdAt": 1700000000,
+        "expiresIn": "1w",
+        "deletesAt": 1700604800,
+        "stars": 3,
+        "isPrivate": False,
+        "isPublic": True,
+        "tags": ["benchmark", "logs"],
+        "pasties": [
+            {"_id": f"p{i}", "language": "Python", "title": f"file{i}.py", "code": make_code(code_size, rng)}
+            for i in range(pasties)
+        ],
+        "edits": [
+            {"_id": f"e{i}", "editId": f"e{i}", "editType": 3, "metadata": ["p0"], "edit": make_code(200, rng), "editedAt": 1700000000 + i}
+            for i in range(edits)
+        ],
+        "encrypted": False
+    }
+
+
+PAYLOADS: Dict[str, Dict[str, Any]] = {
+    "small": make_paste(1, 200, 0, random.Random(1)),
+    "many pasties": make_paste(200, 2_000, 0, random.Random(2)),
+    "long history": make_paste(1, 2_000, 500, random.Random(3)),
+    "huge log": make_paste(1, 8_000_000, 0, random.Random(4))
+}
+
+
+def measure(fn: Callable[[], Any], budget: float = 0.5) -> float:
+    runs: int = 0
+    start: float = time.perf_counter()
+    while True:
+        fn()
+        runs += 1
+        elapsed: float = time.perf_counter() - start
+        if elapsed >= budget:
+            return elapsed / runs
+
+
+def main() -> None:
+    codecs: Dict[str, JsonCodec] = {name: codec() for name, codec in available_codecs().items()}
+
+    print(f"{'payload':<14} {'size':>10} {'codec':<8} {'loads':>12} {'dumps':>12}")
+    for name, payload in PAYLOADS.items():
+        raw: bytes = codecs["json"].dumps(payload)
+        for codec_name, codec in codecs.items():
+            loads: float = measure(lambda: codec.loads(raw))
+            dumps: float = measure(lambda: codec.dumps(payload))
+            print(f"{name:<14} {len(raw):>10} {codec_name:<8} {loads * 1e6:>10.1f}us {dumps * 1e6:>10.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""
+Measures building the models from API payloads, and serializing pastes.
+
+    $ python benchmarks/bench_models.py
+"""
+import random
+import string
+from typing import Any, Dict, List
+
+from bench_codec import make_code, make_paste
+from harness import Result, measure, format_seconds
+from pastemyst import Paste, Pasty, PasteResult, User, LanguageInfo, Language, ExpiresIn
+
+
+def make_user(stars: int, services: int, rng: random.Random) -> Dict[str, Any]:
+    return {
+        "_id": "x9mm7mh7",
+        "username": "benchmark",
+        "avatarUrl": "https://paste.myst.rs/static/assets/icons/default.png",
+        "defaultLang": "Python",
+        "publicProfile": True,
+        "supporterLength": 12,
+        "contributor": False,
+        "stars": ["".join(rng.choices(string.ascii_lowercase + string.digits, k=8)) for _ in range(stars)],
+        "serviceIds": {f"service{i}": str(rng.randrange(10 ** 9)) for i in range(services)}
+    }
+
+
+def make_language(extensions: int) -> Dict[str, Any]:
+    return {
+        "name": "Python",
+        "mode": "python",
+        "mimes": [f"text/x-python{i}" for i in range(extensions)],
+        "ext": [f"py{i}" for i in range(extensions)],
+        "color": "#3572A5"
+    }
+
+
+def make_paste_model(pasties: int, code_size: int, rng: random.Random) -> Paste:
+    return Paste(
+        title="benchmark paste",
+        pasties=[Pasty(title=f"file{i}.py", code=make_code(code_size, rng), language=Language.PYTHON) for i in range(pasties)],
+        expires_in=ExpiresIn.ONE_WEEK,
+        tags=["benchmark", "logs"]
+    )
+
+
+def run(quick: bool = False) -> List[Result]:
+    repeat: int = 3 if quick else 7
+    huge: Dict[str, Any] = {
+        "paste": make_paste(200, 2_000, 500, random.Random(2)),
+        "user": make_user(10_000, 50, random.Random(3)),
+        "language": make_language(1_000),
+        "model": make_paste_model(1_000, 200, random.Random(4))
+    }
+    small: Dict[str, Any] = {
+        "paste": make_paste(1, 200, 0, random.Random(1)),
+        "user": make_user(3, 1, random.Random(1)),
+        "language": make_language(3),
+        "model": make_paste_model(1, 200, random.Random(1))
+    }
+
+    for payloads in (small, huge):
+        payloads["binary"] = PasteResult.from_dict(payloads["paste"]).to_bytes()
+
+    results: List[Result] = []
+    for size, payloads in (("small", small), ("huge", huge)):
+        results.append(measure(f"models.paste_from_dict[{size}]", lambda: PasteResult.from_dict(payloads["paste"]), repeat))
+        results.append(measure(f"models.paste_from_dict_lazy[{size}]", lambda: PasteResult.from_dict(payloads["paste"], lazy=True), repeat))
+        results.append(measure(f"models.user_from_dict[{size}]", lambda: User.from_dict(payloads["user"]), repeat))
+        results.append(measure(f"models.language_from_dict[{size}]", lambda: LanguageInfo.from_dict(payloads["language"]), repeat))
+        results.append(measure(f"models.paste_to_dict[{size}]", lambda: payloads["model"].to_dict(), repeat))
+        results.append(measure(f"models.paste_from_bytes[{size}]", lambda: PasteResult.from_bytes(payloads["binary"]), repeat))
+        results.append(measure(f"models.get_pasty_by_name[{size}]", lambda: payloads["model"].get_pasty_by_name(payloads["model"].pasties[-1].title), repeat))
+    return results
+
+
+def main() -> None:
+    for result in run():
+        print(f"{result.name:<36} {format_seconds(result.median):>10}")
+
+
+if __name__ == "__main__":
+    main()
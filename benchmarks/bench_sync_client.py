@@ -0,0 +1,72 @@
+"""
+Measures the per-call overhead of the synchronous client.
+
+Compares running every request in a fresh `trio.run` (how the client used to work) against the client's persistent
+background loop. Requests are answered by an in-memory transport, so the numbers only reflect the client's own overhead.
+
+    $ python benchmarks/bench_sync_client.py [calls]
+"""
+import sys
+import time
+
+import httpx
+import trio
+
+from pastemyst import Client
+from pastemyst.api.http import HttpClient
+
+
+PASTE: dict = {
+    "_id": "bench123",
+    "ownerId": "",
+    "title": "benchmark",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "bench.py", "code": "print('hello')"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=PASTE)
+
+
+def bench_trio_run_per_call(calls: int) -> float:
+    api: HttpClient = HttpClient(transport=httpx.MockTransport(handler))
+
+    start: float = time.perf_counter()
+    for _ in range(calls):
+        trio.run(api.get_paste, PASTE["_id"])
+    return time.perf_counter() - start
+
+
+def bench_persistent_loop(calls: int) -> float:
+    with Client(transport=httpx.MockTransport(handler)) as client:
+        # the first call starts the loop, keep it out of the measurement like a long-running process would
+        client.get_paste(PASTE["_id"])
+
+        start: float = time.perf_counter()
+        for _ in range(calls):
+            client.get_paste(PASTE["_id"])
+        return time.perf_counter() - start
+
+
+def main() -> None:
+    calls: int = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+
+    per_call: float = bench_trio_run_per_call(calls)
+    persistent: float = bench_persistent_loop(calls)
+
+    print(f"trio.run per call: {per_call / calls * 1e6:8.1f} us/call")
+    print(f"persistent loop:   {persistent / calls * 1e6:8.1f} us/call")
+    print(f"speedup:           {per_call / persistent:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Compares two runs of the benchmark suite, and exits with status 1 if any benchmark got slower.
+
+    $ python benchmarks/compare.py baseline.json results.json [--threshold 0.1]
+"""
+import argparse
+import sys
+from typing import Any, Dict, List
+
+from harness import load, compare, format_seconds
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="compare two runs of the pastemyst benchmark suite")
+    parser.add_argument("baseline", help="the results of the older run")
+    parser.add_argument("current", help="the results of the newer run")
+    parser.add_argument("--threshold", type=float, default=0.1, help="the relative slowdown that counts as a regression")
+    args = parser.parse_args()
+
+    baseline: Dict[str, Any] = load(args.baseline)
+    current: Dict[str, Any] = load(args.current)
+    for key in ("python", "implementation", "machine", "codec"):
+        if baseline["environment"].get(key) != current["environment"].get(key):
+            print(f"warning: the runs differ in {key}: {baseline['environment'].get(key)} != {current['environment'].get(key)}")
+
+    rows: List[Dict[str, Any]] = compare(baseline, current, args.threshold)
+    for row in rows:
+        print(f"{row['name']:<36} {format_seconds(row['baseline']):>9} -> {format_seconds(row['current']):>9}  {row['ratio']:6.2f}x  {row['verdict']}")
+
+    sys.exit(1 if any(row["verdict"] == "slower" for row in rows) else 0)
+
+
+if __name__ == "__main__":
+    main()
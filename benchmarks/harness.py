@@ -0,0 +1,148 @@
+"""
+The measuring, storing and comparing shared by the benchmark suite.
+
+Results are stored as JSON, so runs of different versions can be compared with `compare.py`:
+
+    {
+        "format": 1,
+        "environment": {"python": "3.12.1", "pastemyst": "3.0.0", "codec": "msgspec", ...},
+        "results": [{"name": "models.paste_from_dict[small]", "unit": "s", "samples": [...], "median": ..., ...}]
+    }
+"""
+import datetime
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import timeit
+from typing import Any, Callable, Dict, List, Optional
+
+from pastemyst.__version__ import __version__
+from pastemyst.utils.codec import get_codec
+
+
+FORMAT: int = 1
+
+
+class Result:
+    """
+    The measurements of a single benchmark.
+
+    Attributes:
+        - name (str): The name of the benchmark, such as `models.paste_from_dict[huge]`.
+        - samples (List[float]): The measured seconds per operation, one per repeat, or per call for client benchmarks.
+        - extra (Dict[str, Any]): Other figures of the benchmark, such as its throughput.
+    """
+
+    __slots__ = ("name", "samples", "extra")
+
+    def __init__(self, name: str, samples: List[float], **extra: Any):
+        self.name = name
+        self.samples = samples
+        self.extra = extra
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.samples)
+
+    def percentile(self, percentile: float) -> float:
+        ordered: List[float] = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * percentile / 100))]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "unit": "s",
+            "samples": self.samples,
+            "min": min(self.samples),
+            "median": self.median,
+            "mean": statistics.fmean(self.samples),
+            "p95": self.percentile(95),
+            "stdev": statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0,
+            **self.extra
+        }
+
+    def __repr__(self) -> str:
+        return "<Result name={0.name!r} median={0.median:.9f}>".format(self)
+
+
+def measure(name: str, fn: Callable[[], Any], repeat: int = 5, **extra: Any) -> Result:
+    """
+    Times a function like `timeit`, with the garbage collector off and the amount of calls per repeat calibrated to
+    take at least 0.2 seconds.
+
+    :param name: The name of the benchmark.
+    :param fn: The function to time.
+    :param repeat: The amount of timed repeats.
+    :return: The seconds per call of each repeat.
+    """
+    timer: timeit.Timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    return Result(name, [elapsed / number for elapsed in timer.repeat(repeat, number)], number=number, **extra)
+
+
+def environment() -> Dict[str, Any]:
+    """
+    Describes where the benchmarks ran, so only comparable runs get compared.
+    """
+    try:
+        commit: Optional[str] = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    return {
+        "pastemyst": __version__,
+        "commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "codec": get_codec().name,
+        "gc": gc.isenabled(),
+        "time": datetime.datetime.now(datetime.timezone.utc).isoformat()
+    }
+
+
+def save(path: str, results: List[Result]) -> None:
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump({"format": FORMAT, "environment": environment(), "results": [result.to_dict() for result in results]}, file, indent=2)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, "r", encoding="utf-8") as file:
+        data: Dict[str, Any] = json.load(file)
+
+    if data.get("format") != FORMAT:
+        raise ValueError(f"{path} isn't a benchmark result file of format {FORMAT}")
+    return data
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any], threshold: float = 0.1) -> List[Dict[str, Any]]:
+    """
+    Compares the median of every benchmark found in both runs.
+
+    :param baseline: The results of the older run, as loaded by `load`.
+    :param current: The results of the newer run, as loaded by `load`.
+    :param threshold: The relative slowdown of the median above which a benchmark counts as a regression.
+    :return: A row per benchmark, with its medians, their ratio and its verdict: "faster", "slower" or "same".
+    """
+    before: Dict[str, Dict[str, Any]] = {result["name"]: result for result in baseline["results"]}
+
+    rows: List[Dict[str, Any]] = []
+    for result in current["results"]:
+        old: Optional[Dict[str, Any]] = before.get(result["name"])
+        if old is None:
+            continue
+
+        ratio: float = result["median"] / old["median"] if old["median"] else float("inf")
+        verdict: str = "slower" if ratio > 1 + threshold else "faster" if ratio < 1 / (1 + threshold) else "same"
+        rows.append({"name": result["name"], "baseline": old["median"], "current": result["median"], "ratio": ratio, "verdict": verdict})
+    return rows
+
+
+def format_seconds(seconds: float) -> str:
+    for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f}{unit}"
+    return f"{seconds / 1e-9:.0f}ns"
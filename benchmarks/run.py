@@ -0,0 +1,39 @@
+"""
+Runs the benchmark suite and stores the results as JSON, to compare with another run using `compare.py`.
+
+    $ python benchmarks/run.py --output results.json [--quick] [--only models]
+"""
+import argparse
+from typing import List
+
+import bench_client
+import bench_models
+from harness import Result, save, format_seconds
+
+
+SUITES = {
+    "models": bench_models.run,
+    "client": bench_client.run
+}
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description="run the pastemyst benchmark suite")
+    parser.add_argument("--output", "-o", help="the file to store the results in, as json")
+    parser.add_argument("--quick", action="store_true", help="fewer repeats and calls, for a quick check")
+    parser.add_argument("--only", choices=sorted(SUITES), action="append", help="only run the given suites")
+    args = parser.parse_args()
+
+    results: List[Result] = []
+    for name in args.only or SUITES:
+        for result in SUITES[name](args.quick):
+            print(f"{result.name:<36} median {format_seconds(result.median):>9}  p95 {format_seconds(result.percentile(95)):>9}", flush=True)
+            results.append(result)
+
+    if args.output:
+        save(args.output, results)
+        print(f"saved {len(results)} results to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
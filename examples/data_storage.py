@@ -49,6 +49,9 @@ class DataStorage:
     def set(self, key: str, value: Any) -> None:
         self.data[key] = value
 
+    def close(self) -> None:
+        self.client.close()
+
     def __enter__(self):
         pass
 
@@ -72,3 +75,4 @@ if __name__ == "__main__":
             store.data["counter"] += 1
 
     print("done")
+    store.close()
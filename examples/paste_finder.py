@@ -7,8 +7,6 @@ from pastemyst import *
 
 BASE_36_CHARS: str = "0123456789abcdefghijklmnopqrstuvwxyz"
 
-client: Client = Client()
-
 
 def encode_base_36(number: int) -> str:
     result: str = ""
@@ -31,23 +29,24 @@ def generate_id() -> str:
     return new_id
 
 
-def paste_exists(paste_id: str) -> bool:
+def paste_exists(client: Client, paste_id: str) -> bool:
     return client.paste_exists(paste_id)
 
 
 def run():
     pastes: List[PasteResult] = []
     i: int = 0
-    while i < 1_000_000:
-        #pid = generate_id()
-        pid = random_base36_id()
-        print(f"looking for {pid}")
-        if paste_exists(pid):
-            paste: PasteResult = client.get_paste(pid)
-            pastes.append(paste)
-            print(f"--- -- found paste: {pid}")
-        i += 1
-        time.sleep(0.25)
+    with Client() as client:
+        while i < 1_000_000:
+            #pid = generate_id()
+            pid = random_base36_id()
+            print(f"looking for {pid}")
+            if paste_exists(client, pid):
+                paste: PasteResult = client.get_paste(pid)
+                pastes.append(paste)
+                print(f"--- -- found paste: {pid}")
+            i += 1
+            time.sleep(0.25)
 
     print(pastes)
 
@@ -1,5 +1,7 @@
 from pastemyst.client import Client
+from pastemyst.async_client import AsyncClient
 from pastemyst.constants import *
 from pastemyst.models import *
 from pastemyst.api import *
 from pastemyst.utils import *
+from pastemyst.cache import *
@@ -1 +1,10 @@
-from .locks import HoldableLock, GlobalLock
+from .loop import LoopThread
+from .compression import Compression, CompressionStats
+from .hedge import HedgePolicy, HedgeState
+from .events import EventType, RequestEvent, EventHook
+from .metrics import MetricsRegistry, Histogram
+from .tracing import Tracer, Span, RecordingTracer, RecordedSpan, OpenTelemetryTracer
+from .profiler import Profiler, PhaseStats
+from .ratelimit import RateLimiter, Bucket, BucketState
+from .retry import RetryPolicy, RetryBudget, CircuitBreaker, CircuitState, RetryEngine, RetryState
+from .singleflight import SingleFlight
@@ -0,0 +1,147 @@
+import gzip
+import zlib
+from collections import deque
+from typing import Deque, Iterable, List, Optional, Tuple
+
+try:
+    import brotli
+except ImportError:
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+def _supported_encodings() -> Tuple[str, ...]:
+    if brotli is not None:
+        return "br", "gzip", "deflate"
+    return "gzip", "deflate"
+
+
+class CompressionStats:
+    """
+    The measured compression of a single request.
+
+    Ratios are the original size divided by the size on the wire, so 4.0 means the body was a quarter of its size when
+    sent, and 1.0 means it wasn't compressed.
+
+    Attributes:
+        - route (str): The route of the request, such as `POST./paste`.
+        - request_encoding (Optional[str]): The encoding the request body was sent with, or None if it was sent as is.
+        - request_size (int): The size of the request body, in bytes.
+        - request_sent (int): The size of the request body on the wire, in bytes.
+        - response_encoding (Optional[str]): The encoding the response body was received with, or None if it wasn't encoded.
+        - response_size (int): The size of the decoded response body, in bytes.
+        - response_received (int): The size of the response body on the wire, in bytes.
+    """
+
+    __slots__ = ("route", "request_encoding", "request_size", "request_sent", "response_encoding", "response_size", "response_received")
+
+    def __init__(self, route: str, request_encoding: Optional[str], request_size: int, request_sent: int, response_encoding: Optional[str], response_size: int, response_received: int):
+        self.route = route
+        self.request_encoding = request_encoding
+        self.request_size = request_size
+        self.request_sent = request_sent
+        self.response_encoding = response_encoding
+        self.response_size = response_size
+        self.response_received = response_received
+
+    @property
+    def request_ratio(self) -> float:
+        return self.request_size / self.request_sent if self.request_sent else 1.0
+
+    @property
+    def response_ratio(self) -> float:
+        return self.response_size / self.response_received if self.response_received else 1.0
+
+    def __repr__(self) -> str:
+        return "<CompressionStats route={0.route!r} request_ratio={0.request_ratio:.2f} response_ratio={0.response_ratio:.2f}>".format(self)
+
+
+class Compression:
+    """
+    Compresses request bodies, negotiates compressed responses, and keeps the measured compression of recent requests.
+
+    Request bodies smaller than `threshold` bytes are sent as is, since compressing them costs more than it saves.
+    Responses are always negotiated with an explicit `Accept-Encoding` header, and decoded by httpx.
+
+    Brotli (`br`) needs the `brotli` or `brotlicffi` package. Note that the server must accept compressed request
+    bodies, which is why request compression is opt-in.
+    """
+
+    __slots__ = ("encoding", "threshold", "level", "accept", "history")
+
+    def __init__(self, encoding: Optional[str] = "gzip", threshold: int = 1024, level: int = None, accept: Iterable[str] = None, history: int = 100):
+        """
+        :param encoding: The encoding for request bodies: "gzip", "deflate" or "br". Request bodies aren't compressed if None.
+        :type encoding: Optional[str]
+        :param threshold: The size, in bytes, below which request bodies aren't compressed.
+        :type threshold: int
+        :param level: The compression level, or the encoding's default if None.
+        :type level: int
+        :param accept: The encodings accepted for responses, in order of preference. Every supported encoding if None.
+        :type accept: Iterable[str]
+        :param history: The amount of requests to keep the measured compression of.
+        :type history: int
+        """
+        supported: Tuple[str, ...] = _supported_encodings()
+        if encoding is not None and encoding not in supported:
+            raise ValueError(f"unsupported compression encoding: {encoding}. supported encodings are {', '.join(supported)}")
+
+        self.encoding = encoding
+        self.threshold = threshold
+        self.level = level
+        self.accept: Tuple[str, ...] = tuple(accept) if accept is not None else supported
+        self.history: Deque[CompressionStats] = deque(maxlen=history)
+
+    @property
+    def accept_encoding(self) -> str:
+        """
+        Get the value of the `Accept-Encoding` header.
+
+        :return: The accepted encodings, or `identity` if none are.
+        :rtype: str
+        """
+        return ", ".join(self.accept) or "identity"
+
+    def compress(self, body: bytes) -> Tuple[bytes, Optional[str]]:
+        """
+        Compresses a request body, if it's big enough to be worth it.
+
+        :param body: The request body.
+        :type body: bytes
+        :return: The body to send, and the encoding it was compressed with, or None if it wasn't.
+        :rtype: Tuple[bytes, Optional[str]]
+        """
+        if self.encoding is None or len(body) < self.threshold:
+            return body, None
+
+        if self.encoding == "gzip":
+            compressed: bytes = gzip.compress(body, compresslevel=6 if self.level is None else self.level, mtime=0)
+        elif self.encoding == "deflate":
+            compressed: bytes = zlib.compress(body, -1 if self.level is None else self.level)
+        else:
+            compressed: bytes = brotli.compress(body) if self.level is None else brotli.compress(body, quality=self.level)
+
+        if len(compressed) >= len(body):
+            return body, None
+        return compressed, self.encoding
+
+    def record(self, stats: CompressionStats) -> None:
+        """
+        Keeps the measured compression of a request.
+
+        :param stats: The measured compression.
+        :type stats: CompressionStats
+        :return: None
+        """
+        self.history.append(stats)
+
+    def stats(self) -> List[CompressionStats]:
+        """
+        Get the measured compression of recent requests.
+
+        :return: The measured compression of recent requests, oldest first.
+        :rtype: List[CompressionStats]
+        """
+        return list(self.history)
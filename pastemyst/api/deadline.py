@@ -0,0 +1,28 @@
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import anyio
+
+from pastemyst.models import PastemystTimeoutError
+
+
+@contextmanager
+def deadline(timeout: Optional[float]) -> Iterator[None]:
+    """
+    Cancels the code in the block if it runs longer than `timeout` seconds, using a cancel scope of the running event
+    loop, so it works the same under trio and asyncio. Deadlines can be nested, and the earliest one wins.
+
+    :param timeout: The amount of seconds the block may run for. The block runs without a deadline if None.
+    :type timeout: Optional[float]
+    :return: A context manager enforcing the deadline.
+    :rtype: Iterator[None]
+    :raises PastemystTimeoutError: If the deadline passes before the block finishes.
+    """
+    if timeout is None:
+        yield
+        return
+
+    with anyio.move_on_after(timeout) as scope:
+        yield
+    if scope.cancelled_caught:
+        raise PastemystTimeoutError(f"call timed out after {timeout}s")
@@ -0,0 +1,70 @@
+from enum import Enum
+from typing import Callable, Optional
+
+
+class EventType(str, Enum):
+    """
+    The kind of a request event.
+
+    :param str REQUEST: A call to the API started.
+    :param str RATELIMIT_WAIT: An attempt waited for the rate limiter before being sent.
+    :param str RESPONSE: An attempt got a response, successful or not.
+    :param str RETRY: A failed attempt is about to be retried.
+    :param str ERROR: A call failed, after all of its retries.
+    """
+
+    REQUEST:        str = "request"
+    RATELIMIT_WAIT: str = "ratelimit_wait"
+    RESPONSE:       str = "response"
+    RETRY:          str = "retry"
+    ERROR:          str = "error"
+
+
+class RequestEvent:
+    """
+    Something that happened while making a call to the API, passed to every event hook of the client.
+
+    Attributes:
+        - type (EventType): What happened.
+        - route (str): The route template of the call, such as `GET./paste/{paste_id}`.
+        - attempt (int): The number of the attempt, starting at 1. 0 for events about the whole call.
+        - status_code (Optional[int]): The status code of the response, if there was one.
+        - bytes_sent (int): The size of the request body on the wire, in bytes.
+        - bytes_received (int): The size of the response body on the wire, in bytes.
+        - lock_wait (float): Seconds the attempt waited for the rate limiter.
+        - latency (float): Seconds since the call started.
+        - delay (float): For `RETRY`, seconds until the retry is sent.
+        - error (Optional[BaseException]): For `RETRY` and `ERROR`, the error the attempt or call failed with, if any.
+    """
+
+    __slots__ = ("type", "route", "attempt", "status_code", "bytes_sent", "bytes_received", "lock_wait", "latency", "delay", "error")
+
+    def __init__(
+        self,
+        type: EventType,
+        route: str,
+        attempt: int = 0,
+        status_code: Optional[int] = None,
+        bytes_sent: int = 0,
+        bytes_received: int = 0,
+        lock_wait: float = 0.0,
+        latency: float = 0.0,
+        delay: float = 0.0,
+        error: Optional[BaseException] = None
+    ):
+        self.type = type
+        self.route = route
+        self.attempt = attempt
+        self.status_code = status_code
+        self.bytes_sent = bytes_sent
+        self.bytes_received = bytes_received
+        self.lock_wait = lock_wait
+        self.latency = latency
+        self.delay = delay
+        self.error = error
+
+    def __repr__(self) -> str:
+        return "<RequestEvent type={0.type.value} route={0.route!r} attempt={0.attempt} status_code={0.status_code}>".format(self)
+
+
+EventHook = Callable[[RequestEvent], None]
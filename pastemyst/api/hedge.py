@@ -0,0 +1,143 @@
+import math
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional
+
+
+class HedgeState:
+    """
+    A point in time view of a client's request hedging.
+
+    Attributes:
+        - requests (int): The amount of requests that could have been hedged.
+        - hedges (int): The amount of hedged requests sent.
+        - wins (int): The amount of hedged requests that answered before the original request.
+        - skipped (int): The amount of hedges skipped because the rate limit bucket was nearly empty.
+        - delays (Dict[str, float]): The current hedge delay of each route, in seconds.
+    """
+
+    __slots__ = ("requests", "hedges", "wins", "skipped", "delays")
+
+    def __init__(self, requests: int, hedges: int, wins: int, skipped: int, delays: Dict[str, float]):
+        self.requests = requests
+        self.hedges = hedges
+        self.wins = wins
+        self.skipped = skipped
+        self.delays = delays
+
+    def __repr__(self) -> str:
+        return "<HedgeState requests={0.requests} hedges={0.hedges} wins={0.wins}>".format(self)
+
+
+class HedgePolicy:
+    """
+    Decides when a slow idempotent request gets a second, hedged copy sent alongside it.
+
+    If the original request hasn't answered after the `percentile` latency of the route's recent requests, a hedged
+    copy is sent, and whichever answers first is used. The delay is clamped between `min_delay` and `max_delay`, and
+    is `max_delay` until the route has `min_samples` latencies recorded.
+
+    Hedging is rate limit aware: a hedge is skipped if it would leave fewer than `min_headroom` tokens in the route's
+    bucket, so hedges never eat into the budget of real requests.
+    """
+
+    __slots__ = ("percentile", "min_delay", "max_delay", "min_samples", "min_headroom", "methods", "window", "latencies", "requests", "hedges", "wins", "skipped")
+
+    def __init__(
+        self,
+        percentile: float = 95.0,
+        min_delay: float = 0.05,
+        max_delay: float = 2.0,
+        min_samples: int = 20,
+        min_headroom: int = 2,
+        window: int = 200,
+        methods: Iterable[str] = ("GET",)
+    ):
+        """
+        :param percentile: The latency percentile, between 0 and 100, after which a request is hedged.
+        :type percentile: float
+        :param min_delay: The shortest delay before hedging, in seconds.
+        :type min_delay: float
+        :param max_delay: The longest delay before hedging, in seconds.
+        :type max_delay: float
+        :param min_samples: The amount of latencies a route needs before its percentile is trusted.
+        :type min_samples: int
+        :param min_headroom: The amount of tokens that must be left in the bucket for a hedge to be sent.
+        :type min_headroom: int
+        :param window: The amount of recent latencies kept per route.
+        :type window: int
+        :param methods: The HTTP methods that are hedged. Only idempotent methods are safe to hedge.
+        :type methods: Iterable[str]
+        """
+        if not 0 < percentile <= 100:
+            raise ValueError("percentile must be between 0 and 100")
+
+        self.percentile = percentile
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self.min_headroom = min_headroom
+        self.window = window
+        self.methods = frozenset(methods)
+
+        self.latencies: Dict[str, Deque[float]] = {}
+        self.requests: int = 0
+        self.hedges: int = 0
+        self.wins: int = 0
+        self.skipped: int = 0
+
+    def record(self, key: str, latency: float) -> None:
+        """
+        Records the latency of a request.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :param latency: The latency of the request, in seconds.
+        :type latency: float
+        :return: None
+        """
+        latencies: Optional[Deque[float]] = self.latencies.get(key)
+        if latencies is None:
+            latencies = self.latencies[key] = deque(maxlen=self.window)
+        latencies.append(latency)
+
+    def delay(self, key: str) -> float:
+        """
+        Get how long to wait for the original request before hedging it.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :return: The amount of seconds to wait.
+        :rtype: float
+        """
+        latencies: Optional[Deque[float]] = self.latencies.get(key)
+        if latencies is None or len(latencies) < self.min_samples:
+            return self.max_delay
+
+        ordered = sorted(latencies)
+        index: int = min(len(ordered) - 1, max(0, math.ceil(len(ordered) * self.percentile / 100) - 1))
+        return min(self.max_delay, max(self.min_delay, ordered[index]))
+
+    def should_hedge(self, headroom: Optional[int]) -> bool:
+        """
+        Check if a hedge can be sent, and count it.
+
+        :param headroom: The tokens left in the route's bucket, or None if its limit isn't known.
+        :type headroom: Optional[int]
+        :return: True if the hedge should be sent, False otherwise.
+        :rtype: bool
+        """
+        if headroom is not None and headroom < self.min_headroom:
+            self.skipped += 1
+            return False
+
+        self.hedges += 1
+        return True
+
+    def state(self) -> HedgeState:
+        """
+        Get the current state of request hedging.
+
+        :return: A snapshot of the counters and the hedge delay of each route.
+        :rtype: HedgeState
+        """
+        return HedgeState(self.requests, self.hedges, self.wins, self.skipped, {key: self.delay(key) for key in self.latencies})
@@ -1,18 +1,24 @@
-import json
 import time
+from urllib.parse import quote
 
+import anyio
 import httpx
 from httpx import Response
-import trio
-from collections import defaultdict
 from enum import Enum
-from typing import Dict, Any, Coroutine, List
-
-from .locks import HoldableLock, GlobalLock
+from typing import Dict, Any, Coroutine, List, Optional, AsyncIterator, Tuple, Iterable
+
+from .compression import Compression, CompressionStats
+from .deadline import deadline
+from .events import EventType, RequestEvent, EventHook
+from .tracing import Tracer
+from .profiler import Profiler
+from .hedge import HedgePolicy
+from .ratelimit import RateLimiter
+from .retry import RetryEngine, RetryPolicy, RetryBudget, CircuitBreaker
 from pastemyst.constants import API
 from pastemyst.__version__ import __version__
-from pastemyst.utils import run_later
-from pastemyst.models import HttpError, PastemystError, RequestError, Paste
+from pastemyst.models import HttpError, RequestError, Paste, CircuitOpenError
+from pastemyst.utils.codec import JsonCodec, get_codec
 
 
 class HttpMethod(Enum):
@@ -23,27 +29,76 @@ class HttpMethod(Enum):
     DELETE = "DELETE"
 
 
-class HttpClient:
-    __slots__ = ("key", "is_dev", "retries", "buckets", "global_event", "http_endpoint", "headers", "session")
+class Route:
+    """
+    An API route, made from a path template and the parameters to fill it with.
+    Requests are rate limited per route template, so `/paste/{paste_id}` is one bucket no matter the paste id.
+    """
+
+    __slots__ = ("method", "path", "url")
+
+    def __init__(self, method: HttpMethod, path: str, **parameters: Any):
+        self.method = method
+        self.path = path if path.startswith("/") else f"/{path}"
+        self.url = self.path.format_map({key: quote(str(value), safe="") for key, value in parameters.items()}) if parameters else self.path
+
+    @property
+    def bucket(self) -> str:
+        return f"{self.method.value}.{self.path}"
 
-    def __init__(self, key: str = "", is_dev: bool = False):
+
+# the phases of a round trip, with the trace events that may start and end them, in order of preference
+_PHASES: Tuple[Tuple[str, Tuple[str, ...], Tuple[str, ...]], ...] = (
+    ("http.connect", ("connection.connect_tcp.started",), ("connection.start_tls.complete", "connection.connect_tcp.complete")),
+    ("http.send", ("send_request_headers.started",), ("send_request_body.complete", "send_request_headers.complete")),
+    ("http.ttfb", ("send_request_body.complete", "send_request_headers.complete"), ("receive_response_headers.complete",)),
+    ("http.body", ("receive_response_body.started",), ("receive_response_body.complete",))
+)
+
+
+class HttpClient:
+    __slots__ = ("key", "is_dev", "retry", "ratelimiter", "codec", "compression", "hedge", "timeout", "hooks", "tracer", "http_endpoint", "headers", "session")
+
+    def __init__(
+        self,
+        key: str = "",
+        is_dev: bool = False,
+        transport: httpx.AsyncBaseTransport = None,
+        *,
+        retry_policy: RetryPolicy = None,
+        retry_budget: RetryBudget = None,
+        circuit_breaker: CircuitBreaker = None,
+        codec: JsonCodec = None,
+        compression: Compression = None,
+        hedge_policy: HedgePolicy = None,
+        timeout: float = None,
+        hooks: Iterable[EventHook] = None,
+        tracer: Tracer = None,
+        endpoint: str = None
+    ):
         self.key = key
         self.is_dev = is_dev
-        self.retries = 5
-        self.buckets = defaultdict(trio.Lock)
-        self.global_event = trio.Event()
+        self.tracer = tracer or Tracer()
+        self.retry = RetryEngine(retry_policy, retry_budget, circuit_breaker)
+        self.ratelimiter = RateLimiter(self.tracer)
+        self.codec = codec or get_codec()
+        self.compression = compression or Compression(encoding=None)
+        self.hedge = hedge_policy
+        self.timeout = timeout
+        self.hooks: List[EventHook] = list(hooks or ())
 
-        self.http_endpoint = API.BETA_HTTP_ENDPOINT if self.is_dev else API.HTTP_ENDPOINT
+        self.http_endpoint = endpoint or (API.BETA_HTTP_ENDPOINT if self.is_dev else API.HTTP_ENDPOINT)
 
         self.headers = {
             "User-Agent": "PastemystPy ({})".format(__version__),
-            "content-type": "application/json"
+            "content-type": "application/json",
+            "Accept-Encoding": self.compression.accept_encoding
         }
 
         if self.key:
             self.headers["Authorization"] = self.key
 
-        self.session = httpx.AsyncClient(headers=self.headers)
+        self.session = httpx.AsyncClient(headers=self.headers, transport=transport)
 
     def auth(self, key: str) -> None:
         self.key = key
@@ -54,93 +109,367 @@ class HttpClient:
     def is_authenticated(self) -> bool:
         return self.key is not None and self.key != ""
 
-    async def request(self, method: HttpMethod, endpoint: str, **kwargs) -> Dict[str, Any] | int:
-        bucket: str = f"{method.value}.{endpoint}"
-        endpoint = self.http_endpoint + (endpoint if endpoint.startswith("/") else f"/{endpoint}")
-
-        lock: trio.Lock = self.buckets[bucket]
-
-        data: Dict[str, Any] | str | bytes = kwargs.get("data")
-        if data is not None:
-            if isinstance(data, dict):
-                data = json.dumps(data)
-            if isinstance(data, str):
-                data = data.encode("utf-8")
-
-        json_data: Dict[str, Any] | str = kwargs.get("json", {})
-
-        if self.global_event.is_set():
-            await self.global_event.wait()
-
-        async with HoldableLock(lock) as hold_lock:
-            async with trio.open_nursery() as nursery:
-                for tries in range(self.retries):
-                    response: Response = await self.session.request(method.value, endpoint, headers=self.headers, data=data, json=json_data)
+    async def close(self) -> None:
+        self.stop_profiling()
+        await self.session.aclose()
 
+    @property
+    def profiler(self) -> Optional[Profiler]:
+        return self.tracer if isinstance(self.tracer, Profiler) else None
+
+    def start_profiling(self, profiler: Profiler = None) -> Profiler:
+        if self.profiler is not None:
+            return self.profiler
+
+        profiler = profiler or Profiler()
+        profiler.inner = self.tracer
+
+        self.tracer = self.ratelimiter.tracer = profiler
+        return profiler
+
+    def stop_profiling(self) -> Optional[Profiler]:
+        profiler: Optional[Profiler] = self.profiler
+        if profiler is None:
+            return None
+
+        self.tracer = self.ratelimiter.tracer = profiler.inner
+        return profiler
+
+    def __emit(self, event_type: EventType, route: str, **fields: Any) -> None:
+        if not self.hooks:
+            return
+
+        event: RequestEvent = RequestEvent(event_type, route, **fields)
+        for hook in self.hooks:
+            hook(event)
+
+    async def request(self, route: Route, **kwargs) -> Dict[str, Any] | int:
+        started_at: float = time.monotonic()
+        timeout: Optional[float] = kwargs.pop("timeout", None)
+
+        try:
+            with self.tracer.span("http.request", route=route.bucket), deadline(self.timeout if timeout is None else timeout):
+                return await self.__request(route, started_at, **kwargs)
+        except Exception as e:
+            self.__emit(EventType.ERROR, route.bucket, status_code=getattr(e, "status_code", None), latency=time.monotonic() - started_at, error=e)
+            raise
+
+    async def __request(self, route: Route, called_at: float, **kwargs) -> Dict[str, Any] | int:
+        bucket: str = route.bucket
+        endpoint: str = self.http_endpoint + route.url
+
+        content: Dict[str, Any] | str | bytes = kwargs.get("json", kwargs.get("data"))
+        if content is not None:
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            elif not isinstance(content, bytes):
+                content = self.codec.dumps(content)
+
+        headers: Dict[str, str] = self.headers
+        request_size: int = len(content) if content is not None else 0
+        request_encoding: Optional[str] = None
+        if content is not None:
+            content, request_encoding = self.compression.compress(content)
+            if request_encoding is not None:
+                headers = {**self.headers, "Content-Encoding": request_encoding}
+        bytes_sent: int = len(content) if content is not None else 0
+
+        self.__emit(EventType.REQUEST, bucket, bytes_sent=bytes_sent)
+
+        engine: RetryEngine = self.retry
+        started_at: float = engine.start()
+        settled: bool = False
+        attempt: int = 0
+
+        try:
+            while True:
+                attempt += 1
+                lock_wait: float = await self.ratelimiter.acquire(bucket)
+                if lock_wait > 0:
+                    self.__emit(EventType.RATELIMIT_WAIT, bucket, attempt=attempt, lock_wait=lock_wait, latency=time.monotonic() - called_at)
+
+                try:
+                    response: Response = await self.__attempt(route, endpoint, headers, content, attempt)
+                except httpx.TransportError as e:
+                    engine.breaker.record_failure()
+                    settled = True
+
+                    delay: Optional[float] = engine.next_delay(started_at, attempt, route.method.value, error=e)
+                    if delay is None:
+                        raise
+                    self.__emit(EventType.RETRY, bucket, attempt=attempt, latency=time.monotonic() - called_at, delay=delay, error=e)
+                    await anyio.sleep(delay)
+                    continue
+
+                if "application/json" in response.headers.get("content-type", "") and response.content:
+                    with self.tracer.span("json.decode", size=len(response.content)):
+                        res_data: str | Dict[str, Any] = self.codec.loads(response.content)
+                else:
                     res_data: str | Dict[str, Any] = response.text
-                    if "application/json" in response.headers["content-type"]:
-                        res_data = json.loads(res_data)
-
-                    remaining: int = int(response.headers.get("X-Ratelimit-Remaining", 0))
-
-                    if remaining == 0 and response.status_code != 429:
-                        #hold_lock.hold()
-                        #delay: float = int(response.headers.get("X-Ratelimit-Reset")) - time.time()
-                        #nursery.start_soon(run_later, delay, lock.release())
-                        pass
-                    elif response.status_code == 429:
-                        if data is not None:
-                            with GlobalLock(self.global_event, data.get("global", False)):
-                                retry_after: int = int(res_data.get("retry-after", 0))
-
-                    if bool(kwargs.get("return_code", False)):
-                        return response.status_code
-                    elif 300 > response.status_code >= 200:
-                        return res_data or None
-                    elif response.status_code in (403, 404):
+
+                self.ratelimiter.update(bucket, response.headers)
+                bytes_received: int = self.__record_compression(bucket, request_encoding, request_size, bytes_sent, response, len(response.content))
+                self.__emit(
+                    EventType.RESPONSE,
+                    bucket,
+                    attempt=attempt,
+                    status_code=response.status_code,
+                    bytes_sent=bytes_sent,
+                    bytes_received=bytes_received,
+                    lock_wait=lock_wait,
+                    latency=time.monotonic() - called_at
+                )
+
+                if response.status_code == 429:
+                    retry_after: float = self.ratelimiter.handle_429(bucket, response.headers, res_data)
+
+                    # the retry waits for the delay the server asked for, which the rate limiter already holds the bucket back
+                    # for, so the retry is only checked against the budget and deadline here instead of sleeping again
+                    delay: Optional[float] = engine.next_delay(started_at, attempt, route.method.value, status_code=429, retry_after=retry_after)
+                    if delay is None:
+                        raise HttpError(response, res_data)
+                    self.__emit(EventType.RETRY, bucket, attempt=attempt, status_code=429, latency=time.monotonic() - called_at, delay=delay)
+                    continue
+
+                if response.status_code >= 500:
+                    engine.breaker.record_failure()
+                else:
+                    engine.breaker.record_success()
+                settled = True
+
+                if bool(kwargs.get("return_code", False)):
+                    return response.status_code
+                elif 300 > response.status_code >= 200:
+                    return res_data or None
+                elif response.status_code in engine.policy.retry_statuses:
+                    delay: Optional[float] = engine.next_delay(started_at, attempt, route.method.value, status_code=response.status_code)
+                    if delay is None:
                         raise HttpError(response, res_data)
-                    elif response.status_code in (500, 502):
-                        await trio.sleep(1 + tries * 2)
-                        continue
+                    self.__emit(EventType.RETRY, bucket, attempt=attempt, status_code=response.status_code, latency=time.monotonic() - called_at, delay=delay)
+                    await anyio.sleep(delay)
+                    continue
+                else:
+                    raise HttpError(response, res_data)
+        except BaseException:
+            if not settled:
+                engine.breaker.release()
+            raise
+
+    async def stream(self, route: Route, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        """
+        Sends a request and yields the response body in chunks as it arrives, instead of reading it all into memory.
+        The request is rate limited like any other, but isn't retried, since part of the body may already have been consumed.
+
+        :param route: The route to request.
+        :type route: Route
+        :param chunk_size: The preferred size of the chunks, in bytes.
+        :type chunk_size: int
+        :return: An async iterator over the chunks of the response body.
+        :rtype: AsyncIterator[bytes]
+        :raises HttpError: If the response isn't successful.
+        """
+        bucket: str = route.bucket
+        endpoint: str = self.http_endpoint + route.url
+
+        called_at: float = time.monotonic()
+        self.__emit(EventType.REQUEST, bucket)
+        try:
+            self.retry.start()
+        except CircuitOpenError as e:
+            self.__emit(EventType.ERROR, bucket, error=e)
+            raise
+
+        settled: bool = False
+        try:
+            lock_wait: float = await self.ratelimiter.acquire(bucket)
+            if lock_wait > 0:
+                self.__emit(EventType.RATELIMIT_WAIT, bucket, attempt=1, lock_wait=lock_wait, latency=time.monotonic() - called_at)
+
+            try:
+                async with self.session.stream(route.method.value, endpoint, headers=self.headers) as response:
+                    self.ratelimiter.update(bucket, response.headers)
+
+                    if response.status_code >= 500:
+                        self.retry.breaker.record_failure()
                     else:
+                        self.retry.breaker.record_success()
+                    settled = True
+
+                    if not 300 > response.status_code >= 200:
+                        await response.aread()
+                        self.__emit(
+                            EventType.RESPONSE,
+                            bucket,
+                            attempt=1,
+                            status_code=response.status_code,
+                            bytes_received=response.num_bytes_downloaded,
+                            lock_wait=lock_wait,
+                            latency=time.monotonic() - called_at
+                        )
+                        res_data: str | Dict[str, Any] = response.text
+                        if "application/json" in response.headers.get("content-type", "") and response.content:
+                            res_data = self.codec.loads(response.content)
+                        if response.status_code == 429:
+                            self.ratelimiter.handle_429(bucket, response.headers, res_data)
                         raise HttpError(response, res_data)
 
-        raise PastemystError(f"failed https request: {response.status_code} {method.value} {endpoint} : {response.text}")
+                    response_size: int = 0
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        response_size += len(chunk)
+                        yield chunk
+                    bytes_received: int = self.__record_compression(bucket, None, 0, 0, response, response_size)
+                    self.__emit(
+                        EventType.RESPONSE,
+                        bucket,
+                        attempt=1,
+                        status_code=response.status_code,
+                        bytes_received=bytes_received,
+                        lock_wait=lock_wait,
+                        latency=time.monotonic() - called_at
+                    )
+            except httpx.TransportError:
+                if not settled:
+                    self.retry.breaker.record_failure()
+                    settled = True
+                raise
+        except BaseException as e:
+            if not settled:
+                self.retry.breaker.release()
+            if isinstance(e, Exception):
+                self.__emit(EventType.ERROR, bucket, status_code=getattr(e, "status_code", None), latency=time.monotonic() - called_at, error=e)
+            raise
+
+    async def __attempt(self, route: Route, endpoint: str, headers: Dict[str, str], content: Optional[bytes], attempt: int) -> Response:
+        if not self.tracer.enabled:
+            return await self.__send(route, endpoint, headers, content)
+
+        # httpcore reports the phases of the round trip through the trace extension
+        marks: Dict[str, int] = {}
+
+        async def trace(name: str, info: Dict[str, Any]) -> None:
+            marks[name.split(".", 1)[1] if name.startswith("http") else name] = time.time_ns()
+
+        with self.tracer.span("http.attempt", attempt=attempt) as span:
+            try:
+                response: Response = await self.__send(route, endpoint, headers, content, {"trace": trace})
+                span.set_attribute("status_code", response.status_code)
+                return response
+            finally:
+                for phase, starts, ends in _PHASES:
+                    start: Optional[int] = next((marks[mark] for mark in starts if mark in marks), None)
+                    end: Optional[int] = next((marks[mark] for mark in ends if mark in marks), None)
+                    if start is not None and end is not None:
+                        self.tracer.record_span(phase, start, end)
+
+    async def __send(self, route: Route, endpoint: str, headers: Dict[str, str], content: Optional[bytes], extensions: Dict[str, Any] = None) -> Response:
+        # sends a single attempt, hedging it if it's slow and the hedge policy allows it
+        policy: Optional[HedgePolicy] = self.hedge
+        if policy is None or route.method.value not in policy.methods:
+            return await self.session.request(route.method.value, endpoint, headers=headers, content=content, extensions=extensions)
+
+        bucket: str = route.bucket
+        policy.requests += 1
+
+        responses: List[Tuple[Response, bool]] = []
+        errors: List[Exception] = []
+        done: anyio.Event = anyio.Event()
+        running: int = 0
+
+        async def attempt(hedged: bool) -> None:
+            nonlocal running
+            started_at: float = time.monotonic()
+            try:
+                response: Response = await self.session.request(route.method.value, endpoint, headers=headers, content=content, extensions=None if hedged else extensions)
+            except anyio.get_cancelled_exc_class():
+                # the attempt lost, so its latency is at least the time it ran, which keeps slow attempts in the window
+                policy.record(bucket, time.monotonic() - started_at)
+                raise
+            except Exception as e:
+                errors.append(e)
+            else:
+                policy.record(bucket, time.monotonic() - started_at)
+                responses.append((response, hedged))
+            finally:
+                running -= 1
+
+            # a failed attempt leaves the other one running, if there is one
+            if responses or running == 0:
+                done.set()
+
+        async with anyio.create_task_group() as tg:
+            running += 1
+            tg.start_soon(attempt, False)
+
+            with anyio.move_on_after(policy.delay(bucket)):
+                await done.wait()
+
+            if not done.is_set() and policy.should_hedge(self.ratelimiter.headroom(bucket)):
+                await self.ratelimiter.acquire(bucket)
+                running += 1
+                tg.start_soon(attempt, True)
+
+            await done.wait()
+            tg.cancel_scope.cancel()
+
+        if not responses:
+            raise errors[0]
+
+        # both attempts used a token, so the rate limiter hears of the losing response too, the caller handles the winner
+        for response, _ in responses[1:]:
+            self.ratelimiter.update(bucket, response.headers)
+
+        response, hedged = responses[0]
+        if hedged:
+            policy.wins += 1
+        return response
+
+    def __record_compression(self, bucket: str, request_encoding: Optional[str], request_size: int, request_sent: int, response: Response, response_size: int) -> int:
+        # in-memory transports hand over the body without downloading it, so fall back to the decoded size
+        received: int = response.num_bytes_downloaded or response_size
+        self.compression.record(CompressionStats(bucket, request_encoding, request_size, request_sent, response.headers.get("content-encoding"), response_size, received))
+        return received
 
     async def get(self, endpoint: str, **kwargs) -> Dict[str, Any] | int:
-        return await self.request(HttpMethod.GET, endpoint, **kwargs)
+        return await self.request(Route(HttpMethod.GET, endpoint), **kwargs)
 
     async def post(self, endpoint: str, **kwargs) -> Dict[str, Any] | int:
-        return await self.request(HttpMethod.POST, endpoint, **kwargs)
+        return await self.request(Route(HttpMethod.POST, endpoint), **kwargs)
 
     async def put(self, endpoint: str, **kwargs) -> Dict[str, Any] | int:
-        return await self.request(HttpMethod.PUT, endpoint, **kwargs)
+        return await self.request(Route(HttpMethod.PUT, endpoint), **kwargs)
 
     async def patch(self, endpoint: str, **kwargs) -> Dict[str, Any] | int:
-        return await self.request(HttpMethod.PATCH, endpoint, **kwargs)
+        return await self.request(Route(HttpMethod.PATCH, endpoint), **kwargs)
 
     async def delete(self, endpoint: str, **kwargs) -> Dict[str, Any] | int:
-        return await self.request(HttpMethod.DELETE, endpoint, **kwargs)
+        return await self.request(Route(HttpMethod.DELETE, endpoint), **kwargs)
 
     def get_language(self, name: str = None, extension: str = None) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
         if name is not None:
-            route: str = f"/data/language?name={name}"
+            route: Route = Route(HttpMethod.GET, "/data/language?name={name}", name=name)
         elif name is None and extension is not None:
-            route: str = f"/data/languageExt?extension={extension}"
+            route: Route = Route(HttpMethod.GET, "/data/languageExt?extension={extension}", extension=extension)
         else:
             raise RequestError("invalid arguments. must provide language name or extension")
 
-        return self.get(route)
+        return self.request(route)
 
     def get_paste(self, paste_id: str) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
         if paste_id is None or paste_id == "":
             raise RequestError("invalid arguments. must provide a paste id to look up")
 
-        route: str = f"/paste/{paste_id}"
-        return self.get(route)
+        route: Route = Route(HttpMethod.GET, "/paste/{paste_id}", paste_id=paste_id)
+        return self.request(route)
+
+    def stream_paste(self, paste_id: str, chunk_size: int = 64 * 1024) -> AsyncIterator[bytes]:
+        if paste_id is None or paste_id == "":
+            raise RequestError("invalid arguments. must provide a paste id to look up")
+
+        route: Route = Route(HttpMethod.GET, "/paste/{paste_id}", paste_id=paste_id)
+        return self.stream(route, chunk_size)
 
     def create_paste(self, paste: Paste) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
-        route: str = f"/paste"
+        route: Route = Route(HttpMethod.POST, "/paste")
         payload: Dict[str, Any] = paste.to_dict()
 
         if not self.is_authenticated:
@@ -148,52 +477,50 @@ class HttpClient:
             del payload["isPublic"]
             del payload["tags"]
 
-        return self.post(route, json=payload)
+        return self.request(route, json=payload)
 
     def edit_paste(self, paste: Paste, target_id: str = None) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
-        payload: Dict[str, Any] = paste.to_dict()
+        # only the changes are sent, which keeps edits of large pastes small
+        payload: Dict[str, Any] = paste.to_edit_dict()
 
         if "_id" not in payload:
             if not target_id:
                 raise RequestError("invalid arguments. missing _id field or target_id")
             payload["_id"] = target_id
 
-        if not ("_id" in pasty for pasty in payload["pasties"]):
-            raise RequestError("invalid arguments. missing _id field in pasty")
-
-        route: str = f"/paste/{payload["_id"]}"
+        route: Route = Route(HttpMethod.PATCH, "/paste/{paste_id}", paste_id=payload["_id"])
 
-        return self.patch(route, json=payload)
+        return self.request(route, json=payload)
 
     def delete_paste(self, paste_id: str) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
-        route: str = f"/paste/{paste_id}"
-        return self.delete(route, return_code=True)
+        route: Route = Route(HttpMethod.DELETE, "/paste/{paste_id}", paste_id=paste_id)
+        return self.request(route, return_code=True)
 
     # TODO: type-hint
     def get_expire_unix(self, created_at, expires_in) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
-        route: str = f"/time/expiresInToUnixTime?createdAt={created_at}&expiresIn={expires_in}"
-        return self.get(route)
+        route: Route = Route(HttpMethod.GET, "/time/expiresInToUnixTime?createdAt={created_at}&expiresIn={expires_in}", created_at=created_at, expires_in=expires_in)
+        return self.request(route)
 
     def get_user_exists(self, username: str) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
-        route: str = f"/user/{username}/exists"
-        return self.get(route, return_code=True)
+        route: Route = Route(HttpMethod.GET, "/user/{username}/exists", username=username)
+        return self.request(route, return_code=True)
 
     def get_user(self, username: str) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
-        route: str = f"/user/{username}"
-        return self.get(route)
+        route: Route = Route(HttpMethod.GET, "/user/{username}", username=username)
+        return self.request(route)
 
     def get_self(self) -> Coroutine[Any, Any, Dict[str, Any] | int | None]:
-        route: str = "/user/self"
+        route: Route = Route(HttpMethod.GET, "/user/self")
 
         if not self.is_authenticated:
             raise RequestError("must be authenticated (provide api key), to access self user")
 
-        return self.get(route)
+        return self.request(route)
 
     def get_self_pastes(self) -> Coroutine[Any, Any, Dict[str, Any] | List[str] | int | None]:
-        route: str = "/user/self/pastes"
+        route: Route = Route(HttpMethod.GET, "/user/self/pastes")
 
         if not self.is_authenticated:
             raise RequestError("must be authenticated (provide api key), to access self user")
 
-        return self.get(route)
+        return self.request(route)
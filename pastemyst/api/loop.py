@@ -0,0 +1,107 @@
+import threading
+from typing import Any, Awaitable, Callable, Optional, TypeVar
+
+import trio
+
+
+T = TypeVar("T")
+
+
+class LoopThread:
+    """
+    A single long-lived trio event loop running on a background thread.
+
+    Synchronous code submits coroutine functions to the loop with `run`, which blocks the calling thread until the
+    coroutine finishes. Because every call runs on the same loop, objects bound to it (such as the connection pool of an
+    `httpx.AsyncClient`) stay alive and usable between calls.
+
+    The loop is started lazily on the first call to `run`, and can be stopped with `stop`. A stopped loop can be started again.
+    """
+
+    __slots__ = ("name", "__thread", "__token", "__stop_event", "__lock")
+
+    def __init__(self, name: str = "pastemyst-loop"):
+        self.name = name
+        self.__thread: Optional[threading.Thread] = None
+        self.__token: Optional[trio.lowlevel.TrioToken] = None
+        self.__stop_event: Optional[trio.Event] = None
+        self.__lock = threading.Lock()
+
+    @property
+    def is_running(self) -> bool:
+        """
+        Check if the loop thread is running.
+
+        :return: True if the loop is running, False otherwise.
+        :rtype: bool
+        """
+        return self.__token is not None
+
+    @property
+    def is_current(self) -> bool:
+        """
+        Check if the calling thread is the loop thread.
+
+        :return: True if called from the loop thread, False otherwise.
+        :rtype: bool
+        """
+        return self.__thread is threading.current_thread()
+
+    def start(self) -> None:
+        """
+        Starts the loop thread, and waits until the loop is ready to accept work.
+        Does nothing if the loop is already running.
+
+        :return: None
+        """
+        with self.__lock:
+            if self.is_running:
+                return
+
+            started: threading.Event = threading.Event()
+            self.__thread = threading.Thread(target=trio.run, args=(self.__main, started), name=self.name, daemon=True)
+            self.__thread.start()
+            started.wait()
+
+    async def __main(self, started: threading.Event) -> None:
+        self.__stop_event = trio.Event()
+        self.__token = trio.lowlevel.current_trio_token()
+        started.set()
+
+        await self.__stop_event.wait()
+
+    def run(self, async_fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+        """
+        Runs the given coroutine function on the loop and blocks until it returns.
+
+        :param async_fn: The coroutine function to run.
+        :type async_fn: Callable[..., Awaitable[T]]
+        :param args: Positional arguments passed to the coroutine function.
+        :return: The return value of the coroutine.
+        :rtype: T
+        """
+        if not self.is_running:
+            self.start()
+
+        return trio.from_thread.run(async_fn, *args, trio_token=self.__token)
+
+    def stop(self) -> None:
+        """
+        Stops the loop and waits for the thread to exit.
+        Does nothing if the loop isn't running. When called from the loop thread itself, the loop is only told to stop.
+
+        :return: None
+        """
+        with self.__lock:
+            if not self.is_running:
+                return
+
+            if self.is_current:
+                self.__stop_event.set()
+            else:
+                trio.from_thread.run_sync(self.__stop_event.set, trio_token=self.__token)
+                self.__thread.join()
+
+            self.__thread = None
+            self.__token = None
+            self.__stop_event = None
@@ -0,0 +1,223 @@
+import bisect
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .events import EventType, RequestEvent
+
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(**labels: str) -> Labels:
+    return tuple(sorted(labels.items()))
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    values: str = ",".join('{0}="{1}"'.format(key, value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")) for key, value in labels)
+    return "{" + values + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Histogram:
+    """
+    Counts observed values into buckets with fixed upper bounds, like a Prometheus histogram.
+
+    Attributes:
+        - bounds (Tuple[float, ...]): The upper bound of each bucket, in ascending order.
+        - counts (List[int]): The amount of values in each bucket, plus one for values above the last bound.
+        - sum (float): The sum of every observed value.
+        - count (int): The amount of observed values.
+    """
+
+    __slots__ = ("bounds", "counts", "sum", "count")
+
+    def __init__(self, bounds: Iterable[float]):
+        self.bounds: Tuple[float, ...] = tuple(sorted(bounds))
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.sum: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        """
+        Adds a value to the histogram.
+
+        :param value: The value to add.
+        :type value: float
+        :return: None
+        """
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def copy(self) -> "Histogram":
+        histogram: Histogram = Histogram(self.bounds)
+        histogram.counts = list(self.counts)
+        histogram.sum = self.sum
+        histogram.count = self.count
+        return histogram
+
+    def __repr__(self) -> str:
+        return "<Histogram count={0.count} sum={0.sum}>".format(self)
+
+
+class MetricsRegistry:
+    """
+    An in-process metrics registry, fed by the request events of a client.
+
+    The registry is an event hook itself, so pass it in the client's `hooks` option to start collecting:
+
+    - `pastemyst_requests_total`, `pastemyst_retries_total` and `pastemyst_ratelimit_waits_total` per route.
+    - `pastemyst_responses_total` per route and status code.
+    - `pastemyst_errors_total` per route and error type.
+    - `pastemyst_bytes_sent_total` and `pastemyst_bytes_received_total` per route.
+    - `pastemyst_response_latency_seconds`, a histogram of the time from the start of a call to each of its responses, per route.
+    - `pastemyst_ratelimit_wait_seconds`, a histogram of the time spent waiting for the rate limiter, per route.
+
+    Read the metrics with `counter`, `histogram` or `snapshot`, or export them all with `to_prometheus`.
+    """
+
+    DEFAULT_BOUNDS: Tuple[float, ...] = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+    __slots__ = ("bounds", "counters", "histograms")
+
+    def __init__(self, bounds: Iterable[float] = None):
+        """
+        :param bounds: The upper bounds of the histogram buckets, in seconds. Uses `DEFAULT_BOUNDS` if None.
+        :type bounds: Iterable[float]
+        """
+        self.bounds: Tuple[float, ...] = tuple(bounds) if bounds is not None else self.DEFAULT_BOUNDS
+        self.counters: Dict[str, Dict[Labels, float]] = {}
+        self.histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        route: Labels = _labels(route=event.route)
+
+        if event.type == EventType.REQUEST:
+            self.inc("pastemyst_requests_total", route)
+        elif event.type == EventType.RATELIMIT_WAIT:
+            self.inc("pastemyst_ratelimit_waits_total", route)
+            self.observe("pastemyst_ratelimit_wait_seconds", route, event.lock_wait)
+        elif event.type == EventType.RESPONSE:
+            self.inc("pastemyst_responses_total", _labels(route=event.route, status=str(event.status_code)))
+            self.inc("pastemyst_bytes_sent_total", route, event.bytes_sent)
+            self.inc("pastemyst_bytes_received_total", route, event.bytes_received)
+            self.observe("pastemyst_response_latency_seconds", route, event.latency)
+        elif event.type == EventType.RETRY:
+            self.inc("pastemyst_retries_total", route)
+        elif event.type == EventType.ERROR:
+            self.inc("pastemyst_errors_total", _labels(route=event.route, error=type(event.error).__name__))
+
+    def inc(self, name: str, labels: Labels = (), value: float = 1) -> None:
+        """
+        Adds to a counter.
+
+        :param name: The name of the counter.
+        :type name: str
+        :param labels: The labels of the counter, as sorted key and value pairs.
+        :type labels: Labels
+        :param value: The amount to add.
+        :type value: float
+        :return: None
+        """
+        counter: Dict[Labels, float] = self.counters.setdefault(name, {})
+        counter[labels] = counter.get(labels, 0) + value
+
+    def observe(self, name: str, labels: Labels, value: float) -> None:
+        """
+        Adds a value to a histogram.
+
+        :param name: The name of the histogram.
+        :type name: str
+        :param labels: The labels of the histogram, as sorted key and value pairs.
+        :type labels: Labels
+        :param value: The value to add.
+        :type value: float
+        :return: None
+        """
+        histograms: Dict[Labels, Histogram] = self.histograms.setdefault(name, {})
+        histogram: Optional[Histogram] = histograms.get(labels)
+        if histogram is None:
+            histogram = histograms[labels] = Histogram(self.bounds)
+        histogram.observe(value)
+
+    def counter(self, name: str, **labels: str) -> float:
+        """
+        Get the value of a counter.
+
+        :param name: The name of the counter.
+        :type name: str
+        :param labels: The labels of the counter, such as `route="GET./paste/{paste_id}"`.
+        :type labels: str
+        :return: The value of the counter, 0 if it was never incremented.
+        :rtype: float
+        """
+        return self.counters.get(name, {}).get(_labels(**labels), 0)
+
+    def histogram(self, name: str, **labels: str) -> Optional[Histogram]:
+        """
+        Get a histogram.
+
+        :param name: The name of the histogram.
+        :type name: str
+        :param labels: The labels of the histogram, such as `route="GET./paste/{paste_id}"`.
+        :type labels: str
+        :return: A copy of the histogram, or None if nothing was observed.
+        :rtype: Optional[Histogram]
+        """
+        histogram: Optional[Histogram] = self.histograms.get(name, {}).get(_labels(**labels))
+        return histogram.copy() if histogram is not None else None
+
+    def snapshot(self) -> Dict[str, Dict[Labels, float | Histogram]]:
+        """
+        Get a copy of every metric.
+
+        :return: Every counter and histogram, by name and labels.
+        :rtype: Dict[str, Dict[Labels, float | Histogram]]
+        """
+        metrics: Dict[str, Dict[Labels, float | Histogram]] = {name: dict(values) for name, values in self.counters.items()}
+        for name, histograms in self.histograms.items():
+            metrics[name] = {labels: histogram.copy() for labels, histogram in histograms.items()}
+        return metrics
+
+    def reset(self) -> None:
+        """
+        Clears every metric.
+
+        :return: None
+        """
+        self.counters = {}
+        self.histograms = {}
+
+    def to_prometheus(self) -> str:
+        """
+        Exports every metric in the Prometheus text exposition format.
+
+        :return: The metrics, ready to be served from a `/metrics` endpoint.
+        :rtype: str
+        """
+        lines: List[str] = []
+
+        for name in sorted(self.counters):
+            lines.append(f"# TYPE {name} counter")
+            for labels, value in sorted(self.counters[name].items()):
+                lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+        for name in sorted(self.histograms):
+            lines.append(f"# TYPE {name} histogram")
+            for labels, histogram in sorted(self.histograms[name].items()):
+                cumulative: int = 0
+                for bound, count in zip(self.__bounds_text(histogram.bounds), histogram.counts):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(labels + (('le', bound),))} {cumulative}")
+                lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram.sum)}")
+                lines.append(f"{name}_count{_format_labels(labels)} {histogram.count}")
+
+        return "\n".join(lines) + "\n" if lines else ""
+
+    @staticmethod
+    def __bounds_text(bounds: Tuple[float, ...]) -> List[str]:
+        return [_format_value(bound) for bound in bounds] + ["+Inf"]
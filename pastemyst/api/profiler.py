@@ -0,0 +1,167 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from .tracing import Tracer, Span
+
+
+# the spans of the tracer that are profiled, and the phase each of them counts towards
+SPAN_PHASES: Dict[str, str] = {
+    "ratelimit.acquire": "lock wait",
+    "http.attempt": "network",
+    "json.decode": "json decode",
+    "model.from_dict": "model construction"
+}
+
+
+class PhaseStats:
+    """
+    The time spent in one phase of the client's calls.
+
+    Attributes:
+        - phase (str): The name of the phase.
+        - calls (int): The amount of times the phase ran.
+        - wall (float): The total wall clock time spent in the phase, in seconds.
+        - cpu (float): The total CPU time of the loop's thread while in the phase, in seconds.
+        - share (float): The wall time of the phase, as a fraction of the wall time of every call.
+    """
+
+    __slots__ = ("phase", "calls", "wall", "cpu", "share")
+
+    def __init__(self, phase: str, calls: int, wall: float, cpu: float, share: float):
+        self.phase = phase
+        self.calls = calls
+        self.wall = wall
+        self.cpu = cpu
+        self.share = share
+
+    def __repr__(self) -> str:
+        return "<PhaseStats phase={0.phase!r} calls={0.calls} wall={0.wall:.6f} cpu={0.cpu:.6f}>".format(self)
+
+
+class Profiler(Tracer):
+    """
+    Collects the cumulative wall and CPU time the client spends in each phase of its calls, to tell whether time goes
+    to the network or to the library's own Python code.
+
+    The phases are:
+
+    - `call`: whole client calls, which every other phase is part of.
+    - `loop startup`: starting the background event loop of a `Client`.
+    - `lock wait`: waiting for the rate limiter, including bucket and global pauses.
+    - `network`: HTTP round trips.
+    - `json decode`: decoding response bodies.
+    - `model construction`: the models' `from_dict` methods, which `key mapping` and `datetime/enum conversion` are part of.
+    - `key mapping`: mapping JSON keys to fields. The models' decoders map the keys they know up front, so this only
+      shows up for keys a decoder sees for the first time.
+    - `datetime/enum conversion`: converting timestamps and enum values.
+
+    Phases nest, so their times add up to more than the time of the calls. CPU time is measured on the event loop's
+    thread, so it includes other tasks that ran on the loop while a phase was waiting.
+
+    Key mapping and conversion are timed by the decoders while the profiling client builds its models, through
+    `pastemyst.utils.decoder.recording`. Other clients, and fields of lazily built models read later, aren't timed.
+    """
+
+    __slots__ = ("inner", "stats", "__lock")
+
+    enabled: bool = True
+
+    def __init__(self, inner: Tracer = None):
+        """
+        :param inner: A tracer to pass every span on to, so tracing keeps working while profiling.
+        :type inner: Tracer
+        """
+        self.inner = inner or Tracer()
+        self.stats: Dict[str, List[float]] = {}
+        self.__lock = threading.Lock()
+
+    def record(self, phase: str, wall: float, cpu: float) -> None:
+        """
+        Adds the time of a single run of a phase.
+
+        :param phase: The name of the phase.
+        :type phase: str
+        :param wall: The wall clock time of the run, in seconds.
+        :type wall: float
+        :param cpu: The CPU time of the run, in seconds.
+        :type cpu: float
+        :return: None
+        """
+        with self.__lock:
+            stats: Optional[List[float]] = self.stats.get(phase)
+            if stats is None:
+                self.stats[phase] = [1, wall, cpu]
+            else:
+                stats[0] += 1
+                stats[1] += wall
+                stats[2] += cpu
+
+    @contextmanager
+    def phase(self, phase: str) -> Iterator[None]:
+        """
+        Times the code in the block as a run of the given phase.
+
+        :param phase: The name of the phase.
+        :type phase: str
+        :return: A context manager timing the block.
+        :rtype: Iterator[None]
+        """
+        wall, cpu = time.perf_counter(), time.thread_time()
+        try:
+            yield
+        finally:
+            self.record(phase, time.perf_counter() - wall, time.thread_time() - cpu)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        phase: Optional[str] = "call" if name.startswith("pastemyst.") else SPAN_PHASES.get(name)
+
+        with self.inner.span(name, **attributes) as span:
+            if phase is None:
+                yield span
+            else:
+                with self.phase(phase):
+                    yield span
+
+    def record_span(self, name: str, start: int, end: int, **attributes: Any) -> None:
+        self.inner.record_span(name, start, end, **attributes)
+
+    def reset(self) -> None:
+        """
+        Clears the collected times.
+
+        :return: None
+        """
+        with self.__lock:
+            self.stats = {}
+
+    def report(self) -> List[PhaseStats]:
+        """
+        Get the collected times of every phase, ranked by wall time.
+
+        :return: The stats of every phase that ran, slowest first.
+        :rtype: List[PhaseStats]
+        """
+        with self.__lock:
+            stats: Dict[str, List[float]] = {phase: list(values) for phase, values in self.stats.items()}
+
+        total: float = stats["call"][1] if "call" in stats else 0.0
+        report: List[PhaseStats] = [
+            PhaseStats(phase, int(calls), wall, cpu, wall / total if total else 0.0) for phase, (calls, wall, cpu) in stats.items()
+        ]
+        report.sort(key=lambda phase: phase.wall, reverse=True)
+        return report
+
+    def summary(self) -> str:
+        """
+        Get a ranked, human readable summary of the collected times.
+
+        :return: A table of the phases, slowest first.
+        :rtype: str
+        """
+        lines: List[str] = [f"{'phase':<26} {'calls':>8} {'wall (s)':>11} {'cpu (s)':>11} {'% of calls':>11}"]
+        for stats in self.report():
+            lines.append(f"{stats.phase:<26} {stats.calls:>8} {stats.wall:>11.6f} {stats.cpu:>11.6f} {stats.share * 100:>10.1f}%")
+        return "\n".join(lines)
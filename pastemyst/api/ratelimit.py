@@ -0,0 +1,391 @@
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional, Any, Mapping
+
+import anyio
+
+from .tracing import Tracer
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parses the value of a `Retry-After` header, which is either an amount of seconds or an HTTP date.
+
+    :param value: The header value.
+    :type value: Optional[str]
+    :return: The amount of seconds to wait, or None if the value is missing or malformed.
+    :rtype: Optional[float]
+    """
+    if value is None:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def parse_reset_after(headers: Mapping[str, str]) -> Optional[float]:
+    """
+    Finds the amount of seconds until a rate limit window resets from the response headers.
+    `X-Ratelimit-Reset-After` is used if present, otherwise `X-Ratelimit-Reset`, which is either a unix timestamp or an amount of seconds.
+
+    :param headers: The response headers.
+    :type headers: Mapping[str, str]
+    :return: The amount of seconds until the window resets, or None if the headers don't say.
+    :rtype: Optional[float]
+    """
+    reset_after: Optional[str] = headers.get("X-Ratelimit-Reset-After")
+    if reset_after is not None:
+        try:
+            return max(0.0, float(reset_after))
+        except ValueError:
+            return None
+
+    reset: Optional[str] = headers.get("X-Ratelimit-Reset")
+    if reset is None:
+        return None
+
+    try:
+        value: float = float(reset)
+    except ValueError:
+        return None
+
+    # anything this large can only be a timestamp, not a window length
+    if value > 1_000_000_000:
+        return max(0.0, value - time.time())
+    return max(0.0, value)
+
+
+class BucketState:
+    """
+    A point in time view of a rate limit bucket.
+
+    Attributes:
+        - key (str): The route template the bucket belongs to, such as `GET./paste/{paste_id}`.
+        - limit (Optional[int]): The amount of requests allowed per window, or None if unknown.
+        - remaining (Optional[int]): The amount of requests left in the current window, or None if unknown.
+        - reset_after (float): Seconds until the current window resets.
+        - pending (int): The amount of requests waiting for the bucket.
+        - wait_time (float): Predicted seconds a new request would have to wait before being sent.
+    """
+
+    __slots__ = ("key", "limit", "remaining", "reset_after", "pending", "wait_time")
+
+    def __init__(self, key: str, limit: Optional[int], remaining: Optional[int], reset_after: float, pending: int, wait_time: float):
+        self.key = key
+        self.limit = limit
+        self.remaining = remaining
+        self.reset_after = reset_after
+        self.pending = pending
+        self.wait_time = wait_time
+
+    def __repr__(self) -> str:
+        return "<BucketState key={0.key!r} remaining={0.remaining} limit={0.limit} wait_time={0.wait_time:.3f}>".format(self)
+
+
+class Bucket:
+    """
+    A token bucket for a single route template.
+
+    The bucket starts out unlimited, and learns its limit and window from the rate limit headers of each response.
+    Requests take a token before being sent. Once the bucket is empty, requests wait until the window resets.
+    """
+
+    __slots__ = ("key", "limit", "remaining", "reset_at", "window", "pending", "lock")
+
+    def __init__(self, key: str):
+        self.key = key
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at: float = 0.0
+        self.window: float = 0.0
+        self.pending: int = 0
+        self.lock = anyio.Lock()
+
+    def refill(self, now: float) -> None:
+        """
+        Refills the bucket if its window has passed.
+
+        :param now: The current monotonic time.
+        :type now: float
+        :return: None
+        """
+        if self.reset_at and now >= self.reset_at:
+            self.remaining = self.limit
+            self.reset_at = 0.0
+
+    def wait_time(self, now: float) -> float:
+        """
+        Get how long until the bucket has a token available.
+
+        :param now: The current monotonic time.
+        :type now: float
+        :return: The amount of seconds to wait, 0 if a token is available.
+        :rtype: float
+        """
+        self.refill(now)
+        if self.remaining is None or self.remaining > 0:
+            return 0.0
+        return max(0.0, self.reset_at - now)
+
+    def update(self, headers: Mapping[str, str], now: float) -> None:
+        """
+        Synchronizes the bucket with the rate limit headers of a response.
+
+        :param headers: The response headers.
+        :type headers: Mapping[str, str]
+        :param now: The current monotonic time.
+        :type now: float
+        :return: None
+        """
+        limit: Optional[str] = headers.get("X-Ratelimit-Limit")
+        if limit is not None and limit.isdigit():
+            self.limit = int(limit)
+
+        new_window: bool = self.remaining is None or not self.reset_at or now >= self.reset_at
+
+        reset_after: Optional[float] = parse_reset_after(headers)
+        if reset_after is not None:
+            self.reset_at = now + reset_after
+            self.window = max(self.window, reset_after)
+
+        remaining: Optional[str] = headers.get("X-Ratelimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            # tokens taken by requests still in flight aren't counted by the server yet,
+            # so within the same window the bucket never gets tokens back from a response
+            if new_window:
+                self.remaining = int(remaining)
+            else:
+                self.remaining = min(self.remaining, int(remaining))
+
+    def pause(self, delay: float, now: float) -> None:
+        """
+        Empties the bucket for the given amount of time.
+
+        :param delay: The amount of seconds to pause the bucket for.
+        :type delay: float
+        :param now: The current monotonic time.
+        :type now: float
+        :return: None
+        """
+        self.remaining = 0
+        self.reset_at = max(self.reset_at, now + delay)
+
+    def predicted_wait(self, now: float) -> float:
+        """
+        Predicts how long a new request would wait, taking the requests already waiting for the bucket into account.
+
+        :param now: The current monotonic time.
+        :type now: float
+        :return: The predicted amount of seconds to wait.
+        :rtype: float
+        """
+        self.refill(now)
+        if self.remaining is None or self.remaining > self.pending:
+            return 0.0
+
+        wait: float = max(0.0, self.reset_at - now)
+        if self.limit:
+            wait += ((self.pending - self.remaining) // self.limit) * self.window
+        return wait
+
+
+class RateLimiter:
+    """
+    Paces requests according to the rate limits reported by the API.
+
+    Every route template gets its own `Bucket`, so all pastes share the `GET./paste/{paste_id}` bucket.
+    A global pause, triggered by a global 429 response, holds back every request regardless of its bucket.
+    """
+
+    __slots__ = ("buckets", "global_reset_at", "tracer")
+
+    def __init__(self, tracer: Tracer = None):
+        self.buckets: Dict[str, Bucket] = {}
+        self.global_reset_at: float = 0.0
+        self.tracer = tracer or Tracer()
+
+    def get_bucket(self, key: str) -> Bucket:
+        """
+        Get the bucket for the given route template, creating it if needed.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :return: The bucket of the route.
+        :rtype: Bucket
+        """
+        bucket: Optional[Bucket] = self.buckets.get(key)
+        if bucket is None:
+            bucket = self.buckets[key] = Bucket(key)
+        return bucket
+
+    def global_wait(self, now: float = None) -> float:
+        """
+        Get how long the global pause lasts for.
+
+        :param now: The current monotonic time. Defaults to now.
+        :type now: float
+        :return: The amount of seconds left of the global pause, 0 if there's none.
+        :rtype: float
+        """
+        if now is None:
+            now = time.monotonic()
+        return max(0.0, self.global_reset_at - now)
+
+    async def acquire(self, key: str) -> float:
+        """
+        Waits until a request can be sent on the given route, and takes a token from its bucket.
+        Requests on the same bucket are let through in the order they arrive.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :return: The amount of seconds spent waiting, 0 if the request went straight through.
+        :rtype: float
+        """
+        bucket: Bucket = self.get_bucket(key)
+        start: float = time.monotonic()
+        waited: bool = bucket.lock.locked()
+
+        bucket.pending += 1
+        try:
+            with self.tracer.span("ratelimit.acquire", route=key):
+                async with bucket.lock:
+                    while True:
+                        now: float = time.monotonic()
+                        global_wait: float = self.global_wait(now)
+                        bucket_wait: float = bucket.wait_time(now)
+                        if global_wait <= 0 and bucket_wait <= 0:
+                            break
+
+                        waited = True
+                        with self.tracer.span("ratelimit.global_pause" if global_wait >= bucket_wait else "ratelimit.bucket_wait"):
+                            await anyio.sleep(max(global_wait, bucket_wait))
+
+                    if bucket.remaining is not None:
+                        bucket.remaining -= 1
+        finally:
+            bucket.pending -= 1
+
+        return time.monotonic() - start if waited else 0.0
+
+    def update(self, key: str, headers: Mapping[str, str]) -> None:
+        """
+        Synchronizes the bucket of the given route with the rate limit headers of a response.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :param headers: The response headers.
+        :type headers: Mapping[str, str]
+        :return: None
+        """
+        self.get_bucket(key).update(headers, time.monotonic())
+
+    def pause(self, delay: float, key: str = None) -> None:
+        """
+        Pauses a single bucket, or every request if no key is given.
+
+        :param delay: The amount of seconds to pause for.
+        :type delay: float
+        :param key: The bucket key of the route to pause. Pauses globally if None.
+        :type key: str
+        :return: None
+        """
+        now: float = time.monotonic()
+        if key is None:
+            self.global_reset_at = max(self.global_reset_at, now + delay)
+        else:
+            self.get_bucket(key).pause(delay, now)
+
+    def handle_429(self, key: str, headers: Mapping[str, str], data: Dict[str, Any] | str) -> float:
+        """
+        Pauses the right bucket, or everything, after a 429 response.
+
+        The delay is read from the `Retry-After` header, then the `retry-after` field of the body, then the bucket's reset headers.
+        The pause is global if the `X-Ratelimit-Global` header or the `global` field of the body says so.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :param headers: The response headers.
+        :type headers: Mapping[str, str]
+        :param data: The decoded response body.
+        :type data: Dict[str, Any] | str
+        :return: The amount of seconds paused for.
+        :rtype: float
+        """
+        body: Dict[str, Any] = data if isinstance(data, dict) else {}
+
+        delay: Optional[float] = parse_retry_after(headers.get("Retry-After"))
+        if delay is None and body.get("retry-after") is not None:
+            delay = parse_retry_after(str(body["retry-after"]))
+        if delay is None:
+            delay = parse_reset_after(headers)
+        if delay is None:
+            delay = 1.0
+
+        is_global: bool = headers.get("X-Ratelimit-Global", "").lower() == "true" or bool(body.get("global", False))
+        self.pause(delay, None if is_global else key)
+        return delay
+
+    def predicted_wait(self, key: str) -> float:
+        """
+        Predicts how long a new request on the given route would wait before being sent.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :return: The predicted amount of seconds to wait.
+        :rtype: float
+        """
+        now: float = time.monotonic()
+        bucket: Optional[Bucket] = self.buckets.get(key)
+        return max(self.global_wait(now), bucket.predicted_wait(now) if bucket is not None else 0.0)
+
+    def headroom(self, key: str) -> Optional[int]:
+        """
+        Get how many more requests can be sent on the given route right now without waiting.
+
+        :param key: The bucket key of the route.
+        :type key: str
+        :return: The amount of tokens left after the requests already waiting, or None if the route's limit isn't known yet.
+        :rtype: Optional[int]
+        """
+        now: float = time.monotonic()
+        if self.global_wait(now) > 0:
+            return 0
+
+        bucket: Optional[Bucket] = self.buckets.get(key)
+        if bucket is None:
+            return None
+
+        bucket.refill(now)
+        if bucket.remaining is None:
+            return None
+        return max(0, bucket.remaining - bucket.pending)
+
+    def snapshot(self) -> Dict[str, BucketState]:
+        """
+        Get the current state of every known bucket.
+
+        :return: The state of every bucket, by bucket key.
+        :rtype: Dict[str, BucketState]
+        """
+        now: float = time.monotonic()
+        global_wait: float = self.global_wait(now)
+
+        states: Dict[str, BucketState] = {}
+        for key, bucket in self.buckets.items():
+            bucket.refill(now)
+            states[key] = BucketState(
+                key,
+                bucket.limit,
+                bucket.remaining,
+                max(0.0, bucket.reset_at - now) if bucket.reset_at else 0.0,
+                bucket.pending,
+                max(global_wait, bucket.predicted_wait(now))
+            )
+        return states
@@ -0,0 +1,344 @@
+import random
+import time
+from enum import Enum
+from typing import Iterable, Optional
+
+import httpx
+
+from pastemyst.models import CircuitOpenError
+
+
+class RetryPolicy:
+    """
+    Decides which failed requests are retried, and how long to wait before each retry.
+
+    Connection failures are always safe to retry, since the request never reached the server. Other network errors,
+    timeouts and retryable status codes are only retried for idempotent methods, except for 429 which the server never
+    processed. Delays grow exponentially with full jitter, so clients that failed together don't retry together.
+
+    Subclass and override `should_retry` or `backoff` to customize the policy.
+    """
+
+    __slots__ = ("max_attempts", "base_delay", "max_delay", "multiplier", "max_retry_time", "retry_statuses", "idempotent_methods")
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        multiplier: float = 2.0,
+        max_retry_time: float = 60.0,
+        retry_statuses: Iterable[int] = (429, 500, 502, 503, 504),
+        idempotent_methods: Iterable[str] = ("GET", "PUT", "DELETE")
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.multiplier = multiplier
+        self.max_retry_time = max_retry_time
+        self.retry_statuses = frozenset(retry_statuses)
+        self.idempotent_methods = frozenset(idempotent_methods)
+
+    def should_retry(self, attempt: int, method: str, status_code: Optional[int] = None, error: Optional[Exception] = None) -> bool:
+        """
+        Check if a failed attempt should be retried.
+
+        :param attempt: The number of the attempt that failed, starting at 1.
+        :type attempt: int
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param status_code: The status code of the response, or None if the request failed without a response.
+        :type status_code: Optional[int]
+        :param error: The error raised by the request, or None if a response was received.
+        :type error: Optional[Exception]
+        :return: True if the request should be retried, False otherwise.
+        :rtype: bool
+        """
+        if attempt >= self.max_attempts:
+            return False
+
+        idempotent: bool = method in self.idempotent_methods
+
+        if error is not None:
+            if isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout)):
+                return True
+            return idempotent and isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+        if status_code not in self.retry_statuses:
+            return False
+        return status_code == 429 or idempotent
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Get how long to wait before retrying, using exponential backoff with full jitter.
+
+        :param attempt: The number of the attempt that failed, starting at 1.
+        :type attempt: int
+        :return: The amount of seconds to wait.
+        :rtype: float
+        """
+        return random.uniform(0, min(self.max_delay, self.base_delay * self.multiplier ** (attempt - 1)))
+
+
+class RetryBudget:
+    """
+    A token bucket that limits retries to a fraction of the client's requests.
+
+    Every request deposits `ratio` tokens, up to `capacity`, and every retry withdraws one. Once the budget runs dry,
+    failed requests aren't retried, so an unhealthy upstream doesn't get hit with a multiple of the normal traffic.
+    """
+
+    __slots__ = ("capacity", "ratio", "tokens")
+
+    def __init__(self, capacity: float = 10.0, ratio: float = 0.1):
+        self.capacity = capacity
+        self.ratio = ratio
+        self.tokens = capacity
+
+    def deposit(self) -> None:
+        """
+        Adds the tokens earned by a request.
+
+        :return: None
+        """
+        self.tokens = min(self.capacity, self.tokens + self.ratio)
+
+    def withdraw(self) -> bool:
+        """
+        Takes a token for a retry, if there is one.
+
+        :return: True if the retry is allowed, False if the budget is spent.
+        :rtype: bool
+        """
+        if self.tokens < 1:
+            return False
+        self.tokens -= 1
+        return True
+
+
+class CircuitState(str, Enum):
+    """
+    The state of a circuit breaker.
+
+    :param str CLOSED: Requests flow normally.
+    :param str OPEN: Requests fail fast without being sent.
+    :param str HALF_OPEN: A limited amount of probe requests are let through to test if the upstream has recovered.
+    """
+
+    CLOSED:    str = "closed"
+    OPEN:      str = "open"
+    HALF_OPEN: str = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Fails requests fast while the upstream is unhealthy.
+
+    The circuit opens after `failure_threshold` failures in a row. After `recovery_time` seconds it lets up to
+    `half_open_max_calls` probe requests through. A successful probe closes the circuit, a failed one opens it again.
+    Server errors, timeouts and network errors count as failures. Client errors and rate limits don't.
+    """
+
+    __slots__ = ("failure_threshold", "recovery_time", "half_open_max_calls", "state", "failures", "opened_at", "probes")
+
+    def __init__(self, failure_threshold: int = 5, recovery_time: float = 30.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_time = recovery_time
+        self.half_open_max_calls = half_open_max_calls
+
+        self.state: CircuitState = CircuitState.CLOSED
+        self.failures: int = 0
+        self.opened_at: float = 0.0
+        self.probes: int = 0
+
+    @property
+    def retry_after(self) -> float:
+        """
+        Get how long until an open circuit lets probe requests through.
+
+        :return: The amount of seconds left, 0 if the circuit isn't open.
+        :rtype: float
+        """
+        if self.state != CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.recovery_time - time.monotonic())
+
+    def before_request(self) -> None:
+        """
+        Lets a request through, or raises if the circuit is open.
+
+        :return: None
+        :raises CircuitOpenError: If the circuit is open, or half open with all probe slots taken.
+        """
+        if self.state == CircuitState.OPEN:
+            if self.retry_after > 0:
+                raise CircuitOpenError(f"circuit is open, upstream is unhealthy. retry in {self.retry_after:.1f}s")
+            self.state = CircuitState.HALF_OPEN
+            self.probes = 0
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self.probes >= self.half_open_max_calls:
+                raise CircuitOpenError("circuit is half open, waiting for probe requests to finish")
+            self.probes += 1
+
+    def record_success(self) -> None:
+        """
+        Records a request that reached a healthy upstream.
+
+        :return: None
+        """
+        self.failures = 0
+        self.probes = 0
+        self.state = CircuitState.CLOSED
+
+    def release(self) -> None:
+        """
+        Gives back the probe slot of a request that ended without a result, such as a cancelled one.
+
+        :return: None
+        """
+        if self.state == CircuitState.HALF_OPEN and self.probes > 0:
+            self.probes -= 1
+
+    def record_failure(self) -> None:
+        """
+        Records a request that failed because of the upstream.
+
+        :return: None
+        """
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+            self.probes = 0
+
+
+class RetryState:
+    """
+    A point in time view of a client's retry engine.
+
+    Attributes:
+        - requests (int): The amount of requests made, not counting retries.
+        - retries (int): The amount of retries made.
+        - retries_denied (int): The amount of retries skipped because the retry budget was spent.
+        - failures (int): The amount of requests that failed after all retries.
+        - rejected (int): The amount of requests rejected by the open circuit.
+        - budget (float): The tokens left in the retry budget.
+        - circuit_state (CircuitState): The state of the circuit breaker.
+        - circuit_retry_after (float): Seconds until an open circuit lets probe requests through.
+    """
+
+    __slots__ = ("requests", "retries", "retries_denied", "failures", "rejected", "budget", "circuit_state", "circuit_retry_after")
+
+    def __init__(self, requests: int, retries: int, retries_denied: int, failures: int, rejected: int, budget: float, circuit_state: CircuitState, circuit_retry_after: float):
+        self.requests = requests
+        self.retries = retries
+        self.retries_denied = retries_denied
+        self.failures = failures
+        self.rejected = rejected
+        self.budget = budget
+        self.circuit_state = circuit_state
+        self.circuit_retry_after = circuit_retry_after
+
+    def __repr__(self) -> str:
+        return "<RetryState requests={0.requests} retries={0.retries} circuit_state={0.circuit_state.value}>".format(self)
+
+
+class RetryEngine:
+    """
+    Ties a `RetryPolicy`, `RetryBudget` and `CircuitBreaker` together, and counts what they do.
+    """
+
+    __slots__ = ("policy", "budget", "breaker", "requests", "retries", "retries_denied", "failures", "rejected")
+
+    def __init__(self, policy: RetryPolicy = None, budget: RetryBudget = None, breaker: CircuitBreaker = None):
+        self.policy = policy or RetryPolicy()
+        self.budget = budget or RetryBudget()
+        self.breaker = breaker or CircuitBreaker()
+
+        self.requests: int = 0
+        self.retries: int = 0
+        self.retries_denied: int = 0
+        self.failures: int = 0
+        self.rejected: int = 0
+
+    def start(self) -> float:
+        """
+        Registers a new request, and checks the circuit breaker.
+
+        :return: The monotonic time the request started at.
+        :rtype: float
+        :raises CircuitOpenError: If the circuit is open.
+        """
+        try:
+            self.breaker.before_request()
+        except CircuitOpenError:
+            self.rejected += 1
+            raise
+
+        self.requests += 1
+        self.budget.deposit()
+        return time.monotonic()
+
+    def next_delay(
+        self,
+        started_at: float,
+        attempt: int,
+        method: str,
+        status_code: Optional[int] = None,
+        error: Optional[Exception] = None,
+        retry_after: Optional[float] = None
+    ) -> Optional[float]:
+        """
+        Decides if a failed attempt is retried, and takes a token from the budget if so.
+        The delay is the one the server asked for if there is one, else the policy's backoff.
+
+        :param started_at: The monotonic time the request started at.
+        :type started_at: float
+        :param attempt: The number of the attempt that failed, starting at 1.
+        :type attempt: int
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param status_code: The status code of the response, or None if the request failed without a response.
+        :type status_code: Optional[int]
+        :param error: The error raised by the request, or None if a response was received.
+        :type error: Optional[Exception]
+        :param retry_after: The amount of seconds the server asked to wait before retrying, if any.
+        :type retry_after: Optional[float]
+        :return: The amount of seconds to wait before retrying, or None if the request shouldn't be retried.
+        :rtype: Optional[float]
+        """
+        if self.breaker.state == CircuitState.OPEN or not self.policy.should_retry(attempt, method, status_code, error):
+            self.failures += 1
+            return None
+
+        delay: float = self.policy.backoff(attempt) if retry_after is None else retry_after
+        if time.monotonic() + delay - started_at > self.policy.max_retry_time:
+            self.failures += 1
+            return None
+
+        if not self.budget.withdraw():
+            self.retries_denied += 1
+            self.failures += 1
+            return None
+
+        self.retries += 1
+        return delay
+
+    def state(self) -> RetryState:
+        """
+        Get the current state of the retry engine.
+
+        :return: A snapshot of the counters, budget and circuit breaker.
+        :rtype: RetryState
+        """
+        return RetryState(
+            self.requests,
+            self.retries,
+            self.retries_denied,
+            self.failures,
+            self.rejected,
+            self.budget.tokens,
+            self.breaker.state,
+            self.breaker.retry_after
+        )
@@ -0,0 +1,74 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, TypeVar
+
+import anyio
+
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("event", "result", "error", "cancelled")
+
+    def __init__(self):
+        self.event = anyio.Event()
+        self.result: Any = None
+        self.error: Optional[Exception] = None
+        self.cancelled: bool = False
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key into a single call.
+
+    The first caller for a key runs the call, and every caller that arrives while it's in flight waits for it and gets
+    the same result or error, or a copy of the result if a `copy` function is given. If the first caller is cancelled,
+    one of the waiting callers runs the call instead.
+    """
+
+    __slots__ = ("calls", "coalesced")
+
+    def __init__(self):
+        self.calls: Dict[Hashable, _Call] = {}
+        self.coalesced: int = 0
+
+    async def do(self, key: Hashable, async_fn: Callable[..., Awaitable[T]], *args: Any, copy: Callable[[T], T] = None) -> T:
+        """
+        Runs the coroutine function, or waits for the call already in flight with the same key.
+
+        :param key: The key identifying the call.
+        :type key: Hashable
+        :param async_fn: The coroutine function to run.
+        :type async_fn: Callable[..., Awaitable[T]]
+        :param args: Positional arguments passed to the coroutine function.
+        :param copy: Makes the copies of the result handed to the waiting callers, which get the result itself if None.
+        :type copy: Callable[[T], T]
+        :return: The result of the call.
+        :rtype: T
+        """
+        while True:
+            call: Optional[_Call] = self.calls.get(key)
+            if call is None:
+                break
+
+            self.coalesced += 1
+            await call.event.wait()
+
+            if call.cancelled:
+                continue
+            if call.error is not None:
+                raise call.error
+            return call.result if copy is None else copy(call.result)
+
+        call = self.calls[key] = _Call()
+        try:
+            call.result = await async_fn(*args)
+            return call.result
+        except Exception as e:
+            call.error = e
+            raise
+        except BaseException:
+            call.cancelled = True
+            raise
+        finally:
+            del self.calls[key]
+            call.event.set()
@@ -0,0 +1,254 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, ContextManager, Dict, Iterator, List, Optional
+
+try:
+    from opentelemetry import trace as otel_trace
+except ImportError:
+    otel_trace = None
+
+
+class Span:
+    """
+    A single timed operation of a trace. Spans started inside another span become its children.
+    """
+
+    __slots__ = ()
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """
+        Sets an attribute of the span.
+
+        :param key: The name of the attribute.
+        :type key: str
+        :param value: The value of the attribute.
+        :type value: Any
+        :return: None
+        """
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        """
+        Marks the span as failed.
+
+        :param error: The error the operation failed with.
+        :type error: BaseException
+        :return: None
+        """
+        pass
+
+
+class _NoopSpanContext:
+    __slots__ = ()
+
+    def __enter__(self) -> Span:
+        return _NOOP_SPAN
+
+    def __exit__(self, *args) -> None:
+        return None
+
+
+_NOOP_SPAN: Span = Span()
+_NOOP_SPAN_CONTEXT: _NoopSpanContext = _NoopSpanContext()
+
+
+class Tracer:
+    """
+    Produces the spans of client calls. This base class records nothing, and is what clients use by default,
+    so tracing costs next to nothing unless a real tracer is given.
+
+    A traced call produces a span tree like this, where the HTTP phases need a real network transport:
+
+    - `pastemyst.get_paste`: the whole call.
+        - `http.request`: a request, including its retries.
+            - `ratelimit.acquire`: waiting for the bucket lock and a token.
+                - `ratelimit.global_pause` and `ratelimit.bucket_wait`: time spent paused.
+            - `http.attempt`: a single attempt.
+                - `http.connect`, `http.send`, `http.ttfb` and `http.body`: the phases of the round trip.
+            - `json.decode`: decoding the response body.
+        - `model.from_dict`: building the returned models.
+
+    Subclass it and override `span` and `record_span` to send spans somewhere, and set `enabled` to True.
+    """
+
+    __slots__ = ()
+
+    enabled: bool = False
+
+    def span(self, name: str, **attributes: Any) -> ContextManager[Span]:
+        """
+        Starts a span, ending it when the block exits. Errors raised in the block are recorded on the span.
+
+        :param name: The name of the span.
+        :type name: str
+        :param attributes: The attributes of the span.
+        :type attributes: Any
+        :return: A context manager giving the span.
+        :rtype: ContextManager[Span]
+        """
+        return _NOOP_SPAN_CONTEXT
+
+    def record_span(self, name: str, start: int, end: int, **attributes: Any) -> None:
+        """
+        Records a span that already happened, as a child of the current span.
+
+        :param name: The name of the span.
+        :type name: str
+        :param start: When the span started, in nanoseconds since the epoch.
+        :type start: int
+        :param end: When the span ended, in nanoseconds since the epoch.
+        :type end: int
+        :param attributes: The attributes of the span.
+        :type attributes: Any
+        :return: None
+        """
+        pass
+
+
+class RecordedSpan(Span):
+    """
+    A span kept in memory by a `RecordingTracer`.
+
+    Attributes:
+        - name (str): The name of the span.
+        - attributes (Dict[str, Any]): The attributes of the span.
+        - start (int): When the span started, in nanoseconds since the epoch.
+        - end (Optional[int]): When the span ended, in nanoseconds since the epoch, or None if it's still running.
+        - children (List[RecordedSpan]): The spans started inside this span.
+        - error (Optional[BaseException]): The error the span failed with, if any.
+    """
+
+    __slots__ = ("name", "attributes", "start", "end", "children", "error")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], start: int, end: Optional[int] = None):
+        self.name = name
+        self.attributes = attributes
+        self.start = start
+        self.end = end
+        self.children: List[RecordedSpan] = []
+        self.error: Optional[BaseException] = None
+
+    @property
+    def duration(self) -> float:
+        """
+        Get how long the span took.
+
+        :return: The duration of the span in seconds, or 0 if it's still running.
+        :rtype: float
+        """
+        return (self.end - self.start) / 1e9 if self.end is not None else 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.error = error
+
+    def find(self, name: str) -> List["RecordedSpan"]:
+        """
+        Finds every span with the given name in this span's tree, including itself.
+
+        :param name: The name of the spans.
+        :type name: str
+        :return: The matching spans, in the order they started.
+        :rtype: List[RecordedSpan]
+        """
+        found: List[RecordedSpan] = [self] if self.name == name else []
+        for child in self.children:
+            found.extend(child.find(name))
+        return found
+
+    def __repr__(self) -> str:
+        return "<RecordedSpan name={0.name!r} duration={0.duration:.6f} children={1}>".format(self, len(self.children))
+
+
+class RecordingTracer(Tracer):
+    """
+    A tracer that keeps every span tree in memory, for debugging and tests.
+    The parent of each span is tracked per task, so concurrent calls get their own trees.
+    """
+
+    __slots__ = ("roots", "__current")
+
+    enabled: bool = True
+
+    def __init__(self):
+        self.roots: List[RecordedSpan] = []
+        self.__current: ContextVar[Optional[RecordedSpan]] = ContextVar(f"pastemyst_span_{id(self)}", default=None)
+
+    def __add(self, span: RecordedSpan) -> None:
+        parent: Optional[RecordedSpan] = self.__current.get()
+        if parent is None:
+            self.roots.append(span)
+        else:
+            parent.children.append(span)
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[RecordedSpan]:
+        span: RecordedSpan = RecordedSpan(name, attributes, time.time_ns())
+        self.__add(span)
+
+        token = self.__current.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            self.__current.reset(token)
+            span.end = time.time_ns()
+
+    def record_span(self, name: str, start: int, end: int, **attributes: Any) -> None:
+        self.__add(RecordedSpan(name, attributes, start, end))
+
+    def clear(self) -> None:
+        """
+        Forgets every recorded span tree.
+
+        :return: None
+        """
+        self.roots = []
+
+
+class OpenTelemetryTracer(Tracer):
+    """
+    A tracer that sends spans to OpenTelemetry. Requires the `opentelemetry-api` package, and an SDK configured by
+    the application to export the spans anywhere.
+    """
+
+    __slots__ = ("tracer",)
+
+    enabled: bool = True
+
+    def __init__(self, tracer: "otel_trace.Tracer" = None):
+        """
+        :param tracer: The OpenTelemetry tracer to use. Gets a tracer named `pastemyst` from the global provider if None.
+        :type tracer: opentelemetry.trace.Tracer
+        """
+        if otel_trace is None:
+            raise ImportError("opentelemetry-api is not installed")
+
+        self.tracer = tracer or otel_trace.get_tracer("pastemyst")
+
+    @contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator["_OpenTelemetrySpan"]:
+        with self.tracer.start_as_current_span(name, attributes=attributes) as span:
+            yield _OpenTelemetrySpan(span)
+
+    def record_span(self, name: str, start: int, end: int, **attributes: Any) -> None:
+        self.tracer.start_span(name, attributes=attributes, start_time=start).end(end_time=end)
+
+
+class _OpenTelemetrySpan(Span):
+    __slots__ = ("span",)
+
+    def __init__(self, span: "otel_trace.Span"):
+        self.span = span
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.span.set_attribute(key, value)
+
+    def record_error(self, error: BaseException) -> None:
+        self.span.record_exception(error)
+        self.span.set_status(otel_trace.Status(otel_trace.StatusCode.ERROR, str(error)))
@@ -0,0 +1,569 @@
+from contextlib import contextmanager, nullcontext
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Tuple, Callable, Awaitable, TypeVar, Hashable, AsyncIterator, Optional, TextIO, ContextManager, Iterator, Type
+
+import anyio
+import httpx
+
+from pastemyst.models import RequestError, ExpiresIn, User, LanguageInfo, Paste, Pasty, HttpError, PasteResult
+from pastemyst.api.http import HttpClient
+from pastemyst.api.ratelimit import BucketState
+from pastemyst.api.compression import CompressionStats
+from pastemyst.api.deadline import deadline
+from pastemyst.api.events import EventHook
+from pastemyst.api.hedge import HedgeState
+from pastemyst.api.profiler import Profiler
+from pastemyst.api.retry import RetryState
+from pastemyst.api.singleflight import SingleFlight
+from pastemyst.cache import ResponseCache, PasteStore
+from pastemyst.utils.decoder import recording
+from pastemyst.utils.helpers import copy_json
+from pastemyst.utils.jsonstream import PastyStreamParser, PASTY_START, PASTY_FIELD, CODE_CHUNK, PASTY_END
+
+
+T = TypeVar("T")
+M = TypeVar("M")
+
+
+class AsyncClient:
+    """
+    Asynchronous client class for interacting with the pastemyst API.
+
+    Mirrors every method of `Client`, but as coroutines. It runs natively on both trio and asyncio.
+    The client can be used as an async context manager, which closes it on exit.
+    """
+
+    __slots__ = ("key", "is_dev", "api", "flights", "cache", "store", "lazy")
+
+    def __init__(
+        self,
+        key: str = None,
+        is_dev: bool = False,
+        transport: httpx.AsyncBaseTransport = None,
+        *,
+        coalesce: bool = True,
+        cache: ResponseCache = None,
+        store: PasteStore = None,
+        lazy: bool = False,
+        **options: Any
+    ):
+        """
+        :param key: The API key to authenticate with.
+        :type key: str
+        :param is_dev: Use the beta instance of pastemyst.
+        :type is_dev: bool
+        :param transport: The httpx transport to send requests through.
+        :type transport: httpx.AsyncBaseTransport
+        :param coalesce: Share one request and one parsed result between concurrent calls for the same paste, user or language.
+        :type coalesce: bool
+        :param cache: A cache for pastes, users and languages. Nothing is cached if None.
+        :type cache: ResponseCache
+        :param store: A persistent paste store, consulted by `get_paste` before the network. Nothing is stored if None.
+        :type store: PasteStore
+        :param lazy: Build the pasties, edits and timestamps of returned pastes only when they're first read.
+        :type lazy: bool
+        :param options: Keyword options for the underlying `HttpClient`, such as `retry_policy`, `circuit_breaker`, `compression`, `hedge_policy`, `hooks`, `tracer`, a default `timeout`, or an `endpoint` replacing the API's base URL.
+        """
+        self.key = key
+        self.is_dev = is_dev
+
+        self.api = HttpClient(key, is_dev, transport, **options)
+        self.flights = SingleFlight() if coalesce else None
+        self.cache = cache
+        self.store = store
+        self.lazy = lazy
+
+    def __deadline(self, timeout: Optional[float]) -> ContextManager[None]:
+        return deadline(self.api.timeout if timeout is None else timeout)
+
+    @contextmanager
+    def __call(self, name: str, timeout: Optional[float]) -> Iterator[None]:
+        with self.api.tracer.span(f"pastemyst.{name}"), self.__deadline(timeout):
+            yield
+
+    def __build(self, model: Type[M], data: Dict[str, Any]) -> M:
+        profiler: Optional[Profiler] = self.api.profiler
+        with self.api.tracer.span("model.from_dict", model=model.__name__), recording(profiler.record) if profiler is not None else nullcontext():
+            if self.lazy and model is PasteResult:
+                return PasteResult.from_dict(data, lazy=True)
+            return model.from_dict(data)
+
+    async def __coalesce(self, key: Tuple, async_fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+        # the calls share the raw response, and each caller gets its own copy to build its models from
+        if self.flights is None:
+            return await async_fn(*args)
+        return await self.flights.do(key, async_fn, *args, copy=copy_json)
+
+    async def __cached(self, kind: str, key: Hashable, async_fn: Callable[..., Awaitable[T]], *args: Any) -> T:
+        if self.cache is None:
+            return await async_fn(*args)
+
+        result: T = self.cache.get(kind, key)
+        if result is None:
+            result = await async_fn(*args)
+            self.cache.set(kind, key, result)
+        return result
+
+    async def __cache_paste(self, data: Dict[str, Any], persist: bool = True) -> None:
+        if not isinstance(data, dict) or "_id" not in data:
+            return
+
+        if self.cache is not None:
+            self.cache.set("paste", data["_id"], data, expires_at=data.get("deletesAt") or None)
+        if self.store is not None and persist:
+            await anyio.to_thread.run_sync(self.store.put, data)
+
+    async def __uncache_paste(self, paste_id: str) -> None:
+        if self.cache is not None:
+            self.cache.invalidate("paste", paste_id)
+        if self.store is not None:
+            await anyio.to_thread.run_sync(self.store.delete, paste_id)
+
+    async def __load_paste(self, paste_id: str) -> Dict[str, Any]:
+        result: Dict[str, Any] = self.cache.get("paste", paste_id) if self.cache is not None else None
+
+        if result is None and self.store is not None:
+            result = await anyio.to_thread.run_sync(self.store.get, paste_id)
+            if result is not None:
+                await self.__cache_paste(result, persist=False)
+
+        if result is None:
+            result = await self.api.get_paste(paste_id)
+            await self.__cache_paste(result)
+
+        return result
+
+    async def __fetch_paste(self, paste_id: str) -> PasteResult:
+        return self.__build(PasteResult, await self.__load_paste(paste_id))
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *args) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the client's connections.
+
+        :return: None
+        """
+        await self.api.close()
+
+    def authenticate(self, key: str) -> None:
+        """
+        Authenticates the client with the provided key.
+
+        :param key: The API key for the user.
+        :type key: str
+        :return: None
+        """
+        self.key = key
+        self.api.auth(key)
+
+        # what a user can see depends on who they are
+        if self.cache is not None:
+            self.cache.clear()
+
+    @property
+    def is_authenticated(self) -> bool:
+        """
+        Check if the client is authenticated.
+
+        :return: True if the client is authenticated, False otherwise.
+        :rtype bool
+        """
+        return self.api.is_authenticated
+
+    @property
+    def rate_limits(self) -> Dict[str, BucketState]:
+        """
+        Get the current state of the rate limit buckets, including the predicted wait time for a new request on each route.
+
+        :return: The state of every known bucket, by route template such as `GET./paste/{paste_id}`.
+        :rtype: Dict[str, BucketState]
+        """
+        return self.api.ratelimiter.snapshot()
+
+    @property
+    def retry_state(self) -> RetryState:
+        """
+        Get the current state of the retry engine, including the retry budget and the circuit breaker.
+
+        :return: A snapshot of the retry engine.
+        :rtype: RetryState
+        """
+        return self.api.retry.state()
+
+    @property
+    def compression_stats(self) -> List[CompressionStats]:
+        """
+        Get the measured compression of recent requests, with the compression ratio of each request and response body.
+
+        :return: The measured compression of recent requests, oldest first.
+        :rtype: List[CompressionStats]
+        """
+        return self.api.compression.stats()
+
+    @property
+    def profiler(self) -> Optional[Profiler]:
+        """
+        Get the profiler collecting the time spent in each phase of the client's calls.
+
+        :return: The profiler, or None if profiling isn't enabled.
+        :rtype: Optional[Profiler]
+        """
+        return self.api.profiler
+
+    def start_profiling(self, profiler: Profiler = None) -> Profiler:
+        """
+        Starts collecting the cumulative wall and CPU time spent in each phase of the client's calls.
+        Print `profiler.summary()` for a ranked report. Does nothing if profiling is already enabled.
+
+        :param profiler: The profiler to collect the times in. A new one is created if None.
+        :type profiler: Profiler
+        :return: The profiler collecting the times.
+        :rtype: Profiler
+        """
+        return self.api.start_profiling(profiler)
+
+    def stop_profiling(self) -> Optional[Profiler]:
+        """
+        Stops collecting times. The collected times stay available on the returned profiler.
+
+        :return: The profiler that was collecting the times, or None if profiling wasn't enabled.
+        :rtype: Optional[Profiler]
+        """
+        return self.api.stop_profiling()
+
+    def add_hook(self, hook: EventHook) -> None:
+        """
+        Adds an event hook, which is called with a `RequestEvent` when a request starts, waits for the rate limiter,
+        gets a response, is retried or fails. Pass a `MetricsRegistry` to collect metrics.
+
+        :param hook: The function to call with each event.
+        :type hook: EventHook
+        :return: None
+        """
+        self.api.hooks.append(hook)
+
+    def remove_hook(self, hook: EventHook) -> None:
+        """
+        Removes an event hook.
+
+        :param hook: The hook to remove.
+        :type hook: EventHook
+        :return: None
+        """
+        self.api.hooks.remove(hook)
+
+    @property
+    def hedge_state(self) -> Optional[HedgeState]:
+        """
+        Get the current state of request hedging, including how many hedges were sent and how many of them won.
+
+        :return: A snapshot of request hedging, or None if hedging isn't enabled.
+        :rtype: Optional[HedgeState]
+        """
+        return self.api.hedge.state() if self.api.hedge is not None else None
+
+    async def get_language_info(self, *, name: str = None, extension: str = None, timeout: float = None) -> LanguageInfo:
+        """
+        Retrieve information about a programming language based on its name or file extension.
+
+        :param name: The name of the programming language.
+        :type name: str
+        :param extension: The file extension of the programming language.
+        :type extension: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: An instance of LanguageInfo containing information about the programming language.
+        :rtype: LanguageInfo
+        """
+        with self.__call("get_language_info", timeout):
+            result: Dict[str, Any] = await self.__coalesce(
+                ("language", name, extension), self.__cached, "language", (name, extension), self.api.get_language, name, extension
+            )
+            return self.__build(LanguageInfo, result)
+
+    async def paste_exists(self, paste_id: str, *, timeout: float = None) -> bool:
+        """
+        Check if a paste exists.
+
+        :param paste_id: The ID of the paste to check.
+        :type paste_id: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: True if the paste exists, False otherwise.
+        :rtype: bool
+        """
+        with self.__call("paste_exists", timeout):
+            if paste_id is None or paste_id == "":
+                return False
+
+            try:
+                _: Dict[str, Any] = await self.api.get_paste(paste_id)
+                return True
+            except HttpError as e:
+                if e.status_code == 404:
+                    return False
+                else:
+                    raise e
+
+    async def get_paste(self, paste_id: str, *, timeout: float = None) -> PasteResult:
+        """
+        Retrieves a paste with the given paste_id.
+        Concurrent calls for the same paste share one request, but each gets its own PasteResult object.
+
+        :param paste_id: The ID of the paste to retrieve.
+        :type paste_id: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: The PasteResult object representing the retrieved paste.
+        :rtype: PasteResult
+        """
+        with self.__call("get_paste", timeout):
+            result: Dict[str, Any] = await self.__coalesce(("paste", paste_id), self.__load_paste, paste_id)
+            return self.__build(PasteResult, result)
+
+    async def stream_paste(self, paste_id: str, open_sink: Callable[[Pasty], TextIO] = None, *, timeout: float = None) -> AsyncIterator[Pasty]:
+        """
+        Streams the pasties of a paste one at a time, parsing the response as it arrives.
+        Only one pasty is held in memory at a time, which keeps memory use flat for very large pastes.
+
+        If `open_sink` is given, it's called with the pasty when its code starts, and must return a writable text sink,
+        such as a file opened for writing. The code is written to the sink in chunks as it arrives, so it's never held
+        in memory in full. The sink is closed once the code has been written, and the yielded pasty has empty code.
+        No sink is opened for pasties without any code.
+        Only the pasty fields that come before `code` in the response are set on the pasty passed to `open_sink`.
+
+        Responses are streamed straight from the network, so the cache and store aren't used.
+
+        :param paste_id: The ID of the paste to stream.
+        :type paste_id: str
+        :param open_sink: A function that opens a sink for the code of a pasty.
+        :type open_sink: Callable[[Pasty], TextIO]
+        :param timeout: Seconds to wait for each part of the response. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: An async iterator over the pasties of the paste.
+        :rtype: AsyncIterator[Pasty]
+        """
+        parser: PastyStreamParser = PastyStreamParser()
+        fields: Dict[str, Any] = {}
+        code: List[str] = []
+        sink: Optional[TextIO] = None
+
+        chunks: AsyncIterator[bytes] = self.api.stream_paste(paste_id)
+        try:
+            while not parser.is_done:
+                try:
+                    with self.__deadline(timeout):
+                        chunk: bytes = await chunks.__anext__()
+                    events: List[Tuple[str, Any]] = parser.feed(chunk)
+                except StopAsyncIteration:
+                    events = parser.close()
+
+                for event, value in events:
+                    if event == PASTY_START:
+                        fields = {}
+                        code = []
+                    elif event == PASTY_FIELD:
+                        fields[value[0]] = value[1]
+                    elif event == CODE_CHUNK:
+                        if open_sink is None:
+                            code.append(value)
+                            continue
+                        if sink is None:
+                            sink = open_sink(Pasty.from_dict(fields))
+                        sink.write(value)
+                    elif event == PASTY_END:
+                        if sink is not None:
+                            sink.close()
+                            sink = None
+                        fields["code"] = "".join(code)
+                        code = []
+                        yield Pasty.from_dict(fields)
+        finally:
+            if sink is not None:
+                sink.close()
+            await chunks.aclose()
+
+    async def create_paste(self, paste: Paste, *, timeout: float = None) -> PasteResult:
+        """
+        Create a paste object.
+
+        :param paste: The paste object to be created.
+        :type paste: Paste
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: The result of the paste creation.
+        :rtype: PasteResult
+        :raises RequestError: If the paste object has no pasties.
+        """
+        with self.__call("create_paste", timeout):
+            if len(paste.pasties) < 1:
+                raise RequestError("paste object must have at least one pasty")
+
+            result: Dict[str, Any] = await self.api.create_paste(paste)
+            return self.__build(PasteResult, result)
+
+    async def edit_paste(self, paste: Paste, target_id: str = None, *, timeout: float = None) -> PasteResult:
+        """
+        Updates / edits the given paste. The paste must have already been uploaded, and either contain a paste ID or a target ID must be provided
+
+        Only the fields in `paste.changed` are sent. If nothing changed, no edit is made: a PasteResult is returned as
+        is, and the current paste is fetched for other pastes. Pasties without an ID, such as ones added with `add_pasty`,
+        are sent whole and added to the paste. The paste is marked clean once the edit is saved.
+
+        :param paste: The Paste object to be edited.
+        :type paste: Paste
+        :param target_id: The ID of the target paste to edit. If None, the ID of the provided Paste object will be used as the target ID.
+        :type target_id: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: A PasteResult object containing the result of the paste edit operation.
+        :rtype: PasteResult
+        """
+        with self.__call("edit_paste", timeout):
+            target_id = target_id or getattr(paste, "id", None)
+            if not paste.changed:
+                if isinstance(paste, PasteResult):
+                    return paste
+                return await self.__fetch_paste(target_id)
+
+            result: Dict[str, Any] = await self.api.edit_paste(paste, target_id)
+            paste.mark_clean()
+
+            await self.__uncache_paste(target_id)
+            await self.__cache_paste(result)
+
+            return self.__build(PasteResult, result)
+
+    async def delete_paste(self, paste: str | PasteResult, *, timeout: float = None) -> bool:
+        """
+        Deletes a paste.
+        You must be authenticated to perform this, and you can only perform it if the paste belongs to you
+
+        :param paste: The paste to delete. It can be either a string representing the paste ID or a PasteResult object.
+        :type paste: str | PasteResult
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: True if the paste was successfully deleted, False otherwise.
+        :rtype: bool
+        :raises RequestError: If the user is not authenticated or if the paste does not have an id field.
+        """
+        with self.__call("delete_paste", timeout):
+            if not self.is_authenticated:
+                raise RequestError("you must be authenticated before deleting your own paste")
+
+            if isinstance(paste, PasteResult):
+                if not hasattr(paste, "id"):
+                    raise RequestError("paste must have id field")
+
+                paste_id = paste.id
+            else:
+                paste_id = paste
+            result: int = await self.api.delete_paste(paste_id)
+
+            await self.__uncache_paste(paste_id)
+
+            return result == 200
+
+    async def get_expire_stamp(self, paste: str | PasteResult, *, timeout: float = None) -> datetime:
+        """
+        Retrieves the expiration stamp of a given paste.
+
+        If `paste` is a string, the paste is fetched first. The paste must have the `expires_in` and `created_at` fields,
+        and must not be set to never expire.
+
+        :param paste: Either a string representing the ID of the paste or a `PasteResult` object.
+        :type paste: str | PasteResult
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: A `datetime` object representing the expiration stamp of the paste.
+        :rtype: datetime
+        """
+        with self.__call("get_expire_stamp", timeout):
+            if isinstance(paste, str):
+                paste = await self.get_paste(paste)
+
+            if not paste.expires_in:
+                raise RequestError("paste must have expires_in field")
+            if not paste.created_at:
+                raise RequestError("paste must have created_at field")
+            if paste.expires_in == ExpiresIn.NEVER:
+                raise RequestError("can't find expiration stamp of paste that never expires")
+
+            unix_stamp: float = (datetime.fromtimestamp(paste.created_at.timestamp()) - datetime(1970, 1, 1)).total_seconds()
+            result: Dict[str, int] | int = await self.api.get_expire_unix(int(unix_stamp), paste.expires_in.value)
+
+            # the API answers with {"result": <unix time>}
+            if isinstance(result, dict):
+                result = result["result"]
+            return datetime.fromtimestamp(int(result), timezone.utc)
+
+    async def user_exists(self, username: str, *, timeout: float = None) -> bool:
+        """
+        Checks if a user with the given username exists
+
+        :param username: The username to check if it exists.
+        :type username: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: True if the user exists, False otherwise.
+        :rtype: bool
+        """
+        with self.__call("user_exists", timeout):
+            result: int = await self.__cached("user_exists", username, self.api.get_user_exists, username)
+            return result == 200
+
+    async def get_user(self, username: str, *, timeout: float = None) -> User:
+        """
+        Gets a user with the given username
+
+        :param username: The username of the user to retrieve
+        :type username: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: A User object representing the retrieved user information
+        :rtype: User
+        """
+        with self.__call("get_user", timeout):
+            result: Dict[str, Any] = await self.__coalesce(("user", username), self.__cached, "user", username, self.api.get_user, username)
+            return self.__build(User, result)
+
+    async def get_self_user(self, *, timeout: float = None) -> User:
+        """
+        Get information about the authenticated user.
+
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: The user information as an instance of the User class.
+        :rtype: User
+        """
+        with self.__call("get_self_user", timeout):
+            result: Dict[str, Any] = await self.api.get_self()
+            return self.__build(User, result)
+
+    async def get_self_user_pastes(self, *, timeout: float = None) -> List[PasteResult]:
+        """
+        Retrieves all the pastes created by the authenticated user.
+        The pastes are fetched concurrently.
+
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: A list of PasteResult objects representing the pastes created by the self user.
+        :rtype: List[PasteResult]
+        """
+        with self.__call("get_self_user_pastes", timeout):
+            result: List[str] = await self.api.get_self_pastes()
+            pastes: List[PasteResult] = [None] * len(result)
+
+            async def fetch(index: int, paste_id: str) -> None:
+                pastes[index] = await self.get_paste(paste_id)
+
+            async with anyio.create_task_group() as tg:
+                for i, paste in enumerate(result):
+                    tg.start_soon(fetch, i, paste)
+
+            return pastes
@@ -0,0 +1,2 @@
+from .memory import ResponseCache, CacheStats
+from .disk import PasteStore, StoreStats
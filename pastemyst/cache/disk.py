@@ -0,0 +1,235 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from pastemyst.utils.codec import JsonCodec, get_codec
+
+
+class StoreStats:
+    """
+    A point in time view of a paste store.
+
+    Attributes:
+        - count (int): The amount of pastes stored.
+        - size (int): The total size of the stored paste data, in bytes.
+        - max_size (int): The size the store is compacted down to, in bytes.
+        - expired (int): The amount of stored pastes that have expired, but haven't been removed yet.
+    """
+
+    __slots__ = ("count", "size", "max_size", "expired")
+
+    def __init__(self, count: int, size: int, max_size: int, expired: int):
+        self.count = count
+        self.size = size
+        self.max_size = max_size
+        self.expired = expired
+
+    def __repr__(self) -> str:
+        return "<StoreStats count={0.count} size={0.size}/{0.max_size}>".format(self)
+
+
+class PasteStore:
+    """
+    A persistent paste cache backed by an SQLite database, which survives process restarts.
+
+    Pastes are stored as their raw JSON, keyed by paste id, along with their `created_at`, `deletes_at` and edit count.
+    Expired pastes, and pastes stored longer than `max_age` ago, are never returned, so edits and deletions made on the
+    server are picked up once a stored copy gets too old. Expired pastes are removed when the store is compacted.
+    Compaction also drops the least recently used pastes until the store fits in `max_size` bytes, and runs
+    automatically every `compact_every` writes.
+
+    The database runs in WAL mode with a busy timeout, so several processes on the same host can share one store.
+    Each thread gets its own connection.
+    """
+
+    __slots__ = ("path", "max_size", "max_age", "compact_every", "timeout", "codec", "__local", "__connections", "__writes", "__lock")
+
+    def __init__(self, path: str | os.PathLike, max_size: int = 256 * 1024 * 1024, max_age: Optional[float] = 3600.0, compact_every: int = 100, timeout: float = 30.0, codec: JsonCodec = None):
+        """
+        :param path: The path of the database file. It's created if it doesn't exist.
+        :type path: str | os.PathLike
+        :param max_size: The size, in bytes, the store is compacted down to.
+        :type max_size: int
+        :param max_age: Seconds a stored paste is trusted for before it's fetched again. Pastes are trusted until they
+            expire if None, which never picks up edits or deletions of pastes that don't expire.
+        :type max_age: Optional[float]
+        :param compact_every: Compact the store after this many writes from this process. Never compacts automatically if 0.
+        :type compact_every: int
+        :param timeout: Seconds to wait for another process to release the database.
+        :type timeout: float
+        :param codec: The JSON codec used to store pastes. Uses the fastest installed codec if None.
+        :type codec: JsonCodec
+        """
+        self.path = os.fspath(path)
+        self.max_size = max_size
+        self.max_age = max_age
+        self.compact_every = compact_every
+        self.timeout = timeout
+        self.codec = codec or get_codec()
+
+        self.__local = threading.local()
+        self.__connections: List[sqlite3.Connection] = []
+        self.__writes: int = 0
+        self.__lock = threading.Lock()
+
+        connection: sqlite3.Connection = self.__connection()
+        # auto_vacuum only applies by itself to databases created with it, older ones have to be rebuilt once
+        if connection.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            connection.execute("VACUUM")
+
+    def __connection(self) -> sqlite3.Connection:
+        connection: Optional[sqlite3.Connection] = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None, check_same_thread=False)
+            connection.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            connection.execute("PRAGMA journal_mode = WAL")
+            connection.execute("PRAGMA synchronous = NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS pastes ("
+                "id TEXT PRIMARY KEY, "
+                "data BLOB NOT NULL, "
+                "created_at INTEGER NOT NULL, "
+                "deletes_at INTEGER NOT NULL, "
+                "edit_count INTEGER NOT NULL, "
+                "size INTEGER NOT NULL, "
+                "stored_at REAL NOT NULL, "
+                "accessed_at REAL NOT NULL)"
+            )
+            connection.execute("CREATE INDEX IF NOT EXISTS pastes_deletes_at ON pastes (deletes_at) WHERE deletes_at > 0")
+            connection.execute("CREATE INDEX IF NOT EXISTS pastes_accessed_at ON pastes (accessed_at)")
+            self.__local.connection = connection
+
+            with self.__lock:
+                self.__connections.append(connection)
+        return connection
+
+    def get(self, paste_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks up a stored paste.
+
+        :param paste_id: The id of the paste.
+        :type paste_id: str
+        :return: The raw paste data, or None if the paste isn't stored, has expired or is older than `max_age`.
+        :rtype: Optional[Dict[str, Any]]
+        """
+        connection: sqlite3.Connection = self.__connection()
+        row = connection.execute("SELECT data, deletes_at, stored_at FROM pastes WHERE id = ?", (paste_id,)).fetchone()
+        if row is None:
+            return None
+
+        now: float = time.time()
+        data, deletes_at, stored_at = row
+        if (deletes_at and deletes_at <= now) or (self.max_age is not None and stored_at + self.max_age <= now):
+            connection.execute("DELETE FROM pastes WHERE id = ?", (paste_id,))
+            return None
+
+        connection.execute("UPDATE pastes SET accessed_at = ? WHERE id = ?", (now, paste_id))
+        return self.codec.loads(data)
+
+    def put(self, data: Dict[str, Any]) -> None:
+        """
+        Stores a paste, replacing any stored version of it.
+
+        :param data: The raw paste data, as returned by the API.
+        :type data: Dict[str, Any]
+        :return: None
+        """
+        deletes_at: int = int(data.get("deletesAt") or 0)
+        now: float = time.time()
+        if deletes_at and deletes_at <= now:
+            return
+
+        raw: bytes = self.codec.dumps(data)
+        self.__connection().execute(
+            "INSERT OR REPLACE INTO pastes (id, data, created_at, deletes_at, edit_count, size, stored_at, accessed_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (data["_id"], raw, int(data.get("createdAt") or 0), deletes_at, len(data.get("edits") or ()), len(raw), now, now)
+        )
+
+        with self.__lock:
+            self.__writes += 1
+            compact: bool = self.compact_every > 0 and self.__writes % self.compact_every == 0
+        if compact:
+            self.compact()
+
+    def delete(self, paste_id: str) -> None:
+        """
+        Removes a stored paste.
+
+        :param paste_id: The id of the paste.
+        :type paste_id: str
+        :return: None
+        """
+        self.__connection().execute("DELETE FROM pastes WHERE id = ?", (paste_id,))
+
+    def remove_expired(self) -> int:
+        """
+        Removes every stored paste that has expired.
+
+        :return: The amount of pastes removed.
+        :rtype: int
+        """
+        cursor: sqlite3.Cursor = self.__connection().execute("DELETE FROM pastes WHERE deletes_at > 0 AND deletes_at <= ?", (int(time.time()),))
+        return cursor.rowcount
+
+    def compact(self) -> int:
+        """
+        Removes expired pastes, then the least recently used pastes until the store fits in `max_size`, and gives the
+        freed space back to the file system.
+
+        :return: The amount of pastes removed.
+        :rtype: int
+        """
+        connection: sqlite3.Connection = self.__connection()
+        removed: int = self.remove_expired()
+
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            size: int = connection.execute("SELECT COALESCE(SUM(size), 0) FROM pastes").fetchone()[0]
+            if size > self.max_size:
+                excess: int = size - self.max_size
+                freed: int = 0
+                doomed: list = []
+                for paste_id, paste_size in connection.execute("SELECT id, size FROM pastes ORDER BY accessed_at"):
+                    if freed >= excess:
+                        break
+                    doomed.append((paste_id,))
+                    freed += paste_size
+
+                connection.executemany("DELETE FROM pastes WHERE id = ?", doomed)
+                removed += len(doomed)
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+
+        connection.execute("PRAGMA incremental_vacuum")
+        connection.execute("PRAGMA wal_checkpoint(PASSIVE)")
+        return removed
+
+    def stats(self) -> StoreStats:
+        """
+        Get the size of the store.
+
+        :return: A snapshot of the store's size.
+        :rtype: StoreStats
+        """
+        count, size, expired = self.__connection().execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0), COALESCE(SUM(deletes_at > 0 AND deletes_at <= ?), 0) FROM pastes", (int(time.time()),)
+        ).fetchone()
+        return StoreStats(count, size, self.max_size, expired)
+
+    def close(self) -> None:
+        """
+        Closes every connection to the database. The store reconnects if it's used again.
+
+        :return: None
+        """
+        with self.__lock:
+            connections: List[sqlite3.Connection] = self.__connections
+            self.__connections = []
+            self.__local = threading.local()
+
+        for connection in connections:
+            connection.close()
@@ -0,0 +1,171 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from pastemyst.utils.helpers import copy_json
+
+
+class CacheStats:
+    """
+    A point in time view of a cache's counters.
+
+    Attributes:
+        - hits (int): The amount of lookups that found a live entry.
+        - misses (int): The amount of lookups that found nothing, or an expired entry.
+        - evictions (int): The amount of entries dropped to make room for new ones.
+        - expirations (int): The amount of entries dropped because they expired.
+        - invalidations (int): The amount of entries dropped because the data changed.
+        - size (int): The amount of entries currently cached.
+        - max_size (int): The maximum amount of entries.
+    """
+
+    __slots__ = ("hits", "misses", "evictions", "expirations", "invalidations", "size", "max_size")
+
+    def __init__(self, hits: int, misses: int, evictions: int, expirations: int, invalidations: int, size: int, max_size: int):
+        self.hits = hits
+        self.misses = misses
+        self.evictions = evictions
+        self.expirations = expirations
+        self.invalidations = invalidations
+        self.size = size
+        self.max_size = max_size
+
+    @property
+    def hit_ratio(self) -> float:
+        """
+        Get the share of lookups that were hits.
+
+        :return: The hit ratio, between 0 and 1.
+        :rtype: float
+        """
+        lookups: int = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def __repr__(self) -> str:
+        return "<CacheStats hits={0.hits} misses={0.misses} evictions={0.evictions} size={0.size}/{0.max_size}>".format(self)
+
+
+class ResponseCache:
+    """
+    A bounded in-memory cache for API responses, with least recently used eviction.
+
+    Entries live for the TTL of their kind of resource. An entry can also be given an absolute expiry time, such as the
+    time a paste gets deleted at, in which case it expires at whichever comes first.
+    The cache stores a copy of the raw response data and every lookup returns a copy of its own, so the models built
+    from a lookup can be changed without changing the cached entry.
+    """
+
+    DEFAULT_TTLS: Dict[str, float] = {
+        "paste": 60.0,
+        "user": 300.0,
+        "user_exists": 300.0,
+        "language": 86400.0
+    }
+
+    __slots__ = ("max_size", "ttls", "entries", "hits", "misses", "evictions", "expirations", "invalidations")
+
+    def __init__(self, max_size: int = 1024, ttls: Dict[str, float] = None):
+        """
+        :param max_size: The maximum amount of entries to keep.
+        :type max_size: int
+        :param ttls: Seconds to keep each kind of resource for, overriding `DEFAULT_TTLS`. A TTL of 0 disables caching that kind.
+        :type ttls: Dict[str, float]
+        """
+        self.max_size = max_size
+        self.ttls: Dict[str, float] = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self.entries: OrderedDict[Tuple[str, Hashable], Tuple[float, Any]] = OrderedDict()
+
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+        self.expirations: int = 0
+        self.invalidations: int = 0
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def get(self, kind: str, key: Hashable) -> Optional[Any]:
+        """
+        Looks up a live entry.
+
+        :param kind: The kind of resource, such as "paste".
+        :type kind: str
+        :param key: The key of the resource within its kind, such as the paste id.
+        :type key: Hashable
+        :return: A copy of the cached value, or None if there's no live entry.
+        :rtype: Optional[Any]
+        """
+        entry: Optional[Tuple[float, Any]] = self.entries.get((kind, key))
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if entry[0] <= time.time():
+            del self.entries[(kind, key)]
+            self.expirations += 1
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end((kind, key))
+        self.hits += 1
+        return copy_json(entry[1])
+
+    def set(self, kind: str, key: Hashable, value: Any, expires_at: float = None) -> None:
+        """
+        Stores an entry, evicting the least recently used entries if the cache is full.
+
+        :param kind: The kind of resource, such as "paste".
+        :type kind: str
+        :param key: The key of the resource within its kind, such as the paste id.
+        :type key: Hashable
+        :param value: The value to cache, which is copied.
+        :type value: Any
+        :param expires_at: A unix timestamp the entry must expire at, even if its TTL hasn't run out.
+        :type expires_at: float
+        :return: None
+        """
+        ttl: float = self.ttls.get(kind, 0.0)
+        if ttl <= 0 or self.max_size <= 0:
+            return
+
+        deadline: float = time.time() + ttl
+        if expires_at:
+            deadline = min(deadline, expires_at)
+
+        self.entries[(kind, key)] = (deadline, copy_json(value))
+        self.entries.move_to_end((kind, key))
+
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, kind: str, key: Hashable) -> None:
+        """
+        Drops an entry, if it's cached.
+
+        :param kind: The kind of resource, such as "paste".
+        :type kind: str
+        :param key: The key of the resource within its kind, such as the paste id.
+        :type key: Hashable
+        :return: None
+        """
+        if self.entries.pop((kind, key), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        """
+        Drops every entry. The counters are kept.
+
+        :return: None
+        """
+        self.invalidations += len(self.entries)
+        self.entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Get the cache's counters.
+
+        :return: A snapshot of the counters.
+        :rtype: CacheStats
+        """
+        return CacheStats(self.hits, self.misses, self.evictions, self.expirations, self.invalidations, len(self.entries), self.max_size)
@@ -1,25 +1,101 @@
-from datetime import datetime, timezone
-from typing import Dict, Any, List
+import weakref
+from datetime import datetime
+from functools import partial
+from typing import Any, Dict, List, Optional, Callable, Iterator, AsyncIterator, TextIO
 
-import trio
+import httpx
 
-from pastemyst.utils import mangle_attr
-from pastemyst.models import RequestError, ExpiresIn, User, LanguageInfo, Paste, HttpError, PasteResult
-from pastemyst.api.http import HttpClient
+from pastemyst.models import PastemystError, User, LanguageInfo, Paste, Pasty, PasteResult
+from pastemyst.api.loop import LoopThread
+from pastemyst.api.ratelimit import BucketState
+from pastemyst.api.compression import CompressionStats
+from pastemyst.api.events import EventHook
+from pastemyst.api.hedge import HedgeState
+from pastemyst.api.profiler import Profiler
+from pastemyst.api.retry import RetryState
+from pastemyst.async_client import AsyncClient
+from pastemyst.cache import ResponseCache
+
+
+def _shutdown(client: AsyncClient, loop: LoopThread) -> None:
+    client.stop_profiling()
+    if loop.is_running:
+        if not loop.is_current:
+            loop.run(client.close)
+        loop.stop()
 
 
 class Client:
     """
     Client class for interacting with the pastemyst API.
+
+    This is a blocking wrapper around `AsyncClient`. All requests are run on a single background event loop, which is
+    started on the first request and kept alive until the client is closed. This keeps the connection pool warm between calls.
+    The client can be used as a context manager, which closes it on exit. A client that is never closed is closed when it's
+    garbage collected, or at interpreter exit.
     """
 
-    __slots__ = ("key", "is_dev", "api")
+    __slots__ = ("key", "is_dev", "api", "__client", "__loop", "__closed", "__finalizer", "__weakref__")
 
-    def __init__(self, key: str = None, is_dev: bool = False):
+    def __init__(self, key: str = None, is_dev: bool = False, transport: httpx.AsyncBaseTransport = None, **options: Any):
+        """
+        :param key: The API key to authenticate with.
+        :type key: str
+        :param is_dev: Use the beta instance of pastemyst.
+        :type is_dev: bool
+        :param transport: The httpx transport to send requests through.
+        :type transport: httpx.AsyncBaseTransport
+        :param options: Keyword options for the underlying `AsyncClient`.
+        """
         self.key = key
         self.is_dev = is_dev
 
-        self.api = HttpClient(key, is_dev)
+        self.__client = AsyncClient(key, is_dev, transport, **options)
+        self.api = self.__client.api
+
+        self.__loop = LoopThread()
+        self.__closed = False
+        self.__finalizer = weakref.finalize(self, _shutdown, self.__client, self.__loop)
+
+    def __enter__(self) -> "Client":
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+    def __run(self, async_fn, *args):
+        if self.__closed:
+            raise PastemystError("client has been closed")
+
+        profiler: Optional[Profiler] = self.__client.profiler
+        if profiler is not None and not self.__loop.is_running:
+            with profiler.phase("loop startup"):
+                self.__loop.start()
+
+        return self.__loop.run(async_fn, *args)
+
+    @property
+    def is_closed(self) -> bool:
+        """
+        Check if the client has been closed.
+
+        :return: True if the client is closed, False otherwise.
+        :rtype: bool
+        """
+        return self.__closed
+
+    def close(self) -> None:
+        """
+        Closes the client's connections and stops its background event loop.
+        The client can't be used for requests after it has been closed.
+
+        :return: None
+        """
+        if self.__closed:
+            return
+
+        self.__finalizer()
+        self.__closed = True
 
     def authenticate(self, key: str) -> None:
         """
@@ -30,7 +106,7 @@ class Client:
         :return: None
         """
         self.key = key
-        self.api.auth(key)
+        self.__client.authenticate(key)
 
     @property
     def is_authenticated(self) -> bool:
@@ -42,7 +118,110 @@ class Client:
         """
         return self.api.is_authenticated
 
-    def get_language_info(self, *, name: str = None, extension: str = None) -> LanguageInfo:
+    @property
+    def rate_limits(self) -> Dict[str, BucketState]:
+        """
+        Get the current state of the rate limit buckets, including the predicted wait time for a new request on each route.
+
+        :return: The state of every known bucket, by route template such as `GET./paste/{paste_id}`.
+        :rtype: Dict[str, BucketState]
+        """
+        return self.__client.rate_limits
+
+    @property
+    def cache(self) -> Optional[ResponseCache]:
+        """
+        Get the client's response cache, if it has one.
+
+        :return: The response cache, or None if caching is disabled.
+        :rtype: Optional[ResponseCache]
+        """
+        return self.__client.cache
+
+    @property
+    def retry_state(self) -> RetryState:
+        """
+        Get the current state of the retry engine, including the retry budget and the circuit breaker.
+
+        :return: A snapshot of the retry engine.
+        :rtype: RetryState
+        """
+        return self.__client.retry_state
+
+    @property
+    def compression_stats(self) -> List[CompressionStats]:
+        """
+        Get the measured compression of recent requests, with the compression ratio of each request and response body.
+
+        :return: The measured compression of recent requests, oldest first.
+        :rtype: List[CompressionStats]
+        """
+        return self.__client.compression_stats
+
+    @property
+    def profiler(self) -> Optional[Profiler]:
+        """
+        Get the profiler collecting the time spent in each phase of the client's calls.
+
+        :return: The profiler, or None if profiling isn't enabled.
+        :rtype: Optional[Profiler]
+        """
+        return self.__client.profiler
+
+    def start_profiling(self, profiler: Profiler = None) -> Profiler:
+        """
+        Starts collecting the cumulative wall and CPU time spent in each phase of the client's calls, including the
+        startup of the background event loop. Print `profiler.summary()` for a ranked report.
+        Does nothing if profiling is already enabled.
+
+        :param profiler: The profiler to collect the times in. A new one is created if None.
+        :type profiler: Profiler
+        :return: The profiler collecting the times.
+        :rtype: Profiler
+        """
+        return self.__client.start_profiling(profiler)
+
+    def stop_profiling(self) -> Optional[Profiler]:
+        """
+        Stops collecting times. The collected times stay available on the returned profiler.
+
+        :return: The profiler that was collecting the times, or None if profiling wasn't enabled.
+        :rtype: Optional[Profiler]
+        """
+        return self.__client.stop_profiling()
+
+    def add_hook(self, hook: EventHook) -> None:
+        """
+        Adds an event hook, which is called with a `RequestEvent` when a request starts, waits for the rate limiter,
+        gets a response, is retried or fails. Pass a `MetricsRegistry` to collect metrics.
+
+        :param hook: The function to call with each event.
+        :type hook: EventHook
+        :return: None
+        """
+        self.__client.add_hook(hook)
+
+    def remove_hook(self, hook: EventHook) -> None:
+        """
+        Removes an event hook.
+
+        :param hook: The hook to remove.
+        :type hook: EventHook
+        :return: None
+        """
+        self.__client.remove_hook(hook)
+
+    @property
+    def hedge_state(self) -> Optional[HedgeState]:
+        """
+        Get the current state of request hedging, including how many hedges were sent and how many of them won.
+
+        :return: A snapshot of request hedging, or None if hedging isn't enabled.
+        :rtype: Optional[HedgeState]
+        """
+        return self.__client.hedge_state
+
+    def get_language_info(self, *, name: str = None, extension: str = None, timeout: float = None) -> LanguageInfo:
         """
         Retrieve information about a programming language based on its name or file extension.
 
@@ -50,100 +229,121 @@ class Client:
         :type name: str
         :param extension: The file extension of the programming language.
         :type extension: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: An instance of LanguageInfo containing information about the programming language.
         :rtype: LanguageInfo
         """
-        result: Dict[str, Any] = trio.run(self.api.get_language, name, extension)
-        return LanguageInfo.from_dict(result)
+        return self.__run(partial(self.__client.get_language_info, name=name, extension=extension, timeout=timeout))
 
-    def paste_exists(self, paste_id: str) -> bool:
+    def paste_exists(self, paste_id: str, *, timeout: float = None) -> bool:
         """
         Check if a paste exists.
 
         :param paste_id: The ID of the paste to check.
         :type paste_id: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: True if the paste exists, False otherwise.
         :rtype: bool
         """
-        if paste_id is None or paste_id == "":
-            return False
+        return self.__run(partial(self.__client.paste_exists, paste_id, timeout=timeout))
 
-        try:
-            _: Dict[str, Any] = trio.run(self.api.get_paste, paste_id)
-            return True
-        except HttpError as e:
-            if e.status_code == 404:
-                return False
-            else:
-                raise e
-
-    def get_paste(self, paste_id: str) -> PasteResult:
+    def get_paste(self, paste_id: str, *, timeout: float = None) -> PasteResult:
         """
         Retrieves a paste with the given paste_id.
 
         :param paste_id: The ID of the paste to retrieve.
         :type paste_id: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: The PasteResult object representing the retrieved paste.
         :rtype: PasteResult
         """
-        result: Dict[str, Any] = trio.run(self.api.get_paste, paste_id)
-        return PasteResult.from_dict(result)
+        return self.__run(partial(self.__client.get_paste, paste_id, timeout=timeout))
+
+    def stream_paste(self, paste_id: str, open_sink: Callable[[Pasty], TextIO] = None, *, timeout: float = None) -> Iterator[Pasty]:
+        """
+        Streams the pasties of a paste one at a time, parsing the response as it arrives.
+        Only one pasty is held in memory at a time, which keeps memory use flat for very large pastes.
 
-    def create_paste(self, paste: Paste) -> PasteResult:
+        If `open_sink` is given, it's called with the pasty when its code starts, and must return a writable text sink,
+        such as a file opened for writing. The code is written to the sink in chunks as it arrives, and the yielded
+        pasty has empty code. See `AsyncClient.stream_paste`.
+
+        :param paste_id: The ID of the paste to stream.
+        :type paste_id: str
+        :param open_sink: A function that opens a sink for the code of a pasty.
+        :type open_sink: Callable[[Pasty], TextIO]
+        :param timeout: Seconds to wait for each part of the response. Uses the client's default timeout if None.
+        :type timeout: float
+        :return: An iterator over the pasties of the paste.
+        :rtype: Iterator[Pasty]
+        """
+        pasties: AsyncIterator[Pasty] = self.__client.stream_paste(paste_id, open_sink, timeout=timeout)
+
+        async def step() -> Pasty:
+            return await pasties.__anext__()
+
+        try:
+            while True:
+                try:
+                    yield self.__run(step)
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self.__closed:
+                self.__run(pasties.aclose)
+
+    def create_paste(self, paste: Paste, *, timeout: float = None) -> PasteResult:
         """
         Create a paste object.
 
         :param paste: The paste object to be created.
         :type paste: Paste
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: The result of the paste creation.
         :rtype: PasteResult
         :raises RequestError: If the paste object has no pasties.
         """
-        if len(paste.pasties) < 1:
-            raise RequestError("paste object must have at least one pasty")
-
-        result: Dict[str, Any] = trio.run(self.api.create_paste, paste)
-        return PasteResult.from_dict(result)
+        return self.__run(partial(self.__client.create_paste, paste, timeout=timeout))
 
-    def edit_paste(self, paste: Paste, target_id: str = None) -> PasteResult:
+    def edit_paste(self, paste: Paste, target_id: str = None, *, timeout: float = None) -> PasteResult:
         """
         Updates / edits the given paste. The paste must have already been uploaded, and either contain a paste ID or a target ID must be provided
 
+        Only the fields in `paste.changed` are sent. If nothing changed, no edit is made: a PasteResult is returned as
+        is, and the current paste is fetched for other pastes. Pasties without an ID, such as ones added with `add_pasty`,
+        are sent whole and added to the paste. The paste is marked clean once the edit is saved.
+
         :param paste: The Paste object to be edited.
         :type paste: Paste
         :param target_id: The ID of the target paste to edit. If None, the ID of the provided Paste object will be used as the target ID.
         :type target_id: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: A PasteResult object containing the result of the paste edit operation.
         :rtype: PasteResult
         """
-        result: Dict[str, Any] = trio.run(self.api.edit_paste, paste, target_id or getattr(paste, mangle_attr(Paste, "__id"), None))
-        return PasteResult.from_dict(result)
+        return self.__run(partial(self.__client.edit_paste, paste, target_id, timeout=timeout))
 
-    def delete_paste(self, paste: str | PasteResult) -> bool:
+    def delete_paste(self, paste: str | PasteResult, *, timeout: float = None) -> bool:
         """
         Deletes a paste.
         You must be authenticated to perform this, and you can only perform it if the paste belongs to you
 
         :param paste: The paste to delete. It can be either a string representing the paste ID or a PasteResult object.
         :type paste: str | PasteResult
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: True if the paste was successfully deleted, False otherwise.
         :rtype: bool
         :raises RequestError: If the user is not authenticated or if the paste does not have an id field.
         """
-        if not self.is_authenticated:
-            raise RequestError("you must be authenticated before deleting your own paste")
-
-        if isinstance(paste, PasteResult):
-            if not hasattr(paste, "id"):
-                raise RequestError("paste must have id field")
-
-            paste_id = paste.id
-        else:
-            paste_id = paste
-        result: int = trio.run(self.api.delete_paste, paste_id)
-        return result == 200
+        return self.__run(partial(self.__client.delete_paste, paste, timeout=timeout))
 
-    def get_expire_stamp(self, paste: str | PasteResult) -> datetime:
+    def get_expire_stamp(self, paste: str | PasteResult, *, timeout: float = None) -> datetime:
         """
         This method retrieves the expiration stamp of a given paste. The `paste` parameter can be either a string representing the ID of the paste or a `PasteResult` object containing details
         * about the paste.
@@ -166,66 +366,57 @@ class Client:
 
         :param paste: Either a string representing the ID of the paste or a `PasteResult` object.
         :type paste: str | PasteResult
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: A `datetime` object representing the expiration stamp of the paste.
         :rtype: datetime
         """
-        if isinstance(paste, str):
-            paste = self.get_paste(paste)
-
-        if not paste.expires_in:
-            raise RequestError("paste must have expires_in field")
-        if not paste.created_at:
-            raise RequestError("paste must have created_at field")
-        if paste.expires_in == ExpiresIn.NEVER:
-            raise RequestError("can't find expiration stamp of paste that never expires")
-
-        unix_stamp: float = (datetime.fromtimestamp(paste.created_at.timestamp()) - datetime(1970, 1, 1)).total_seconds()
-        result: int = trio.run(self.api.get_expire_unix, int(unix_stamp), paste.expires_in.value)
-        return datetime.fromtimestamp(int(result), timezone.utc)
+        return self.__run(partial(self.__client.get_expire_stamp, paste, timeout=timeout))
 
-    def user_exists(self, username: str) -> bool:
+    def user_exists(self, username: str, *, timeout: float = None) -> bool:
         """
         Checks if a user with the given username exists
 
         :param username: The username to check if it exists.
         :type username: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: True if the user exists, False otherwise.
         :rtype: bool
         """
-        result: int = trio.run(self.api.get_user_exists, username)
-        return result == 200
+        return self.__run(partial(self.__client.user_exists, username, timeout=timeout))
 
-    def get_user(self, username: str) -> User:
+    def get_user(self, username: str, *, timeout: float = None) -> User:
         """
         Gets a user with the given username
 
         :param username: The username of the user to retrieve
         :type username: str
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: A User object representing the retrieved user information
         :rtype: User
         """
-        result: Dict[str, Any] = trio.run(self.api.get_user, username)
-        return User.from_dict(result)
+        return self.__run(partial(self.__client.get_user, username, timeout=timeout))
 
-    def get_self_user(self) -> User:
+    def get_self_user(self, *, timeout: float = None) -> User:
         """
         Get information about the authenticated user.
 
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: The user information as an instance of the User class.
         :rtype: User
         """
-        result: Dict[str, Any] = trio.run(self.api.get_self)
-        return User.from_dict(result)
+        return self.__run(partial(self.__client.get_self_user, timeout=timeout))
 
-    def get_self_user_pastes(self) -> List[PasteResult]:
+    def get_self_user_pastes(self, *, timeout: float = None) -> List[PasteResult]:
         """
         Retrieves all the pastes created by the authenticated user.
 
+        :param timeout: Seconds the whole call may take, retries included. Uses the client's default timeout if None.
+        :type timeout: float
         :return: A list of PasteResult objects representing the pastes created by the self user.
         :rtype: List[PasteResult]
         """
-        result: List[str] = trio.run(self.api.get_self_pastes)
-        pastes: List[PasteResult] = []
-        for paste in result:
-            pastes.append(self.get_paste(paste))
-        return pastes
+        return self.__run(partial(self.__client.get_self_user_pastes, timeout=timeout))
@@ -1,4 +1,7 @@
-from .errors import PastemystError, HttpError, RequestError
+from .errors import PastemystError, HttpError, RequestError, CircuitOpenError, PastemystTimeoutError, CassetteError, RevisionError, SerializationError
 from .language import LanguageInfo, Language
-from .paste import ExpiresIn, EditType, Pasty, PasteEdit, Paste, PasteResult
+from .paste import ExpiresIn, EditType, Pasty, PastyList, PasteEdit, Paste, PasteResult
 from .user import User
+from .table import PasteTable
+from .revisions import Revision, RevisionHistory
+from .binary import BinaryModel
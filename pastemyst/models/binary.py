@@ -0,0 +1,288 @@
+import marshal
+import sys
+from datetime import datetime, timedelta, timezone
+from enum import Enum
+from pickle import PickleBuffer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, TypeVar
+
+from .errors import SerializationError
+from pastemyst.utils.decoder import Lazy
+
+
+T = TypeVar("T")
+
+MAGIC: bytes = b"PMB"
+# bumped whenever the encoding or the slots of a registered class change
+FORMAT: int = 2
+# marshal's format is only kept within one Python implementation and version, so the header names the one that wrote
+# the data, and other ones refuse to read it
+RUNTIME: bytes = "{0}/marshal{1}".format(
+    sys.implementation.cache_tag or f"{sys.implementation.name}-{sys.version_info[0]}{sys.version_info[1]}", marshal.version
+).encode("ascii")
+_HEADER: bytes = MAGIC + bytes((FORMAT, len(RUNTIME))) + RUNTIME
+# strings at least this long travel as out-of-band buffers when pickling with protocol 5
+OUT_OF_BAND_SIZE: int = 16 * 1024
+
+# the first item of the tuples standing for values marshal can't hold, tuples themselves included
+_MODEL, _ENUM, _SEQUENCE, _DATETIME, _BUFFER, _TUPLE = range(6)
+# the value of slots that aren't set
+_UNSET: Any = Ellipsis
+# the values marshal writes as they are
+_PLAIN: frozenset = frozenset((str, int, float, bool, type(None), bytes))
+
+# the registered classes by code, and the code of each of them
+_CLASSES: Dict[int, type] = {}
+_CODES: Dict[type, int] = {}
+# the getter and setter of every slot of the registered models, bases included
+_LAYOUTS: Dict[type, Tuple[Tuple[Callable[..., Any], Callable[[Any, Any], None]], ...]] = {}
+# the packed form of each member of the registered enums, and the members by code and value
+_PACKED: Dict[type, Dict[Enum, Tuple[int, int, Any]]] = {}
+_MEMBERS: Dict[int, Dict[Any, Enum]] = {}
+# the timezones of datetimes by their offset in seconds
+_ZONES: Dict[Optional[int], Optional[timezone]] = {None: None, 0: timezone.utc}
+
+
+def _slots(cls: type) -> Tuple[Any, ...]:
+    # the slot descriptors of the class and its bases, so results of subclasses keep the fields set by base classes,
+    # without the slots a class lists in `_transient`, which hold runtime state
+    descriptors: List[Any] = []
+    for klass in reversed(cls.__mro__):
+        transient: Tuple[str, ...] = klass.__dict__.get("_transient", ())
+        for slot in klass.__dict__.get("__slots__", ()):
+            if slot in transient:
+                continue
+            name: str = f"_{klass.__name__.lstrip('_')}{slot}" if slot.startswith("__") and not slot.endswith("__") else slot
+            descriptors.append(klass.__dict__[name])
+    return tuple(descriptors)
+
+
+def register(code: int, cls: type) -> None:
+    """
+    Registers a class that can be part of the binary form of models, with the code that identifies it there.
+    Models are written slot by slot, enums by value, and list subclasses item by item.
+
+    :param code: The code of the class, unique and stable across versions.
+    :type code: int
+    :param cls: The class.
+    :type cls: type
+    :return: None
+    """
+    if code in _CLASSES and _CLASSES[code] is not cls:
+        raise ValueError(f"code {code} is already registered for {_CLASSES[code].__name__}")
+    _CLASSES[code] = cls
+    _CODES[cls] = code
+    if issubclass(cls, Enum):
+        _PACKED[cls] = {member: (_ENUM, code, member.value) for member in cls}
+        _MEMBERS[code] = {member.value: member for member in cls}
+    elif not issubclass(cls, list):
+        _LAYOUTS[cls] = tuple((descriptor.__get__, descriptor.__set__) for descriptor in _slots(cls))
+
+
+def _pack(value: Any, buffers: Optional[List[bytes]]) -> Any:
+    # turns a value into one marshal can write
+    kind: type = type(value)
+    if kind is str:
+        if buffers is not None and len(value) >= OUT_OF_BAND_SIZE:
+            buffers.append(value.encode("utf-8"))
+            return _BUFFER, len(buffers) - 1
+        return value
+    if kind in _PLAIN:
+        return value
+
+    layout = _LAYOUTS.get(kind)
+    if layout is not None:
+        packed: List[Any] = [_MODEL, _CODES[kind]]
+        for getter, _ in layout:
+            try:
+                item: Any = getter(value)
+            except AttributeError:
+                packed.append(_UNSET)
+                continue
+            item_kind: type = type(item)
+            if item_kind in _PACKED:
+                item = _PACKED[item_kind][item]
+            elif item_kind not in _PLAIN or (item_kind is str and buffers is not None):
+                item = _pack(item, buffers)
+            packed.append(item)
+        return tuple(packed)
+
+    if kind in _PACKED:
+        return _PACKED[kind][value]
+    if kind is list:
+        return [_pack(item, buffers) for item in value]
+    if kind is dict:
+        return {key: _pack(item, buffers) for key, item in value.items()}
+    if kind is set or kind is frozenset:
+        return kind(_pack(item, buffers) for item in value)
+    if kind is Lazy:
+        return _pack(value.resolve(), buffers)
+    if kind is datetime:
+        offset: Optional[timedelta] = value.utcoffset()
+        return (
+            _DATETIME, value.year, value.month, value.day, value.hour, value.minute, value.second, value.microsecond,
+            None if offset is None else int(offset.total_seconds())
+        )
+    if kind is tuple:
+        return (_TUPLE, *(_pack(item, buffers) for item in value))
+    if kind in _CODES:
+        return _SEQUENCE, _CODES[kind], [_pack(item, buffers) for item in value]
+    raise SerializationError(f"can't write a value of type {kind.__name__}")
+
+
+def _unpack(value: Any, buffers: Sequence[Any]) -> Any:
+    # the reverse of _pack, which reuses the lists, dicts and sets made by marshal
+    kind: type = type(value)
+    if kind is tuple:
+        tag: int = value[0]
+        if tag == _MODEL:
+            cls: type = _class(value[1])
+            layout = _LAYOUTS[cls]
+            if len(value) - 2 != len(layout):
+                raise SerializationError(f"{cls.__name__} was written by a version with other fields")
+
+            obj: Any = cls.__new__(cls)
+            for (_, setter), item in zip(layout, value[2:]):
+                item_kind: type = type(item)
+                if item_kind is tuple:
+                    # enums are the most common packed fields, so they're looked up here instead of in another call
+                    member: Optional[Enum] = _MEMBERS[item[1]].get(item[2]) if item[0] == _ENUM else None
+                    item = _unpack(item, buffers) if member is None else member
+                elif item_kind is list or item_kind is dict or item_kind is set:
+                    if item:
+                        item = _unpack(item, buffers)
+                elif item is _UNSET:
+                    continue
+                setter(obj, item)
+            return obj
+        if tag == _ENUM:
+            try:
+                return _MEMBERS[value[1]][value[2]]
+            except KeyError:
+                return _class(value[1])(value[2])
+        if tag == _DATETIME:
+            offset: Optional[int] = value[8]
+            tz: Optional[timezone] = _ZONES.get(offset) or _ZONES.setdefault(offset, timezone(timedelta(seconds=offset)))
+            return datetime(*value[1:8], tzinfo=tz)
+        if tag == _BUFFER:
+            return str(memoryview(buffers[value[1]]), "utf-8")
+        if tag == _SEQUENCE:
+            return _class(value[1])(_unpack(value[2], buffers))
+        if tag == _TUPLE:
+            return tuple(_unpack(item, buffers) for item in value[1:])
+        raise SerializationError(f"unknown value tag {tag}")
+    if kind is list:
+        for index, item in enumerate(value):
+            if type(item) not in _PLAIN:
+                value[index] = _unpack(item, buffers)
+        return value
+    if kind is dict:
+        for key, item in value.items():
+            if type(item) not in _PLAIN:
+                value[key] = _unpack(item, buffers)
+        return value
+    if kind is set or kind is frozenset:
+        if all(type(item) in _PLAIN for item in value):
+            return value
+        return kind(_unpack(item, buffers) for item in value)
+    return value
+
+
+def _class(code: int) -> type:
+    try:
+        return _CLASSES[code]
+    except KeyError:
+        raise SerializationError(f"unknown class code {code}") from None
+
+
+def dumps(obj: Any, buffers: Optional[List[bytes]] = None) -> bytes:
+    """
+    Writes a model, or any value made of models and basic types, in the binary form: a header with the format and the
+    Python runtime, then the values of the slots of each model, written with `marshal`.
+
+    :param obj: The value to write.
+    :type obj: Any
+    :param buffers: If given, long strings are appended to it as utf-8 instead of being copied into the result.
+    :type buffers: Optional[List[bytes]]
+    :return: The binary form.
+    :rtype: bytes
+    :raises SerializationError: If a value can't be written.
+    """
+    return _HEADER + marshal.dumps(_pack(obj, buffers), 4)
+
+
+def loads(data: bytes | memoryview, buffers: Sequence[Any] = ()) -> Any:
+    """
+    Reads a value from its binary form. Like pickle, only read data from a trusted source.
+    Only data written by the same Python implementation and version can be read, since `marshal` may change between
+    them. Caches shared between versions should treat the error as a miss.
+
+    :param data: The binary form.
+    :type data: bytes | memoryview
+    :param buffers: The long strings that were written out of band, in order.
+    :type buffers: Sequence[Any]
+    :return: The value.
+    :rtype: Any
+    :raises SerializationError: If the data isn't a binary form of this format and Python runtime.
+    """
+    view: memoryview = memoryview(data)
+    if len(view) < len(MAGIC) + 2 or bytes(view[:len(MAGIC)]) != MAGIC:
+        raise SerializationError("not a pastemyst binary model")
+    if view[len(MAGIC)] != FORMAT:
+        raise SerializationError(f"binary model of unknown format {view[len(MAGIC)]}, expected {FORMAT}")
+    start: int = len(MAGIC) + 2 + view[len(MAGIC) + 1]
+    runtime: bytes = bytes(view[len(MAGIC) + 2:start])
+    if runtime != RUNTIME:
+        raise SerializationError(f"binary model written by {runtime.decode('ascii', 'replace')}, which {RUNTIME.decode('ascii')} can't read")
+
+    try:
+        return _unpack(marshal.loads(view[start:]), buffers)
+    except (EOFError, ValueError, TypeError, IndexError, KeyError) as e:
+        raise SerializationError(f"corrupt binary model: {e}") from e
+
+
+def _restore(data: bytes, *buffers: Any) -> Any:
+    # rebuilds a pickled model, the buffers being the out-of-band strings
+    return loads(data, buffers)
+
+
+class BinaryModel:
+    """
+    Gives a model class a compact binary form, with `to_bytes` and `from_bytes`, which pickle uses too.
+    With pickle protocol 5, long strings such as the code of pasties are passed as out-of-band buffers, which a
+    `buffer_callback` can send without copying them into the pickle.
+    """
+
+    __slots__ = ()
+
+    def to_bytes(self) -> bytes:
+        """
+        Writes the model in the binary form, with every field, set or not, kept as it is.
+
+        :return: The binary form.
+        :rtype: bytes
+        :raises SerializationError: If a field can't be written.
+        """
+        return dumps(self)
+
+    @classmethod
+    def from_bytes(cls: Type[T], data: bytes | memoryview) -> T:
+        """
+        Reads a model from its binary form.
+
+        :param data: The binary form, from `to_bytes`.
+        :type data: bytes | memoryview
+        :return: The model.
+        :raises SerializationError: If the data isn't the binary form of a model of this class.
+        """
+        obj: Any = loads(data)
+        if not isinstance(obj, cls):
+            raise SerializationError(f"expected a binary {cls.__name__}, got {type(obj).__name__}")
+        return obj
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Callable[..., Any], Tuple[Any, ...]]:
+        if protocol < 5:
+            return _restore, (dumps(self),)
+
+        buffers: List[bytes] = []
+        data: bytes = dumps(self, buffers)
+        return _restore, (data, *(PickleBuffer(buffer) for buffer in buffers))
@@ -43,3 +43,49 @@ class RequestError(PastemystError):
     Inherits from PastemystError.
     """
     pass
+
+
+class CircuitOpenError(PastemystError):
+    """
+    Raised when a request is rejected without being sent, because the circuit breaker considers the API unhealthy.
+
+    Inherits from PastemystError.
+    """
+    pass
+
+
+class PastemystTimeoutError(PastemystError, TimeoutError):
+    """
+    Raised when a call doesn't finish within its deadline. The deadline covers rate limit waits, connecting, reading
+    and every retry together.
+
+    Inherits from PastemystError and TimeoutError.
+    """
+    pass
+
+
+class CassetteError(PastemystError):
+    """
+    Raised when a replayed request has no matching recorded interaction left in its cassette, or a cassette can't be read.
+
+    Inherits from PastemystError.
+    """
+    pass
+
+
+class RevisionError(PastemystError):
+    """
+    Raised when a revision of a paste can't be rebuilt, because it doesn't exist or an edit refers to an unknown pasty.
+
+    Inherits from PastemystError.
+    """
+    pass
+
+
+class SerializationError(PastemystError):
+    """
+    Raised when a model can't be written to or read from its binary form.
+
+    Inherits from PastemystError.
+    """
+    pass
@@ -1,10 +1,11 @@
 from enum import Enum
 from typing import Dict, List, Any, Optional
 
-from pastemyst.utils import camel_to_snake, mangle_attr
+from pastemyst.utils.decoder import Decoder
+from .binary import BinaryModel, register
 
 
-class LanguageInfo:
+class LanguageInfo(BinaryModel):
     """
 
     Represents information about a programming language used in pastemyst.
@@ -82,16 +83,10 @@ class LanguageInfo:
         :return: LanguageInfo object converted from the dictionary data.
         :rtype: LanguageInfo
         """
-        language_info: LanguageInfo = LanguageInfo()
-        for key, value in data.items():
-            key = camel_to_snake(key)
+        return _LANGUAGE_INFO_DECODER.decode(data)
 
-            if key == "file":
-                continue
 
-            language_info.__setattr__(mangle_attr(language_info, f"__{key}"), value)
-
-        return language_info
+_LANGUAGE_INFO_DECODER: Decoder[LanguageInfo] = Decoder(LanguageInfo)
 
 
 class Language(str, Enum):
@@ -417,3 +412,7 @@ class Language(str, Enum):
     MSCGEN: str = "mscgen"
     XU: str = "xu"
     MSGENNY: str = "msgenny"
+
+
+register(9, LanguageInfo)
+register(10, Language)
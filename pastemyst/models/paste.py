@@ -1,10 +1,13 @@
-from datetime import datetime, timezone
+import weakref
+from datetime import datetime
 from enum import Enum, IntEnum
-from typing import Dict, Any, List, TypeVar, Optional
+from typing import Dict, Any, FrozenSet, Iterable, List, Set, SupportsIndex, TypeVar, Optional
 
 from pastemyst.models.language import Language
+from pastemyst.models.binary import BinaryModel, register
 from pastemyst.models.errors import PastemystError
-from pastemyst.utils.helpers import camel_to_snake, mangle_attr
+from pastemyst.utils.decoder import Decoder, Lazy
+from pastemyst.utils.helpers import mangle_attr, to_datetime
 
 
 T = TypeVar("T", bound="JsonObject")
@@ -63,7 +66,7 @@ class EditType(IntEnum):
     PASTY_REMOVED:  int = 5
 
 
-class Pasty:
+class Pasty(BinaryModel):
     """
     A class representing a code snippet / pasty.
 
@@ -90,12 +93,16 @@ class Pasty:
             Converts the Pasty object to a dictionary representation.
 
     """
-    __slots__ = ("__id", "__title", "__code", "__language")
+    __slots__ = ("__id", "__title", "__code", "__language", "__changed", "__lists")
+
+    # the lists indexing the pasty by title are runtime state, so the binary form leaves them out
+    _transient = ("__lists",)
 
     def __init__(self, title: str = "untitled", code: str = "", language: Language = Language.AUTODETECT):
         self.__title = title
         self.__code = code
         self.__language = language
+        self.__changed: Set[str] = set()
 
     @property
     def id(self) -> Optional[str]:
@@ -126,7 +133,36 @@ class Pasty:
         :type value: str
         :return: None
         """
-        self.__title = str(value)
+        value = str(value)
+        if value == self.__title:
+            return
+        self.__changed.add("title")
+        self.__title = value
+        self.__retitled()
+
+    def _watch(self, pasties: "PastyList") -> None:
+        # called by the lists that index the pasty by title, so they hear of title changes
+        try:
+            lists: List[weakref.ref] = self.__lists
+        except AttributeError:
+            self.__lists = [weakref.ref(pasties)]
+            return
+
+        alive: List[weakref.ref] = [ref for ref in lists if ref() is not None]
+        if not any(ref() is pasties for ref in alive):
+            alive.append(weakref.ref(pasties))
+        self.__lists = alive
+
+    def __retitled(self) -> None:
+        try:
+            lists: List[weakref.ref] = self.__lists
+        except AttributeError:
+            return
+
+        for ref in lists:
+            pasties: Optional[PastyList] = ref()
+            if pasties is not None:
+                pasties._retitled(self)
 
     @property
     def code(self) -> str:
@@ -147,7 +183,10 @@ class Pasty:
         :type value: str
         :return: None
         """
-        self.__code = str(value)
+        value = str(value)
+        if value != self.__code:
+            self.__changed.add("code")
+        self.__code = value
 
     @property
     def language(self) -> Language:
@@ -167,8 +206,48 @@ class Pasty:
         """
         if not isinstance(value, Language):
             value = Language(value)
+        if value != self.__language:
+            self.__changed.add("language")
         self.__language = value
 
+    @property
+    def changed(self) -> FrozenSet[str]:
+        """
+        Get the fields set to a new value since the pasty was fetched, saved or created, out of "title", "code" and "language".
+
+        :return: The names of the changed fields.
+        :rtype: FrozenSet[str]
+        """
+        return frozenset(self.__changed)
+
+    def mark_clean(self) -> None:
+        """
+        Forgets the changed fields, as when the pasty was just saved.
+
+        :return: None
+        """
+        self.__changed.clear()
+
+    def to_edit_dict(self) -> Dict[str, Any]:
+        """
+        Converts the pasty to the smallest dictionary that edits it: only the `_id` and the changed fields of a saved
+        pasty, or all of it if it was never saved.
+
+        :return: The converted dictionary.
+        :rtype: Dict[str, Any]
+        """
+        if self.id is None:
+            return self.to_dict()
+
+        data: Dict[str, Any] = {"_id": self.id}
+        if "title" in self.__changed:
+            data["title"] = self.title
+        if "code" in self.__changed:
+            data["code"] = self.code
+        if "language" in self.__changed:
+            data["language"] = self.language.value if isinstance(self.language, Language) else self.language
+        return data
+
     @staticmethod
     def from_dict(data: Dict[str, Any]) -> "Pasty":
         """
@@ -179,18 +258,7 @@ class Pasty:
         :return: An instance of the `Pasty` class.
         :rtype: Pasty
         """
-        pasty: Pasty = Pasty()
-        for key, value in data.items():
-            key = camel_to_snake(key)
-
-            if key == "_id":
-                key = "id"
-            elif key == "language":
-                value = Language(value)
-
-            pasty.__setattr__(mangle_attr(pasty, f"__{key}"), value)
-
-        return pasty
+        return _PASTY_DECODER.decode(data)
 
     def to_dict(self) -> Dict[str, Any]:
         """
@@ -211,7 +279,130 @@ class Pasty:
         return data
 
 
-class PasteEdit:
+_PASTY_DECODER: Decoder[Pasty] = Decoder(Pasty, renames={"id": "_id"}, converters={"language": Language})
+
+
+class PastyList(List[Pasty]):
+    """
+    The list of pasties of a paste, indexed by id and by title so finding a pasty doesn't scan the list.
+
+    The indexes are built on the first lookup and kept up to date by `append` and `extend`. Other changes to the list,
+    and changes to the titles of its pasties, make them be built again on the next lookup. A pasty tells only the lists
+    it's in when its title changes. When several pasties share an id or a title, the first one in the list is found.
+    """
+
+    __slots__ = ("__by_id", "__by_title", "__weakref__")
+
+    def __init__(self, pasties: Iterable[Pasty] = ()):
+        super().__init__(pasties)
+        # None until the first lookup, and whenever the list changed in a way that isn't tracked
+        self.__by_id: Optional[Dict[Optional[str], Pasty]] = None
+        self.__by_title: Optional[Dict[str, Pasty]] = None
+
+    def __index(self) -> None:
+        by_id: Dict[Optional[str], Pasty] = {}
+        by_title: Dict[str, Pasty] = {}
+        for pasty in self:
+            by_id.setdefault(pasty.id, pasty)
+            by_title.setdefault(pasty.title, pasty)
+            pasty._watch(self)
+        self.__by_id = by_id
+        self.__by_title = by_title
+
+    def __stale(self) -> None:
+        self.__by_id = self.__by_title = None
+
+    def _retitled(self, pasty: Pasty) -> None:
+        # called by a pasty of the list when its title changes, which can change the first match of two titles
+        if self.__by_title is not None and any(item is pasty for item in self):
+            self.__stale()
+
+    def find_by_id(self, id: str) -> Optional[Pasty]:
+        """
+        Finds the first pasty with the given ID.
+
+        :param id: The ID of the pasty.
+        :type id: str
+        :return: The pasty, or None if not found.
+        :rtype: Optional[Pasty]
+        """
+        if self.__by_id is None:
+            self.__index()
+        pasty: Optional[Pasty] = self.__by_id.get(id)
+        if pasty is not None and pasty.id != id:
+            # the pasty was given to another paste with add_pasty, which clears its id
+            self.__index()
+            pasty = self.__by_id.get(id)
+        return pasty
+
+    def find_by_title(self, title: str) -> Optional[Pasty]:
+        """
+        Finds the first pasty with the given title.
+
+        :param title: The title of the pasty.
+        :type title: str
+        :return: The pasty, or None if not found.
+        :rtype: Optional[Pasty]
+        """
+        if self.__by_title is None:
+            self.__index()
+        return self.__by_title.get(title)
+
+    def append(self, pasty: Pasty) -> None:
+        super().append(pasty)
+        if self.__by_id is not None:
+            self.__by_id.setdefault(pasty.id, pasty)
+            self.__by_title.setdefault(pasty.title, pasty)
+            pasty._watch(self)
+
+    def extend(self, pasties: Iterable[Pasty]) -> None:
+        for pasty in pasties:
+            self.append(pasty)
+
+    def __iadd__(self, pasties: Iterable[Pasty]) -> "PastyList":
+        self.extend(pasties)
+        return self
+
+    def remove(self, pasty: Pasty) -> None:
+        super().remove(pasty)
+        self.__forget(pasty)
+
+    def pop(self, index: SupportsIndex = -1) -> Pasty:
+        pasty: Pasty = super().pop(index)
+        self.__forget(pasty)
+        return pasty
+
+    def __forget(self, pasty: Pasty) -> None:
+        # removing a pasty only matters to the indexes if it's the one they point to
+        if self.__by_id is not None and (self.__by_id.get(pasty.id) is pasty or self.__by_title.get(pasty.title) is pasty):
+            self.__stale()
+
+    def insert(self, index: SupportsIndex, pasty: Pasty) -> None:
+        super().insert(index, pasty)
+        self.__stale()
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        super().__setitem__(index, value)
+        self.__stale()
+
+    def __delitem__(self, index: Any) -> None:
+        super().__delitem__(index)
+        self.__stale()
+
+    def clear(self) -> None:
+        super().clear()
+        self.__stale()
+
+    def sort(self, *args: Any, **kwargs: Any) -> None:
+        super().sort(*args, **kwargs)
+        self.__stale()
+
+    def reverse(self) -> None:
+        super().reverse()
+        self.__stale()
+
+
+class PasteEdit(BinaryModel):
     """
 
     A class representing an edit made to a paste. It contains information such as the ID of the edit, the type of edit, the edited content, and the timestamp of when the edit was
@@ -290,49 +481,73 @@ class PasteEdit:
         :return: The datetime of the edit.
         :rtype: datetime.datetime
         """
-        return self.__edited_at
+        value: datetime | Lazy = self.__edited_at
+        if type(value) is Lazy:
+            value = self.__edited_at = value.resolve()
+        return value
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "PasteEdit":
+    def from_dict(data: Dict[str, Any], lazy: bool = False) -> "PasteEdit":
         """
         Creates a PasteEdit object from a dictionary.
 
         :param data: The dictionary containing the PasteEdit data.
         :type data: Dict[str, Any]
+        :param lazy: Convert `edited_at` only when it's first read.
+        :type lazy: bool
         :return: The created PasteEdit object.
         :rtype: PasteEdit
         """
-        paste_edit: PasteEdit = PasteEdit()
-        for key, value in data.items():
-            key = camel_to_snake(key)
+        return _PASTE_EDIT_DECODER.decode(data, lazy)
+
 
-            if key == "_id":
-                key = "id"
-            elif key == "edited_at":
-                value = datetime.fromtimestamp(int(value), timezone.utc)
-            elif key == "edit_type":
-                value = EditType(value)
+_PASTE_EDIT_DECODER: Decoder[PasteEdit] = Decoder(
+    PasteEdit,
+    renames={"id": "_id"},
+    converters={"edited_at": to_datetime, "edit_type": EditType},
+    lazy={"edited_at": to_datetime}
+)
 
-            paste_edit.__setattr__(mangle_attr(paste_edit, f"__{key}"), value)
 
-        return paste_edit
+# the fields of a paste that can be edited, as named by `Paste.changed`
+EDITABLE_FIELDS: FrozenSet[str] = frozenset(("title", "is_private", "is_public", "tags", "pasties"))
 
 
-class Paste:
+class Paste(BinaryModel):
     """
     The `Paste` class represents a paste which contains a collection of `Pasty` objects. It provides methods for accessing and manipulating the properties of the paste.
     It is used when creating new paste's
     """
 
-    __slots__ = ("__title", "__pasties", "__expires_in", "__is_private", "__is_public", "__tags")
+    __slots__ = ("__title", "__pasties", "__expires_in", "__is_private", "__is_public", "__tags", "__changed")
 
     def __init__(self, title: str = "untitled", pasties: List[Pasty] = None, expires_in: ExpiresIn = ExpiresIn.ONE_HOUR, is_private: bool = False, is_public: bool = False, tags: List[str] = None):
         self.__title = title
-        self.__pasties = pasties if pasties else []
+        self.__pasties = PastyList(pasties or ())
         self.__expires_in = expires_in
         self.__is_private = is_private
         self.__is_public = is_public
         self.__tags = tags if tags else []
+        # None until the paste is saved or fetched, while every editable field counts as changed
+        self.__changed: Optional[Set[str]] = None
+
+    def __changes(self) -> Optional[Set[str]]:
+        if self.__changed is None and hasattr(self, "id"):
+            # a fetched paste starts with no changes
+            self.__changed = set()
+        return self.__changed
+
+    def _record_change(self, field: str) -> None:
+        """
+        Records that an editable field of the paste was set, for `changed`.
+
+        :param field: The name of the field, one of `EDITABLE_FIELDS`.
+        :type field: str
+        :return: None
+        """
+        changes: Optional[Set[str]] = self.__changes()
+        if changes is not None:
+            changes.add(field)
 
     @property
     def title(self) -> str:
@@ -352,15 +567,18 @@ class Paste:
         :param value: The new title of the method. It must be a string.
         :return: None
         """
-        self.__title = str(value)
+        value = str(value)
+        if value != self.__title:
+            self._record_change("title")
+        self.__title = value
 
     @property
-    def pasties(self) -> List[Pasty]:
+    def pasties(self) -> PastyList:
         """
         Get the pasties of the paste.
 
         :return: A list of Pasty objects.
-        :rtype: List[Pasty]
+        :rtype: PastyList
         """
         return self.__pasties
 
@@ -375,7 +593,8 @@ class Paste:
         """
         if pasty.id is not None:
             pasty.__setattr__(mangle_attr(pasty, "__id"), None)
-        self.__pasties.append(pasty)
+        self.pasties.append(pasty)
+        self._record_change("pasties")
 
     def remove_pasty(self, pasty: Pasty | str | int) -> None:
         """
@@ -393,15 +612,19 @@ class Paste:
         :type pasty: Pasty | str | int
         :return: None
         """
+        pasties: List[Pasty] = self.pasties
         if isinstance(pasty, Pasty):
-            self.__pasties.remove(pasty)
+            pasties.remove(pasty)
+            self._record_change("pasties")
         elif isinstance(pasty, str):
             pst: Pasty = self.get_pasty_by_id(pasty) or self.get_pasty_by_name(pasty) or None
             if pst is not None:
-                self.__pasties.remove(pst)
+                pasties.remove(pst)
+                self._record_change("pasties")
         elif isinstance(pasty, int):
-            if 0 <= pasty < len(self.__pasties):
-                self.__pasties.pop(pasty)
+            if 0 <= pasty < len(pasties):
+                pasties.pop(pasty)
+                self._record_change("pasties")
 
     def get_pasty(self, index: int) -> Optional[Pasty]:
         """
@@ -412,37 +635,31 @@ class Paste:
         :return: The Pasty object at the specified index, or None if the index is out of range.
         :rtype: Optional[Pasty]
         """
-        return self.__pasties[index] if 0 <= index < len(self.__pasties) else None
+        pasties: List[Pasty] = self.pasties
+        return pasties[index] if 0 <= index < len(pasties) else None
 
     def get_pasty_by_id(self, id: str) -> Optional[Pasty]:
         """
-        Finds a Pasty in the collection by its ID.
+        Finds a Pasty in the collection by its ID, through the index of the pasties rather than by scanning them.
 
         :param id: The ID of the Pasty.
         :type id: str
         :return: The Pasty with the specified ID, or None if not found.
         :rtype: Optional[Pasty]
         """
-        for pasty in self.pasties:
-            if pasty.id == id:
-                return pasty
-
-        return None
+        return self.pasties.find_by_id(id)
 
     def get_pasty_by_name(self, name: str) -> Optional[Pasty]:
         """
-        Get a Pasty object by its name / title.
+        Get a Pasty object by its name / title, through the index of the pasties rather than by scanning them.
+        If several pasties have that title, the first one is returned.
 
         :param name: The name of the Pasty object to retrieve.
         :type name: str
         :return: The Pasty object with the matching name, or None if not found.
         :rtype: Optional[Pasty]
         """
-        for pasty in self.pasties:
-            if pasty.title == name:
-                return pasty
-
-        return None
+        return self.pasties.find_by_title(name)
 
     @property
     def expires_in(self) -> ExpiresIn:
@@ -464,6 +681,20 @@ class Paste:
         """
         return self.__is_private
 
+    @is_private.setter
+    def is_private(self, value: bool) -> None:
+        """
+        Sets whether the paste is private.
+
+        :param value: True to make the paste private.
+        :type value: bool
+        :return: None
+        """
+        value = bool(value)
+        if value != self.__is_private:
+            self._record_change("is_private")
+        self.__is_private = value
+
     @property
     def is_public(self) -> bool:
         """
@@ -474,6 +705,20 @@ class Paste:
         """
         return self.__is_public
 
+    @is_public.setter
+    def is_public(self, value: bool) -> None:
+        """
+        Sets whether the paste is shown on the owner's public profile.
+
+        :param value: True to make the paste public.
+        :type value: bool
+        :return: None
+        """
+        value = bool(value)
+        if value != self.__is_public:
+            self._record_change("is_public")
+        self.__is_public = value
+
     @property
     def tags(self) -> List[str]:
         """
@@ -484,6 +729,75 @@ class Paste:
         """
         return self.__tags
 
+    @tags.setter
+    def tags(self, value: List[str]) -> None:
+        """
+        Sets the tags of the paste. Assign a new list rather than changing the current one in place, so the change is recorded.
+
+        :param value: The new tags.
+        :type value: List[str]
+        :return: None
+        """
+        value = list(value)
+        if value != self.__tags:
+            self._record_change("tags")
+        self.__tags = value
+
+    @property
+    def changed(self) -> FrozenSet[str]:
+        """
+        Get the editable fields changed since the paste was fetched or last saved, out of `EDITABLE_FIELDS`.
+        "pasties" is included when pasties were added or removed with `add_pasty` and `remove_pasty`, or when a
+        pasty was changed or never saved. A paste that was never saved counts as entirely changed.
+
+        :return: The names of the changed fields.
+        :rtype: FrozenSet[str]
+        """
+        changes: Optional[Set[str]] = self.__changes()
+        if changes is None:
+            return EDITABLE_FIELDS
+        if "pasties" not in changes and any(pasty.id is None or pasty.changed for pasty in self.pasties):
+            return frozenset(changes | {"pasties"})
+        return frozenset(changes)
+
+    def mark_clean(self) -> None:
+        """
+        Forgets the changes of the paste and its pasties, as when it was just saved.
+
+        :return: None
+        """
+        self.__changed = set()
+        for pasty in self.pasties:
+            pasty.mark_clean()
+
+    def to_edit_dict(self) -> Dict[str, Any]:
+        """
+        Convert the changes of the paste to the smallest dictionary that edits it on pastemyst.
+        Only the changed fields are included. When pasties changed, every pasty is listed, since pastemyst removes the
+        ones that aren't, but saved pasties only carry their `_id` and changed fields.
+
+        :return: A dictionary with the changes of the paste.
+        :rtype: Dict[str, Any]
+        """
+        changed: FrozenSet[str] = self.changed
+        data: Dict[str, Any] = {}
+
+        if "title" in changed:
+            data["title"] = self.title
+        if "is_private" in changed:
+            data["isPrivate"] = self.is_private
+        if "is_public" in changed:
+            data["isPublic"] = self.is_public
+        if "tags" in changed:
+            data["tags"] = ','.join(self.tags)
+        if "pasties" in changed:
+            data["pasties"] = [pasty.to_edit_dict() for pasty in self.pasties]
+
+        if hasattr(self, "id"):
+            data["_id"] = self.id
+
+        return data
+
     def to_dict(self) -> Dict[str, Any]:
         """
         Convert the object to a dictionary representation.
@@ -543,6 +857,20 @@ class PasteResult(Paste):
         """
         return self.__title
 
+    @title.setter
+    def title(self, value: str) -> None:
+        """
+        Sets the title of the paste, to save with `edit_paste`.
+
+        :param value: The new title.
+        :type value: str
+        :return: None
+        """
+        value = str(value)
+        if value != self.__title:
+            self._record_change("title")
+        self.__title = value
+
     @property
     def created_at(self) -> datetime:
         """
@@ -551,7 +879,10 @@ class PasteResult(Paste):
         :return: A datetime object representing the paste's creation time.
         :rtype: datetime.datetime
         """
-        return self.__created_at
+        value: datetime | Lazy = self.__created_at
+        if type(value) is Lazy:
+            value = self.__created_at = value.resolve()
+        return value
 
     @property
     def expires_in(self) -> ExpiresIn:
@@ -571,7 +902,10 @@ class PasteResult(Paste):
         :return: The datetime the paste will be deleted from pastemyst.
         :rtype: datetime.datetime
         """
-        return self.__deletes_at
+        value: datetime | Lazy = self.__deletes_at
+        if type(value) is Lazy:
+            value = self.__deletes_at = value.resolve()
+        return value
 
     @property
     def stars(self) -> int:
@@ -593,6 +927,20 @@ class PasteResult(Paste):
         """
         return self.__is_private
 
+    @is_private.setter
+    def is_private(self, value: bool) -> None:
+        """
+        Sets whether the paste is private, to save with `edit_paste`.
+
+        :param value: True to make the paste private.
+        :type value: bool
+        :return: None
+        """
+        value = bool(value)
+        if value != self.__is_private:
+            self._record_change("is_private")
+        self.__is_private = value
+
     @property
     def is_public(self) -> bool:
         """
@@ -603,6 +951,20 @@ class PasteResult(Paste):
         """
         return self.__is_public
 
+    @is_public.setter
+    def is_public(self, value: bool) -> None:
+        """
+        Sets whether the paste is shown on the owner's public profile, to save with `edit_paste`.
+
+        :param value: True to make the paste public.
+        :type value: bool
+        :return: None
+        """
+        value = bool(value)
+        if value != self.__is_public:
+            self._record_change("is_public")
+        self.__is_public = value
+
     @property
     def tags(self) -> List[str]:
         """
@@ -613,15 +975,33 @@ class PasteResult(Paste):
         """
         return self.__tags
 
+    @tags.setter
+    def tags(self, value: List[str]) -> None:
+        """
+        Sets the tags of the paste, to save with `edit_paste`. Assign a new list rather than changing the current one
+        in place, so the change is recorded.
+
+        :param value: The new tags.
+        :type value: List[str]
+        :return: None
+        """
+        value = list(value)
+        if value != self.__tags:
+            self._record_change("tags")
+        self.__tags = value
+
     @property
-    def pasties(self) -> List[Pasty]:
+    def pasties(self) -> PastyList:
         """
         Get the pasties of the paste.
 
         :return: A list of Pasty objects.
-        :rtype: List[Pasty]
+        :rtype: PastyList
         """
-        return self.__pasties
+        value: PastyList | Lazy = self.__pasties
+        if type(value) is Lazy:
+            value = self.__pasties = value.resolve()
+        return value
 
     @property
     def edits(self) -> List[PasteEdit]:
@@ -631,7 +1011,10 @@ class PasteResult(Paste):
         :return: A list of PasteEdit objects representing the edits made.
         :rtype: List[PasteEdit]
         """
-        return self.__edits
+        value: List[PasteEdit] | Lazy = self.__edits
+        if type(value) is Lazy:
+            value = self.__edits = value.resolve()
+        return value
 
     @property
     def is_encrypted(self) -> bool:
@@ -654,7 +1037,7 @@ class PasteResult(Paste):
         return f"https://paste.myst.rs/{self.id}"
 
     @staticmethod
-    def from_dict(data: Dict[str, Any]) -> "PasteResult":
+    def from_dict(data: Dict[str, Any], lazy: bool = False) -> "PasteResult":
         """
         This static method creates a PasteResult object from the provided dictionary data. It iterates over the key-value pairs in the dictionary and performs certain transformations or mappings
         * based on the keys. The resulting PasteResult object is returned.
@@ -680,29 +1063,44 @@ class PasteResult(Paste):
 
         Note: Refer to the source code for exact details of transformations performed on keys and values.
 
+        With `lazy`, the result keeps the raw `pasties`, `edits`, `created_at` and `deletes_at`, and only builds each of
+        them when it's first read, which makes loading pastes with many pasties or a long edit history cheap when only
+        a few fields are used. The edits are built lazily too, so their `edited_at` is also converted on first read.
+
         :param data: A dictionary containing the data for creating a PasteResult object.
         :type data: Dict[str, Any]
+        :param lazy: Build the pasties, edits and timestamps only when they're first read.
+        :type lazy: bool
         :return: A PasteResult object created from the given dictionary.
         :rtype: PasteResult
         """
-        paste: PasteResult = PasteResult()
-        for key, value in data.items():
-            key = camel_to_snake(key)
-
-            if key in ("created_at", "deletes_at"):
-                value = datetime.fromtimestamp(int(value), timezone.utc)
-            elif key == "_id":
-                key = "id"
-            elif key == "expires_in":
-                value = ExpiresIn(value)
-            elif key in ("pasties", "edits"):
-                if key == "pasties":
-                    value = [raw if isinstance(raw, Pasty) else Pasty.from_dict(raw) for raw in value]
-                    pass
-                elif key == "edits":
-                    value = [raw if isinstance(raw, PasteEdit) else PasteEdit.from_dict(raw) for raw in
-                             value]
-
-            paste.__setattr__(mangle_attr(paste, f"__{key}"), value)
-
-        return paste
+        return _PASTE_RESULT_DECODER.decode(data, lazy)
+
+
+_PASTE_RESULT_DECODER: Decoder[PasteResult] = Decoder(
+    PasteResult,
+    renames={"id": "_id"},
+    converters={
+        "created_at": to_datetime,
+        "deletes_at": to_datetime,
+        "expires_in": ExpiresIn,
+        "pasties": lambda value: PastyList(raw if isinstance(raw, Pasty) else _PASTY_DECODER.decode(raw) for raw in value),
+        "edits": lambda value: [raw if isinstance(raw, PasteEdit) else _PASTE_EDIT_DECODER.decode(raw) for raw in value]
+    },
+    lazy={
+        "created_at": to_datetime,
+        "deletes_at": to_datetime,
+        "pasties": lambda value: PastyList(raw if isinstance(raw, Pasty) else _PASTY_DECODER.decode(raw) for raw in value),
+        "edits": lambda value: [raw if isinstance(raw, PasteEdit) else _PASTE_EDIT_DECODER.decode(raw, lazy=True) for raw in value]
+    }
+)
+
+
+# the codes of the classes in the binary form of models, which must never change
+register(1, Pasty)
+register(2, PastyList)
+register(3, PasteEdit)
+register(4, Paste)
+register(5, PasteResult)
+register(6, ExpiresIn)
+register(7, EditType)
@@ -0,0 +1,238 @@
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .errors import RevisionError
+from .language import Language
+from .paste import EditType, Pasty, PastyList, PasteEdit, PasteResult
+from pastemyst.utils.diff import LineDiff
+
+
+# a pasty as (title, language, code), with the language as its name like in the API, and None for what isn't known
+_PastyState = Tuple[str, Optional[str], Optional[str]]
+# a paste as its title and its pasties by id, in order
+_State = Tuple[str, Dict[str, _PastyState]]
+
+
+class Revision:
+    """
+    A paste as it was after one of its edits, or when it was created for revision 0.
+    """
+
+    __slots__ = ("__number", "__edit_id", "__edited_at", "__title", "__pasties")
+
+    def __init__(self, number: int, edit_id: Optional[str], edited_at: datetime, title: str, pasties: List[Pasty]):
+        self.__number = number
+        self.__edit_id = edit_id
+        self.__edited_at = edited_at
+        self.__title = title
+        self.__pasties = PastyList(pasties)
+
+    @property
+    def number(self) -> int:
+        """
+        Get the number of the revision, 0 being the paste as it was created.
+
+        :return: The number of the revision.
+        :rtype: int
+        """
+        return self.__number
+
+    @property
+    def edit_id(self) -> Optional[str]:
+        """
+        Get the ID shared by the edits that made this revision.
+
+        :return: The edit ID, or None for revision 0.
+        :rtype: Optional[str]
+        """
+        return self.__edit_id
+
+    @property
+    def edited_at(self) -> datetime:
+        """
+        Get when the revision was made, which is when the paste was created for revision 0.
+
+        :return: The datetime of the revision.
+        :rtype: datetime.datetime
+        """
+        return self.__edited_at
+
+    @property
+    def title(self) -> str:
+        """
+        Get the title of the paste at this revision.
+
+        :return: The title.
+        :rtype: str
+        """
+        return self.__title
+
+    @property
+    def pasties(self) -> PastyList:
+        """
+        Get the pasties of the paste at this revision.
+        The code of a pasty removed by a later edit is None, and its language is autodetect, unless an earlier edit of
+        the pasty tells them, since the edit removing a pasty only keeps its title.
+
+        :return: The pasties.
+        :rtype: PastyList
+        """
+        return self.__pasties
+
+    def get_pasty_by_id(self, id: str) -> Optional[Pasty]:
+        """
+        Finds a pasty of the revision by its ID.
+
+        :param id: The ID of the pasty.
+        :type id: str
+        :return: The pasty, or None if it didn't exist at this revision.
+        :rtype: Optional[Pasty]
+        """
+        return self.__pasties.find_by_id(id)
+
+    def __repr__(self) -> str:
+        return "<Revision number={0.number} title={0.title!r} pasties={1}>".format(self, len(self.__pasties))
+
+
+class RevisionHistory:
+    """
+    Rebuilds past revisions of a paste from its edits.
+
+    Each edit of a paste keeps the value it replaced, so a revision is rebuilt by undoing the later edits, newest
+    first, starting from the current paste. The edits made together, which share an edit ID, make one revision.
+    Every `snapshot_every` revisions, the state met on the way is kept, so rebuilding a revision undoes at most that
+    many revisions from the nearest later snapshot instead of the whole history.
+
+    Pasties brought back by undoing their removal are placed after the others, since edits don't record positions.
+    Edits adding or removing a pasty only keep its ID and title, so the code and language of a pasty before its removal
+    are unknown, unless an older edit of the pasty kept them.
+    """
+
+    __slots__ = ("paste", "snapshot_every", "__groups", "__snapshots")
+
+    def __init__(self, paste: PasteResult, snapshot_every: int = 16):
+        """
+        :param paste: The paste, as fetched with its edits.
+        :type paste: PasteResult
+        :param snapshot_every: Keep the state of every this many revisions.
+        :type snapshot_every: int
+        """
+        if snapshot_every < 1:
+            raise ValueError("snapshot_every must be at least 1")
+
+        self.paste = paste
+        self.snapshot_every = snapshot_every
+
+        groups: Dict[str, List[PasteEdit]] = {}
+        for edit in paste.edits:
+            groups.setdefault(edit.edit_id, []).append(edit)
+        self.__groups: List[Tuple[str, List[PasteEdit]]] = list(groups.items())
+
+        current: Dict[str, _PastyState] = {
+            pasty.id: (pasty.title, pasty.language.value if isinstance(pasty.language, Language) else pasty.language, pasty.code)
+            for pasty in paste.pasties
+        }
+        self.__snapshots: Dict[int, _State] = {len(self.__groups): (paste.title, current)}
+
+    def __len__(self) -> int:
+        return len(self.__groups) + 1
+
+    def __getitem__(self, number: int) -> Revision:
+        return self.revision(number)
+
+    def __undo(self, number: int, pasties: Dict[str, _PastyState], title: str) -> str:
+        # undoes the edits that made the given revision, in place, and returns the title from before them
+        for edit in reversed(self.__groups[number - 1][1]):
+            if edit.edit_type == EditType.TITLE:
+                title = edit.edit
+                continue
+
+            metadata: List[str] = edit.metadata or []
+            pasty_id: Optional[str] = metadata[0] if metadata else None
+            if edit.edit_type == EditType.PASTY_ADDED:
+                pasties.pop(pasty_id, None)
+                continue
+            if edit.edit_type == EditType.PASTY_REMOVED:
+                # the edit is the title of the removed pasty
+                pasties[pasty_id] = (edit.edit, None, None)
+                continue
+
+            state: Optional[_PastyState] = pasties.get(pasty_id)
+            if state is None:
+                raise RevisionError(f"edit {edit.id} of paste {self.paste.id} changes unknown pasty {pasty_id}")
+            if edit.edit_type == EditType.PASTY_TITLE:
+                pasties[pasty_id] = (edit.edit, state[1], state[2])
+            elif edit.edit_type == EditType.PASTY_LANGUAGE:
+                pasties[pasty_id] = (state[0], edit.edit, state[2])
+            elif edit.edit_type == EditType.PASTY_CONTENT:
+                pasties[pasty_id] = (state[0], state[1], edit.edit)
+        return title
+
+    def __number(self, number: int) -> int:
+        if number < 0:
+            number += len(self)
+        if not 0 <= number < len(self):
+            raise RevisionError(f"paste {self.paste.id} has no revision {number}, it has {len(self)}")
+        return number
+
+    def __state(self, number: int) -> _State:
+        start: int = min(snapshot for snapshot in self.__snapshots if snapshot >= number)
+        title, snapshot = self.__snapshots[start]
+        pasties: Dict[str, _PastyState] = dict(snapshot)
+
+        for current in range(start, number, -1):
+            title = self.__undo(current, pasties, title)
+            if (current - 1) % self.snapshot_every == 0:
+                self.__snapshots.setdefault(current - 1, (title, dict(pasties)))
+        return title, pasties
+
+    def revision(self, number: int) -> Revision:
+        """
+        Rebuilds the paste as it was at a revision.
+
+        :param number: The number of the revision, from 0 for the paste as created to `len(history) - 1` for the
+            current paste. Negative numbers count from the end.
+        :type number: int
+        :return: The revision.
+        :rtype: Revision
+        :raises RevisionError: If the revision doesn't exist, or an edit refers to a pasty the paste didn't have.
+        """
+        number = self.__number(number)
+        title, pasties = self.__state(number)
+        if number == 0:
+            edit_id, edited_at = None, self.paste.created_at
+        else:
+            edit_id, edits = self.__groups[number - 1]
+            edited_at = edits[0].edited_at
+
+        return Revision(number, edit_id, edited_at, title, [
+            Pasty.from_dict({"_id": pasty_id, "title": state[0], "code": state[2], **({"language": state[1]} if state[1] is not None else {})})
+            for pasty_id, state in pasties.items()
+        ])
+
+    def diff(self, pasty_id: str, old: int, new: int = -1) -> LineDiff:
+        """
+        Computes the line diff of the code of a pasty between two revisions.
+        The code of a pasty counts as empty at revisions where the pasty doesn't exist.
+
+        :param pasty_id: The ID of the pasty.
+        :type pasty_id: str
+        :param old: The number of the older revision.
+        :type old: int
+        :param new: The number of the newer revision, the current paste by default.
+        :type new: int
+        :return: The diff.
+        :rtype: LineDiff
+        :raises RevisionError: If either revision doesn't exist, or the code of the pasty at it isn't known.
+        """
+        codes: List[str] = []
+        for number in (old, new):
+            number = self.__number(number)
+            state: Optional[_PastyState] = self.__state(number)[1].get(pasty_id)
+            if state is not None and state[2] is None:
+                raise RevisionError(f"the code of pasty {pasty_id} at revision {number} isn't known, it was removed later")
+            codes.append(state[2] if state is not None else "")
+        return LineDiff(codes[0], codes[1])
+
+    def __repr__(self) -> str:
+        return "<RevisionHistory paste={0} revisions={1} snapshots={2}>".format(self.paste.id, len(self), len(self.__snapshots))
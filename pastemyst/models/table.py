@@ -0,0 +1,443 @@
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from .language import Language
+from .paste import ExpiresIn, PasteResult
+
+
+# the bits of the flags column
+PRIVATE: int = 1
+PUBLIC: int = 2
+ENCRYPTED: int = 4
+
+
+class _Strings:
+    # a column of strings, stored as utf-8 in one shared buffer with the offset of each string
+    __slots__ = ("buffer", "offsets")
+
+    def __init__(self):
+        self.buffer: bytearray = bytearray()
+        self.offsets: array = array("Q", [0])
+
+    def append(self, value: str) -> None:
+        self.buffer += value.encode("utf-8")
+        self.offsets.append(len(self.buffer))
+
+    def size(self, index: int) -> int:
+        return self.offsets[index + 1] - self.offsets[index]
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.buffer) + self.offsets.itemsize * len(self.offsets)
+
+    def __getitem__(self, index: int) -> str:
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode("utf-8")
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+class _Vocabulary:
+    # dictionary encoding of a column with few distinct values, such as languages or tags
+    __slots__ = ("values", "codes")
+
+    def __init__(self, values: Iterable[str] = ()):
+        self.values: List[str] = []
+        self.codes: Dict[str, int] = {}
+        for value in values:
+            self.code(value)
+
+    def code(self, value: str) -> int:
+        code: Optional[int] = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def find(self, value: str) -> Optional[int]:
+        return self.codes.get(value)
+
+
+def _value(value: Any) -> str:
+    return value.value if isinstance(value, (Language, ExpiresIn)) else str(value)
+
+
+class PasteTable:
+    """
+    A compact, read-only table of many pastes, for loading and analyzing thousands of pastes at once.
+
+    Instead of a `PasteResult` with nested `Pasty` and `PasteEdit` objects per paste, the table keeps each field in a
+    typed column: strings in shared UTF-8 buffers with offsets (including the code of every pasty), timestamps and star
+    counts in integer arrays, and languages, expiry values and tags as small integer codes into a vocabulary. Pasties,
+    tags and edits are stored per paste as ranges of their own columns.
+
+    Filters and aggregations run over whole columns at a time and take and return row numbers, so they can be chained.
+    Any row can be turned back into a `PasteResult` with `row`.
+    """
+
+    __slots__ = (
+        "ids", "owner_ids", "titles", "created_at", "deletes_at", "expires", "stars", "flags",
+        "tag_offsets", "tag_codes", "tag_rows", "pasty_offsets", "pasty_ids", "pasty_titles", "pasty_languages", "pasty_rows", "code",
+        "edit_offsets", "edit_ids", "edit_edit_ids", "edit_types", "edit_metadata_offsets", "edit_metadata", "edit_texts", "edited_at",
+        "languages", "expiry_values", "tags", "__index"
+    )
+
+    def __init__(self, pastes: Iterable[Dict[str, Any]] = ()):
+        """
+        :param pastes: The pastes, as the API returns them.
+        :type pastes: Iterable[Dict[str, Any]]
+        """
+        self.ids: _Strings = _Strings()
+        self.owner_ids: _Strings = _Strings()
+        self.titles: _Strings = _Strings()
+        self.created_at: array = array("q")
+        self.deletes_at: array = array("q")
+        self.expires: array = array("B")
+        self.stars: array = array("q")
+        self.flags: array = array("B")
+
+        self.tag_offsets: array = array("Q", [0])
+        self.tag_codes: array = array("I")
+        self.tag_rows: array = array("I")
+
+        self.pasty_offsets: array = array("Q", [0])
+        self.pasty_ids: _Strings = _Strings()
+        self.pasty_titles: _Strings = _Strings()
+        self.pasty_languages: array = array("H")
+        self.pasty_rows: array = array("I")
+        self.code: _Strings = _Strings()
+
+        self.edit_offsets: array = array("Q", [0])
+        self.edit_ids: _Strings = _Strings()
+        self.edit_edit_ids: _Strings = _Strings()
+        self.edit_types: array = array("B")
+        self.edit_metadata_offsets: array = array("Q", [0])
+        self.edit_metadata: _Strings = _Strings()
+        self.edit_texts: _Strings = _Strings()
+        self.edited_at: array = array("q")
+
+        self.languages: _Vocabulary = _Vocabulary(language.value for language in Language)
+        self.expiry_values: _Vocabulary = _Vocabulary(expires_in.value for expires_in in ExpiresIn)
+        self.tags: _Vocabulary = _Vocabulary()
+
+        self.__index: Optional[Dict[str, int]] = None
+
+        for paste in pastes:
+            self.__append(paste)
+
+    @staticmethod
+    def from_dicts(pastes: Iterable[Dict[str, Any]]) -> "PasteTable":
+        """
+        Builds a table from raw pastes.
+
+        :param pastes: The pastes, as the API returns them.
+        :type pastes: Iterable[Dict[str, Any]]
+        :return: The table.
+        :rtype: PasteTable
+        """
+        return PasteTable(pastes)
+
+    def __append(self, paste: Dict[str, Any]) -> None:
+        row: int = len(self.ids)
+
+        self.ids.append(paste["_id"])
+        self.owner_ids.append(paste.get("ownerId", ""))
+        self.titles.append(paste.get("title", ""))
+        self.created_at.append(int(paste.get("createdAt", 0)))
+        self.deletes_at.append(int(paste.get("deletesAt", 0)))
+        self.expires.append(self.expiry_values.code(_value(paste.get("expiresIn", ExpiresIn.NEVER))))
+        self.stars.append(int(paste.get("stars", 0)))
+        self.flags.append(
+            (PRIVATE if paste.get("isPrivate") else 0) | (PUBLIC if paste.get("isPublic") else 0) | (ENCRYPTED if paste.get("encrypted") else 0)
+        )
+
+        for tag in paste.get("tags") or ():
+            self.tag_codes.append(self.tags.code(tag))
+            self.tag_rows.append(row)
+        self.tag_offsets.append(len(self.tag_codes))
+
+        for pasty in paste.get("pasties") or ():
+            self.pasty_ids.append(pasty.get("_id", ""))
+            self.pasty_titles.append(pasty.get("title", ""))
+            self.pasty_languages.append(self.languages.code(_value(pasty.get("language", Language.AUTODETECT))))
+            self.pasty_rows.append(row)
+            self.code.append(pasty.get("code", ""))
+        self.pasty_offsets.append(len(self.pasty_rows))
+
+        for edit in paste.get("edits") or ():
+            self.edit_ids.append(edit.get("_id", ""))
+            self.edit_edit_ids.append(edit.get("editId", ""))
+            self.edit_types.append(int(edit.get("editType", 0)))
+            for metadata in edit.get("metadata") or ():
+                self.edit_metadata.append(metadata)
+            self.edit_metadata_offsets.append(len(self.edit_metadata))
+            self.edit_texts.append(edit.get("edit", ""))
+            self.edited_at.append(int(edit.get("editedAt", 0)))
+        self.edit_offsets.append(len(self.edit_types))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __getitem__(self, row: int) -> PasteResult:
+        return self.row(row)
+
+    def __iter__(self) -> Iterator[PasteResult]:
+        return (self.row(row) for row in range(len(self)))
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Get the memory used by the columns.
+
+        :return: The size of every column's buffers, in bytes.
+        :rtype: int
+        """
+        total: int = 0
+        for name in self.__slots__:
+            column: Any = getattr(self, name, None)
+            if isinstance(column, array):
+                total += column.itemsize * len(column)
+            elif isinstance(column, _Strings):
+                total += column.nbytes
+        return total
+
+    def index(self, paste_id: str) -> int:
+        """
+        Get the row of a paste.
+
+        :param paste_id: The id of the paste.
+        :type paste_id: str
+        :return: The row of the paste.
+        :rtype: int
+        :raises KeyError: If the paste isn't in the table.
+        """
+        if self.__index is None:
+            self.__index = {self.ids[row]: row for row in range(len(self))}
+        return self.__index[paste_id]
+
+    def to_dict(self, row: int) -> Dict[str, Any]:
+        """
+        Get a row as the API returns a paste.
+
+        :param row: The row.
+        :type row: int
+        :return: The paste.
+        :rtype: Dict[str, Any]
+        """
+        if not 0 <= row < len(self):
+            raise IndexError("paste table row out of range")
+
+        flags: int = self.flags[row]
+        pasties: List[Dict[str, Any]] = [
+            {"_id": self.pasty_ids[i], "language": self.languages.values[self.pasty_languages[i]], "title": self.pasty_titles[i], "code": self.code[i]}
+            for i in range(self.pasty_offsets[row], self.pasty_offsets[row + 1])
+        ]
+        edits: List[Dict[str, Any]] = [
+            {
+                "_id": self.edit_ids[i],
+                "editId": self.edit_edit_ids[i],
+                "editType": self.edit_types[i],
+                "metadata": [self.edit_metadata[m] for m in range(self.edit_metadata_offsets[i], self.edit_metadata_offsets[i + 1])],
+                "edit": self.edit_texts[i],
+                "editedAt": self.edited_at[i]
+            }
+            for i in range(self.edit_offsets[row], self.edit_offsets[row + 1])
+        ]
+
+        return {
+            "_id": self.ids[row],
+            "ownerId": self.owner_ids[row],
+            "title": self.titles[row],
+            "createdAt": self.created_at[row],
+            "expiresIn": self.expiry_values.values[self.expires[row]],
+            "deletesAt": self.deletes_at[row],
+            "stars": self.stars[row],
+            "isPrivate": bool(flags & PRIVATE),
+            "isPublic": bool(flags & PUBLIC),
+            "tags": [self.tags.values[self.tag_codes[i]] for i in range(self.tag_offsets[row], self.tag_offsets[row + 1])],
+            "pasties": pasties,
+            "edits": edits,
+            "encrypted": bool(flags & ENCRYPTED)
+        }
+
+    def row(self, row: int, lazy: bool = False) -> PasteResult:
+        """
+        Builds the paste of a row.
+
+        :param row: The row.
+        :type row: int
+        :param lazy: Build the pasties, edits and timestamps of the paste only when they're first read.
+        :type lazy: bool
+        :return: The paste.
+        :rtype: PasteResult
+        """
+        return PasteResult.from_dict(self.to_dict(row), lazy)
+
+    def rows(self, rows: Iterable[int] = None, lazy: bool = False) -> Iterator[PasteResult]:
+        """
+        Builds the pastes of the given rows, one at a time.
+
+        :param rows: The rows, or every row if None.
+        :type rows: Iterable[int]
+        :param lazy: Build the pasties, edits and timestamps of the pastes only when they're first read.
+        :type lazy: bool
+        :return: An iterator over the pastes.
+        :rtype: Iterator[PasteResult]
+        """
+        return (self.row(row, lazy) for row in (range(len(self)) if rows is None else rows))
+
+    def __pasty_range(self, rows: Optional[Iterable[int]]) -> Iterable[int]:
+        if rows is None:
+            return range(len(self.pasty_rows))
+        return (i for row in rows for i in range(self.pasty_offsets[row], self.pasty_offsets[row + 1]))
+
+    @staticmethod
+    def __unique(rows: Iterable[int]) -> array:
+        # the rows of pasties and tags are sorted, so duplicates are always next to each other
+        result: array = array("I")
+        last: int = -1
+        for row in rows:
+            if row != last:
+                result.append(row)
+                last = row
+        return result
+
+    def with_language(self, language: Language | str) -> array:
+        """
+        Get the rows of the pastes with at least one pasty in the given language.
+
+        :param language: The language.
+        :type language: Language | str
+        :return: The rows, in order.
+        :rtype: array
+        """
+        code: Optional[int] = self.languages.find(_value(language))
+        if code is None:
+            return array("I")
+        return self.__unique(compress(self.pasty_rows, map(code.__eq__, self.pasty_languages)))
+
+    def with_expires_in(self, expires_in: ExpiresIn | str) -> array:
+        """
+        Get the rows of the pastes with the given expiry.
+
+        :param expires_in: The expiry.
+        :type expires_in: ExpiresIn | str
+        :return: The rows, in order.
+        :rtype: array
+        """
+        code: Optional[int] = self.expiry_values.find(_value(expires_in))
+        if code is None:
+            return array("I")
+        return array("I", compress(range(len(self)), map(code.__eq__, self.expires)))
+
+    def with_tag(self, tag: str) -> array:
+        """
+        Get the rows of the pastes with the given tag.
+
+        :param tag: The tag.
+        :type tag: str
+        :return: The rows, in order.
+        :rtype: array
+        """
+        code: Optional[int] = self.tags.find(tag)
+        if code is None:
+            return array("I")
+        return self.__unique(compress(self.tag_rows, map(code.__eq__, self.tag_codes)))
+
+    def where(self, language: Language | str = None, expires_in: ExpiresIn | str = None, tag: str = None, rows: Iterable[int] = None) -> array:
+        """
+        Get the rows of the pastes matching every given filter.
+
+        :param language: Only pastes with a pasty in this language.
+        :type language: Language | str
+        :param expires_in: Only pastes with this expiry.
+        :type expires_in: ExpiresIn | str
+        :param tag: Only pastes with this tag.
+        :type tag: str
+        :param rows: Only these rows, such as the result of another filter. Every row if None.
+        :type rows: Iterable[int]
+        :return: The rows, in order.
+        :rtype: array
+        """
+        selected: Optional[set] = set(rows) if rows is not None else None
+        for matches in (
+            self.with_language(language) if language is not None else None,
+            self.with_expires_in(expires_in) if expires_in is not None else None,
+            self.with_tag(tag) if tag is not None else None
+        ):
+            if matches is not None:
+                selected = set(matches) if selected is None else selected.intersection(matches)
+
+        if selected is None:
+            return array("I", range(len(self)))
+        return array("I", sorted(selected))
+
+    def count_by_language(self, rows: Iterable[int] = None) -> Dict[str, int]:
+        """
+        Counts the pasties of each language.
+
+        :param rows: Only count the pasties of these rows. Every row if None.
+        :type rows: Iterable[int]
+        :return: The amount of pasties, by language name, most common first.
+        :rtype: Dict[str, int]
+        """
+        codes: Iterable[int] = self.pasty_languages if rows is None else (self.pasty_languages[i] for i in self.__pasty_range(rows))
+        return {self.languages.values[code]: count for code, count in Counter(codes).most_common()}
+
+    def code_size_by_language(self, rows: Iterable[int] = None) -> Dict[str, int]:
+        """
+        Sums the size of the code of the pasties of each language.
+
+        :param rows: Only count the pasties of these rows. Every row if None.
+        :type rows: Iterable[int]
+        :return: The size of the code in UTF-8, in bytes, by language name, biggest first.
+        :rtype: Dict[str, int]
+        """
+        sizes: Counter = Counter()
+        offsets: array = self.code.offsets
+        for i in self.__pasty_range(rows):
+            sizes[self.pasty_languages[i]] += offsets[i + 1] - offsets[i]
+        return {self.languages.values[code]: size for code, size in sizes.most_common()}
+
+    def count_by_expires_in(self, rows: Iterable[int] = None) -> Dict[str, int]:
+        """
+        Counts the pastes of each expiry.
+
+        :param rows: Only count these rows. Every row if None.
+        :type rows: Iterable[int]
+        :return: The amount of pastes, by expiry value, most common first.
+        :rtype: Dict[str, int]
+        """
+        codes: Iterable[int] = self.expires if rows is None else (self.expires[row] for row in rows)
+        return {self.expiry_values.values[code]: count for code, count in Counter(codes).most_common()}
+
+    def count_by_tag(self, rows: Iterable[int] = None) -> Dict[str, int]:
+        """
+        Counts the pastes of each tag.
+
+        :param rows: Only count these rows. Every row if None.
+        :type rows: Iterable[int]
+        :return: The amount of pastes, by tag, most common first.
+        :rtype: Dict[str, int]
+        """
+        if rows is None:
+            codes: Iterable[int] = self.tag_codes
+        else:
+            codes: Iterable[int] = (self.tag_codes[i] for row in rows for i in range(self.tag_offsets[row], self.tag_offsets[row + 1]))
+        return {self.tags.values[code]: count for code, count in Counter(codes).most_common()}
+
+    def total_stars(self, rows: Iterable[int] = None) -> int:
+        """
+        Sums the stars of the pastes.
+
+        :param rows: Only count these rows. Every row if None.
+        :type rows: Iterable[int]
+        :return: The total amount of stars.
+        :rtype: int
+        """
+        return sum(self.stars) if rows is None else sum(self.stars[row] for row in rows)
+
+    def __repr__(self) -> str:
+        return "<PasteTable pastes={0} pasties={1} edits={2}>".format(len(self), len(self.pasty_rows), len(self.edit_types))
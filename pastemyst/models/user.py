@@ -1,10 +1,12 @@
 from typing import Dict, Any, Optional, List
 
-from pastemyst.utils.helpers import camel_to_snake, mangle_attr
+from pastemyst.utils.decoder import Decoder
+from pastemyst.utils.helpers import mangle_attr
+from .binary import BinaryModel, register
 from .language import Language
 
 
-class User:
+class User(BinaryModel):
     """
     User class representing a user on pastemyst.
 
@@ -125,13 +127,9 @@ class User:
         :return: A User object.
         :rtype: User
         """
-        user: User = User()
-        for key, value in data.items():
-            key = camel_to_snake(key)
+        return _USER_DECODER.decode(data)
 
-            if key == "_id":
-                key = "id"
 
-            user.__setattr__(mangle_attr(user, f"__{key}"), value)
+_USER_DECODER: Decoder[User] = Decoder(User, renames={"id": "_id"})
 
-        return user
+register(8, User)
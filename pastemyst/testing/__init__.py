@@ -0,0 +1,3 @@
+from .data import default_dataset, generate_dataset, language_data
+from .server import FakePasteMyst, Fault, EXPIRES_IN
+from .cassette import Interaction, Cassette, RecordingTransport, ReplayTransport
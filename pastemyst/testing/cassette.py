@@ -0,0 +1,285 @@
+import base64
+import gzip
+import json
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
+
+import anyio
+import httpx
+
+from pastemyst.__version__ import __version__
+from pastemyst.models import CassetteError
+
+
+FORMAT: int = 1
+
+# headers that carry credentials, which are never written to a cassette
+REDACTED_HEADERS: Tuple[str, ...] = ("authorization", "cookie", "set-cookie", "proxy-authorization", "x-api-key")
+REDACTED: str = "<redacted>"
+
+
+def _encode_body(body: bytes) -> Dict[str, str]:
+    try:
+        return {"body": body.decode("utf-8")}
+    except UnicodeDecodeError:
+        return {"body_b64": base64.b64encode(body).decode("ascii")}
+
+
+def _decode_body(data: Dict[str, Any]) -> bytes:
+    if "body_b64" in data:
+        return base64.b64decode(data["body_b64"])
+    return data.get("body", "").encode("utf-8")
+
+
+def _headers(headers: Iterable[Tuple[str, str]], redact: Iterable[str]) -> List[Tuple[str, str]]:
+    redacted = frozenset(redact)
+    return [(key, REDACTED if key.lower() in redacted else value) for key, value in headers]
+
+
+class Interaction:
+    """
+    A recorded request and the response it got.
+
+    Attributes:
+        - method (str): The HTTP method of the request.
+        - url (str): The full URL of the request.
+        - request_headers (List[Tuple[str, str]]): The headers of the request, with credentials redacted.
+        - request_body (bytes): The body of the request, as sent.
+        - status_code (int): The status code of the response.
+        - headers (List[Tuple[str, str]]): The headers of the response, with credentials redacted.
+        - body (bytes): The body of the response, as received on the wire, so still compressed if it was.
+        - started (float): Seconds from the start of the recording until the request was sent.
+        - elapsed (float): Seconds the response took to arrive completely.
+    """
+
+    __slots__ = ("method", "url", "request_headers", "request_body", "status_code", "headers", "body", "started", "elapsed")
+
+    def __init__(
+        self,
+        method: str,
+        url: str,
+        request_headers: List[Tuple[str, str]],
+        request_body: bytes,
+        status_code: int,
+        headers: List[Tuple[str, str]],
+        body: bytes,
+        started: float = 0.0,
+        elapsed: float = 0.0
+    ):
+        self.method = method
+        self.url = url
+        self.request_headers = request_headers
+        self.request_body = request_body
+        self.status_code = status_code
+        self.headers = headers
+        self.body = body
+        self.started = started
+        self.elapsed = elapsed
+
+    @property
+    def target(self) -> str:
+        """
+        Get the path and query string of the request, which is what replayed requests are matched on, so a cassette
+        recorded against one host can be replayed for another.
+
+        :return: The path and query string of the request.
+        :rtype: str
+        """
+        return httpx.URL(self.url).raw_path.decode("ascii")
+
+    def to_dict(self) -> Dict[str, Any]:
+        request: Dict[str, Any] = {"method": self.method, "url": self.url, "headers": self.request_headers, **_encode_body(self.request_body)}
+        response: Dict[str, Any] = {"status_code": self.status_code, "headers": self.headers, **_encode_body(self.body)}
+        return {"request": request, "response": response, "started": round(self.started, 6), "elapsed": round(self.elapsed, 6)}
+
+    @staticmethod
+    def from_dict(data: Dict[str, Any]) -> "Interaction":
+        request: Dict[str, Any] = data["request"]
+        response: Dict[str, Any] = data["response"]
+        return Interaction(
+            request["method"],
+            request["url"],
+            [tuple(header) for header in request["headers"]],
+            _decode_body(request),
+            response["status_code"],
+            [tuple(header) for header in response["headers"]],
+            _decode_body(response),
+            data.get("started", 0.0),
+            data.get("elapsed", 0.0)
+        )
+
+    def __repr__(self) -> str:
+        return "<Interaction method={0.method} url={0.url!r} status_code={0.status_code}>".format(self)
+
+
+class Cassette:
+    """
+    A list of recorded interactions, stored as gzipped JSON lines: a header line, then one interaction per line.
+    Bodies are kept as text when they're UTF-8, which is nearly always, so gzip can squeeze the repeated JSON.
+    """
+
+    __slots__ = ("interactions",)
+
+    def __init__(self, interactions: Iterable[Interaction] = None):
+        self.interactions: List[Interaction] = list(interactions or ())
+
+    def save(self, path: str) -> None:
+        """
+        Writes the cassette to a file.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: None
+        """
+        with gzip.open(path, "wt", encoding="utf-8") as file:
+            file.write(json.dumps({"format": FORMAT, "pastemyst": __version__, "interactions": len(self.interactions)}) + "\n")
+            for interaction in self.interactions:
+                file.write(json.dumps(interaction.to_dict(), separators=(",", ":")) + "\n")
+
+    @staticmethod
+    def load(path: str) -> "Cassette":
+        """
+        Reads a cassette from a file.
+
+        :param path: The path of the file.
+        :type path: str
+        :return: The cassette.
+        :rtype: Cassette
+        :raises CassetteError: If the file isn't a cassette of a known format.
+        """
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as file:
+                header: Dict[str, Any] = json.loads(file.readline())
+                if header.get("format") != FORMAT:
+                    raise CassetteError(f"{path} is a cassette of unknown format {header.get('format')}")
+                return Cassette(Interaction.from_dict(json.loads(line)) for line in file if line.strip())
+        except (OSError, ValueError, KeyError) as e:
+            raise CassetteError(f"couldn't read cassette {path}: {e}") from e
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+    def __repr__(self) -> str:
+        return "<Cassette interactions={0}>".format(len(self.interactions))
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    A transport that sends requests through another transport, and records every request and response into a
+    cassette. Credential headers are redacted before they're kept.
+
+    The cassette is written to `path`, if given, when the transport is closed, which happens when the client is closed.
+    """
+
+    __slots__ = ("inner", "path", "cassette", "redact", "__started_at")
+
+    def __init__(self, inner: httpx.AsyncBaseTransport = None, path: str = None, *, redact: Iterable[str] = REDACTED_HEADERS):
+        """
+        :param inner: The transport that sends the requests. Uses a real network transport if None.
+        :type inner: httpx.AsyncBaseTransport
+        :param path: The file to write the cassette to when the transport is closed. Not written if None.
+        :type path: str
+        :param redact: The names of the headers to redact, lowercase.
+        :type redact: Iterable[str]
+        """
+        self.inner = inner or httpx.AsyncHTTPTransport()
+        self.path = path
+        self.cassette = Cassette()
+        self.redact = tuple(redact)
+        self.__started_at: Optional[float] = None
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        now: float = time.monotonic()
+        if self.__started_at is None:
+            self.__started_at = now
+
+        request_body: bytes = await request.aread()
+        response: httpx.Response = await self.inner.handle_async_request(request)
+        try:
+            # read the body as it came over the wire, the client decodes it later
+            body: bytes = b"".join([chunk async for chunk in response.stream])
+        finally:
+            await response.aclose()
+        elapsed: float = time.monotonic() - now
+
+        self.cassette.interactions.append(Interaction(
+            request.method,
+            str(request.url),
+            _headers(request.headers.multi_items(), self.redact),
+            request_body,
+            response.status_code,
+            _headers(response.headers.multi_items(), self.redact),
+            body,
+            now - self.__started_at,
+            elapsed
+        ))
+        return httpx.Response(response.status_code, headers=response.headers, content=body, extensions=response.extensions)
+
+    async def aclose(self) -> None:
+        await self.inner.aclose()
+        if self.path is not None:
+            self.cassette.save(self.path)
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    A transport that answers requests from a cassette instead of the network.
+
+    A request is answered with the oldest unused interaction that has the same method, path and query string, so
+    repeated requests replay their recorded responses in order. With `timing="original"`, each response takes as long
+    as it did when recorded, divided by `speed`; with `timing="fast"`, responses are immediate.
+    """
+
+    __slots__ = ("cassette", "timing", "speed", "repeat", "__queues")
+
+    def __init__(self, cassette: Cassette | str, *, timing: str = "fast", speed: float = 1.0, repeat: bool = False):
+        """
+        :param cassette: The cassette, or the path of a cassette file.
+        :type cassette: Cassette | str
+        :param timing: "original" to replay the recorded latency of each response, or "fast" to answer immediately.
+        :type timing: str
+        :param speed: How many times faster than recorded to replay, with original timing.
+        :type speed: float
+        :param repeat: Start over with the first matching interaction once every match was used, instead of failing.
+        :type repeat: bool
+        """
+        if timing not in ("original", "fast"):
+            raise ValueError(f"unknown replay timing: {timing}. must be original or fast")
+        if speed <= 0:
+            raise ValueError("speed must be positive")
+
+        self.cassette = Cassette.load(cassette) if isinstance(cassette, str) else cassette
+        self.timing = timing
+        self.speed = speed
+        self.repeat = repeat
+
+        self.__queues: Dict[Tuple[str, str], Deque[Interaction]] = {}
+        for interaction in self.cassette.interactions:
+            self.__queues.setdefault((interaction.method, interaction.target), deque()).append(interaction)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        await request.aread()
+
+        queue: Optional[Deque[Interaction]] = self.__queues.get((request.method, request.url.raw_path.decode("ascii")))
+        if not queue:
+            raise CassetteError(f"no recorded interaction left for {request.method} {request.url}")
+
+        interaction: Interaction = queue.popleft()
+        if self.repeat:
+            queue.append(interaction)
+
+        if self.timing == "original" and interaction.elapsed > 0:
+            await anyio.sleep(interaction.elapsed / self.speed)
+
+        return httpx.Response(interaction.status_code, headers=interaction.headers, content=interaction.body)
+
+    @property
+    def remaining(self) -> int:
+        """
+        Get the amount of interactions that haven't been replayed yet. Always the cassette's size when repeating.
+
+        :return: The amount of interactions left.
+        :rtype: int
+        """
+        return sum(len(queue) for queue in self.__queues.values())
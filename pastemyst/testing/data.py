@@ -0,0 +1,159 @@
+import random
+import string
+from typing import Any, Dict, List
+
+from pastemyst.models import Language
+
+
+ID_ALPHABET: str = string.ascii_lowercase + string.digits
+
+# the details of the languages most pastes use, every other language is served with empty details
+_LANGUAGE_DETAILS: Dict[str, Dict[str, Any]] = {
+    Language.PLAIN: {"mode": "text", "mimes": ["text/plain"], "ext": ["txt"], "color": None},
+    Language.PYTHON: {"mode": "python", "mimes": ["text/x-python"], "ext": ["BUILD", "bzl", "py", "pyw", "pyi"], "color": "#3572A5"},
+    Language.JAVASCRIPT: {"mode": "javascript", "mimes": ["text/javascript"], "ext": ["js", "cjs", "mjs"], "color": "#f1e05a"},
+    Language.DLANG: {"mode": "d", "mimes": ["text/x-d"], "ext": ["d", "di"], "color": "#ba595e"},
+    Language.CLANG: {"mode": "clike", "mimes": ["text/x-csrc"], "ext": ["c", "h"], "color": "#555555"},
+    Language.RUST: {"mode": "rust", "mimes": ["text/x-rustsrc"], "ext": ["rs"], "color": "#dea584"},
+    Language.GO: {"mode": "go", "mimes": ["text/x-go"], "ext": ["go"], "color": "#00ADD8"},
+    Language.JSON: {"mode": "javascript", "mimes": ["application/json"], "ext": ["json"], "color": "#292929"},
+    Language.MARKDOWN: {"mode": "markdown", "mimes": ["text/x-markdown"], "ext": ["md", "markdown"], "color": "#083fa1"}
+}
+
+
+def random_id(rng: random.Random, length: int = 8) -> str:
+    """
+    Makes a random id, like the ones pastemyst gives pastes and pasties.
+
+    :param rng: The random generator to use.
+    :type rng: random.Random
+    :param length: The length of the id.
+    :type length: int
+    :return: The id.
+    :rtype: str
+    """
+    return "".join(rng.choice(ID_ALPHABET) for _ in range(length))
+
+
+def language_data() -> List[Dict[str, Any]]:
+    """
+    Get the info of every language, as the API returns it.
+
+    :return: The info of every language.
+    :rtype: List[Dict[str, Any]]
+    """
+    return [
+        {"name": language.value, **_LANGUAGE_DETAILS.get(language, {"mode": "", "mimes": [], "ext": [], "color": None})}
+        for language in Language
+    ]
+
+
+def default_dataset() -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Get a small data set that mirrors the public pastes and users on paste.myst.rs the tests rely on.
+
+    :return: The pastes, users and languages of the data set.
+    :rtype: Dict[str, List[Dict[str, Any]]]
+    """
+    return {
+        "pastes": [
+            {
+                "_id": "21y82rbw",
+                "ownerId": "",
+                "title": "shellsort",
+                "createdAt": 1588441258,
+                "expiresIn": "never",
+                "deletesAt": 0,
+                "stars": 0,
+                "isPrivate": False,
+                "isPublic": False,
+                "tags": [],
+                "pasties": [
+                    {
+                        "_id": "4x9ubpxq",
+                        "language": Language.JAVASCRIPT.value,
+                        "title": "shellsort.adb",
+                        "code": "procedure Shell_Sort (A : in out Arr) is\nbegin\n   null;\nend Shell_Sort;\n"
+                    }
+                ],
+                "edits": [],
+                "encrypted": False
+            }
+        ],
+        "users": [
+            {
+                "_id": "x9mm7mh7",
+                "username": "munchii",
+                "avatarUrl": "https://paste.myst.rs/static/assets/icons/default.png",
+                "defaultLang": Language.PYTHON.value,
+                "publicProfile": True,
+                "supporterLength": 0,
+                "contributor": True,
+                "stars": [],
+                "serviceIds": {"github": "30643112"}
+            }
+        ],
+        "languages": language_data()
+    }
+
+
+def generate_dataset(seed: int = 0, pastes: int = 100, pasties: int = 3, code_size: int = 1024, users: int = 10) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Generates a data set of random pastes and users. The same seed always gives the same data set.
+
+    :param seed: The seed of the random generator.
+    :type seed: int
+    :param pastes: The amount of pastes.
+    :type pastes: int
+    :param pasties: The amount of pasties in each paste.
+    :type pasties: int
+    :param code_size: The size of the code of each pasty, in characters.
+    :type code_size: int
+    :param users: The amount of users. Every paste is owned by one of them.
+    :type users: int
+    :return: The pastes, users and languages of the data set.
+    :rtype: Dict[str, List[Dict[str, Any]]]
+    """
+    rng: random.Random = random.Random(seed)
+    languages: List[Language] = list(_LANGUAGE_DETAILS)
+    line: str = "".join(rng.choice(string.ascii_letters + " ") for _ in range(79)) + "\n"
+    code: str = (line * (code_size // len(line) + 1))[:code_size]
+
+    user_data: List[Dict[str, Any]] = [
+        {
+            "_id": random_id(rng),
+            "username": f"user{index}",
+            "avatarUrl": "https://paste.myst.rs/static/assets/icons/default.png",
+            "defaultLang": rng.choice(languages).value,
+            "publicProfile": index % 2 == 0,
+            "supporterLength": 0,
+            "contributor": False,
+            "stars": [],
+            "serviceIds": {}
+        }
+        for index in range(users)
+    ]
+
+    paste_data: List[Dict[str, Any]] = []
+    for index in range(pastes):
+        created_at: int = 1700000000 + index * 60
+        paste_data.append({
+            "_id": random_id(rng),
+            "ownerId": user_data[index % users]["_id"] if users else "",
+            "title": f"paste {index}",
+            "createdAt": created_at,
+            "expiresIn": "never",
+            "deletesAt": 0,
+            "stars": rng.randrange(10),
+            "isPrivate": False,
+            "isPublic": index % 3 == 0,
+            "tags": [f"tag{index % 5}"],
+            "pasties": [
+                {"_id": random_id(rng), "language": rng.choice(languages).value, "title": f"pasty{number}.txt", "code": code}
+                for number in range(pasties)
+            ],
+            "edits": [],
+            "encrypted": False
+        })
+
+    return {"pastes": paste_data, "users": user_data, "languages": language_data()}
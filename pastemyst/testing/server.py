@@ -0,0 +1,532 @@
+import gzip
+import json
+import math
+import random
+import time
+import zlib
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import anyio
+import h11
+import httpx
+from anyio.abc import SocketAttribute, SocketStream, TaskStatus
+
+from .data import default_dataset, random_id
+from pastemyst.models import EditType
+
+
+# the lifetime of each `expiresIn` value in seconds, 0 for pastes that never expire
+EXPIRES_IN: Dict[str, int] = {
+    "never": 0,
+    "1h": 3600,
+    "2h": 2 * 3600,
+    "10h": 10 * 3600,
+    "1d": 86400,
+    "2d": 2 * 86400,
+    "1w": 7 * 86400,
+    "1m": 30 * 86400,
+    "1y": 365 * 86400
+}
+
+# the fields of a user that only its owner gets to see
+_PRIVATE_USER_FIELDS: Tuple[str, ...] = ("stars", "serviceIds")
+
+Reply = Tuple[int, Dict[str, str], bytes]
+
+
+class Fault:
+    """
+    A scripted failure of the fake API, answered instead of the next matching requests.
+
+    Attributes:
+        - status_code (int): The status code to answer with, such as 429 or 503.
+        - times (int): The amount of requests left to fail.
+        - method (Optional[str]): The HTTP method of the requests to fail, or None for any method.
+        - path (Optional[str]): The start of the path of the requests to fail, such as `/paste`, or None for any path.
+        - retry_after (Optional[float]): The value of the `Retry-After` header, in seconds, if any.
+    """
+
+    __slots__ = ("status_code", "times", "method", "path", "retry_after")
+
+    def __init__(self, status_code: int, times: int = 1, method: str = None, path: str = None, retry_after: float = None):
+        self.status_code = status_code
+        self.times = times
+        self.method = method
+        self.path = path
+        self.retry_after = retry_after
+
+    def matches(self, method: str, path: str) -> bool:
+        return (self.method is None or self.method == method) and (self.path is None or path.startswith(self.path))
+
+    def __repr__(self) -> str:
+        return "<Fault status_code={0.status_code} times={0.times} method={0.method} path={0.path!r}>".format(self)
+
+
+class FakePasteMyst(httpx.AsyncBaseTransport):
+    """
+    An in-process stand-in for the PasteMyst v2 API, for offline tests and benchmarks.
+
+    It serves the paste, user, language and time endpoints the clients use, from an in-memory data set. It can be used
+    in three ways:
+
+    - as an httpx transport, by passing it as the `transport` of a client. No sockets are involved.
+    - as an ASGI application, such as `uvicorn.run(FakePasteMyst())`.
+    - as a local HTTP server with `serve`, for measuring a client over real connections. Point the client at it with
+      the `endpoint` option.
+
+    Everything random, such as the ids of new pastes, latency jitter and random faults, comes from a generator seeded
+    with `seed`, so runs are reproducible.
+
+    Attributes:
+        - pastes (Dict[str, Dict[str, Any]]): The pastes, by id, as the API returns them.
+        - users (Dict[str, Dict[str, Any]]): The users, by username, as the API returns them to their owner.
+        - languages (List[Dict[str, Any]]): The info of every language.
+        - keys (Dict[str, str]): The usernames of the users, by API key.
+        - faults (List[Fault]): The scripted failures still to come.
+        - log (List[Tuple[str, str]]): The method and path of every request received, in order.
+    """
+
+    PREFIX: str = "/api/v2"
+
+    __slots__ = (
+        "pastes", "users", "languages", "keys", "faults", "log", "latency", "jitter", "ratelimit", "window",
+        "error_rate", "error_statuses", "rng", "clock", "__windows"
+    )
+
+    def __init__(
+        self,
+        dataset: Dict[str, List[Dict[str, Any]]] = None,
+        *,
+        keys: Dict[str, str] = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        ratelimit: int = None,
+        window: float = 1.0,
+        error_rate: float = 0.0,
+        error_statuses: Tuple[int, ...] = (500, 502, 503),
+        seed: int = 0,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        :param dataset: The pastes, users and languages to serve. Uses `default_dataset()` if None.
+        :type dataset: Dict[str, List[Dict[str, Any]]]
+        :param keys: The usernames of the users, by API key, for the endpoints that need authentication.
+        :type keys: Dict[str, str]
+        :param latency: Seconds every request takes to answer.
+        :type latency: float
+        :param jitter: The most seconds of random latency added on top of `latency`.
+        :type jitter: float
+        :param ratelimit: The amount of requests each API key, or anonymous clients, may make per window. Unlimited, and without rate limit headers, if None.
+        :type ratelimit: int
+        :param window: The length of a rate limit window, in seconds.
+        :type window: float
+        :param error_rate: The chance, between 0 and 1, of a request failing with one of `error_statuses`.
+        :type error_rate: float
+        :param error_statuses: The status codes random failures answer with.
+        :type error_statuses: Tuple[int, ...]
+        :param seed: The seed of the random generator.
+        :type seed: int
+        :param clock: The clock used for the creation and expiry of pastes, in seconds since the epoch.
+        :type clock: Callable[[], float]
+        """
+        dataset = dataset if dataset is not None else default_dataset()
+
+        self.pastes: Dict[str, Dict[str, Any]] = {paste["_id"]: paste for paste in dataset.get("pastes", ())}
+        self.users: Dict[str, Dict[str, Any]] = {user["username"]: user for user in dataset.get("users", ())}
+        self.languages: List[Dict[str, Any]] = list(dataset.get("languages", ()))
+        self.keys: Dict[str, str] = dict(keys or {})
+        self.faults: List[Fault] = []
+        self.log: List[Tuple[str, str]] = []
+
+        self.latency = latency
+        self.jitter = jitter
+        self.ratelimit = ratelimit
+        self.window = window
+        self.error_rate = error_rate
+        self.error_statuses = error_statuses
+        self.rng = random.Random(seed)
+        self.clock = clock
+
+        self.__windows: Dict[str, Tuple[float, int]] = {}
+
+    def inject(self, status_code: int, times: int = 1, method: str = None, path: str = None, retry_after: float = None) -> Fault:
+        """
+        Makes the next matching requests fail.
+
+        :param status_code: The status code to answer with, such as 429 or 503.
+        :type status_code: int
+        :param times: The amount of requests to fail.
+        :type times: int
+        :param method: The HTTP method of the requests to fail, or None for any method.
+        :type method: str
+        :param path: The start of the path of the requests to fail, such as `/paste`, or None for any path.
+        :type path: str
+        :param retry_after: The value of the `Retry-After` header, in seconds, if any.
+        :type retry_after: float
+        :return: The fault, which counts down as requests fail.
+        :rtype: Fault
+        """
+        fault: Fault = Fault(status_code, times, method, path, retry_after)
+        self.faults.append(fault)
+        return fault
+
+    def add_user(self, user: Dict[str, Any], key: str = None) -> None:
+        """
+        Adds a user, optionally with an API key to authenticate as them.
+
+        :param user: The user, as the API returns it to its owner.
+        :type user: Dict[str, Any]
+        :param key: The API key of the user.
+        :type key: str
+        :return: None
+        """
+        self.users[user["username"]] = user
+        if key is not None:
+            self.keys[key] = user["username"]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        body: bytes = await request.aread()
+        status_code, headers, content = await self.respond(request.method, request.url.raw_path.decode("ascii"), request.headers, body)
+        return httpx.Response(status_code, headers=headers, content=content, request=request)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable) -> None:
+        # the ASGI interface, for running the fake API in an ASGI server
+        if scope["type"] == "lifespan":
+            while True:
+                message: Dict[str, Any] = await receive()
+                if message["type"] == "lifespan.startup":
+                    await send({"type": "lifespan.startup.complete"})
+                elif message["type"] == "lifespan.shutdown":
+                    await send({"type": "lifespan.shutdown.complete"})
+                    return
+
+        body: bytes = b""
+        while True:
+            message: Dict[str, Any] = await receive()
+            body += message.get("body", b"")
+            if not message.get("more_body", False):
+                break
+
+        target: str = scope.get("raw_path", scope["path"].encode("utf-8")).decode("ascii")
+        if scope.get("query_string"):
+            target += "?" + scope["query_string"].decode("ascii")
+        headers: Dict[str, str] = {key.decode("latin-1").lower(): value.decode("latin-1") for key, value in scope["headers"]}
+
+        status_code, reply_headers, content = await self.respond(scope["method"], target, headers, body)
+        await send({
+            "type": "http.response.start",
+            "status": status_code,
+            "headers": [(key.lower().encode("latin-1"), value.encode("latin-1")) for key, value in reply_headers.items()]
+        })
+        await send({"type": "http.response.body", "body": content})
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 0, *, task_status: TaskStatus[int] = anyio.TASK_STATUS_IGNORED) -> None:
+        """
+        Serves the fake API over HTTP/1.1 until cancelled. Start it in a task group with `port = await tg.start(fake.serve)`.
+
+        :param host: The address to listen on.
+        :type host: str
+        :param port: The port to listen on, or 0 for any free port.
+        :type port: int
+        :param task_status: Reports the port the server listens on once it's ready.
+        :type task_status: TaskStatus[int]
+        :return: None
+        """
+        listener = await anyio.create_tcp_listener(local_host=host, local_port=port)
+        async with listener:
+            task_status.started(listener.extra(SocketAttribute.local_port))
+            await listener.serve(self.__serve_connection)
+
+    async def __serve_connection(self, stream: SocketStream) -> None:
+        connection: h11.Connection = h11.Connection(h11.SERVER)
+
+        async with stream:
+            try:
+                while True:
+                    event = connection.next_event()
+                    if event is h11.NEED_DATA:
+                        connection.receive_data(await stream.receive())
+                    elif isinstance(event, h11.Request):
+                        request: h11.Request = event
+                        body: bytes = b""
+                        while not isinstance(event, h11.EndOfMessage):
+                            event = connection.next_event()
+                            if event is h11.NEED_DATA:
+                                connection.receive_data(await stream.receive())
+                            elif isinstance(event, h11.Data):
+                                body += event.data
+
+                        # h11 lowercases header names
+                        headers: Dict[str, str] = {key.decode("latin-1"): value.decode("latin-1") for key, value in request.headers}
+                        status_code, reply_headers, content = await self.respond(request.method.decode("ascii"), request.target.decode("ascii"), headers, body)
+                        reply_headers["content-length"] = str(len(content))
+                        await stream.send(connection.send(h11.Response(status_code=status_code, headers=list(reply_headers.items()))))
+                        await stream.send(connection.send(h11.Data(data=content)))
+                        await stream.send(connection.send(h11.EndOfMessage()))
+
+                        if connection.our_state is h11.MUST_CLOSE:
+                            return
+                        connection.start_next_cycle()
+                    else:
+                        return
+            except (anyio.EndOfStream, anyio.BrokenResourceError, h11.RemoteProtocolError):
+                return
+
+    async def respond(self, method: str, target: str, headers: Mapping[str, str], body: bytes) -> Reply:
+        """
+        Answers a request to the fake API.
+
+        :param method: The HTTP method of the request.
+        :type method: str
+        :param target: The path and query string of the request, such as `/api/v2/paste/21y82rbw`.
+        :type target: str
+        :param headers: The headers of the request, with lowercase names.
+        :type headers: Mapping[str, str]
+        :param body: The body of the request, encoded as its `Content-Encoding` header says.
+        :type body: bytes
+        :return: The status code, headers and body of the response.
+        :rtype: Tuple[int, Dict[str, str], bytes]
+        """
+        url = urlsplit(target)
+        path: str = unquote(url.path)
+        if path.startswith(self.PREFIX):
+            path = path[len(self.PREFIX):]
+        query: Dict[str, str] = dict(parse_qsl(url.query))
+        self.log.append((method, path))
+
+        if self.latency or self.jitter:
+            await anyio.sleep(self.latency + self.rng.uniform(0, self.jitter))
+
+        key: str = headers.get("authorization", "")
+        ratelimit_headers: Dict[str, str] = self.__ratelimit(key)
+        if ratelimit_headers.get("x-ratelimit-remaining") == "-1":
+            retry_after: str = ratelimit_headers.pop("x-ratelimit-reset-after")
+            ratelimit_headers["x-ratelimit-remaining"] = "0"
+            return self.__error(429, "too many requests", {**ratelimit_headers, "retry-after": retry_after})
+
+        fault: Optional[Fault] = next((fault for fault in self.faults if fault.matches(method, path)), None)
+        if fault is not None:
+            fault.times -= 1
+            if fault.times <= 0:
+                self.faults.remove(fault)
+            extra: Dict[str, str] = {"retry-after": str(fault.retry_after)} if fault.retry_after is not None else {}
+            return self.__error(fault.status_code, "injected fault", {**ratelimit_headers, **extra})
+
+        if self.error_rate and self.rng.random() < self.error_rate:
+            return self.__error(self.rng.choice(self.error_statuses), "random fault", ratelimit_headers)
+
+        encoding: str = headers.get("content-encoding", "")
+        if encoding == "gzip":
+            body = gzip.decompress(body)
+        elif encoding == "deflate":
+            body = zlib.decompress(body)
+
+        try:
+            payload: Any = json.loads(body) if body else None
+        except ValueError:
+            return self.__error(400, "invalid json", ratelimit_headers)
+
+        status_code, response_headers, content = self.__route(method, path, query, self.keys.get(key) if key else None, payload)
+        return status_code, {**response_headers, **ratelimit_headers}, content
+
+    def __ratelimit(self, key: str) -> Dict[str, str]:
+        # a fixed window per API key, answering -1 remaining requests when the window is used up
+        if self.ratelimit is None:
+            return {}
+
+        now: float = time.monotonic()
+        started_at, used = self.__windows.get(key, (now, 0))
+        if now - started_at >= self.window:
+            started_at, used = now, 0
+        used += 1
+        self.__windows[key] = (started_at, used)
+
+        reset_after: float = max(0.0, self.window - (now - started_at))
+        return {
+            "x-ratelimit-limit": str(self.ratelimit),
+            "x-ratelimit-remaining": str(self.ratelimit - used) if used <= self.ratelimit else "-1",
+            "x-ratelimit-reset-after": f"{reset_after:.3f}"
+        }
+
+    @staticmethod
+    def __json(status_code: int, data: Any) -> Reply:
+        return status_code, {"content-type": "application/json"}, json.dumps(data).encode("utf-8")
+
+    @staticmethod
+    def __error(status_code: int, message: str, headers: Dict[str, str] = None) -> Reply:
+        return status_code, {"content-type": "application/json", **(headers or {})}, json.dumps({"statusMessage": message}).encode("utf-8")
+
+    def __route(self, method: str, path: str, query: Dict[str, str], username: Optional[str], payload: Any) -> Reply:
+        parts: List[str] = [part for part in path.split("/") if part]
+
+        if parts == ["data", "language"] and method == "GET":
+            return self.__language("name", query.get("name", ""))
+        if parts == ["data", "languageExt"] and method == "GET":
+            return self.__language("ext", query.get("extension", ""))
+        if parts == ["time", "expiresInToUnixTime"] and method == "GET":
+            return self.__expires_at(query)
+
+        if parts == ["paste"] and method == "POST":
+            return self.__create_paste(username, payload)
+        if len(parts) == 2 and parts[0] == "paste":
+            if method == "GET":
+                return self.__get_paste(parts[1], username)
+            if method == "PATCH":
+                return self.__edit_paste(parts[1], username, payload)
+            if method == "DELETE":
+                return self.__delete_paste(parts[1], username)
+
+        if parts[:2] == ["user", "self"] and method == "GET":
+            if username is None or username not in self.users:
+                return self.__error(401, "unauthorized")
+            if len(parts) == 2:
+                return self.__json(200, self.users[username])
+            if parts[2:] == ["pastes"]:
+                owner_id: str = self.users[username]["_id"]
+                return self.__json(200, [paste["_id"] for paste in self.pastes.values() if paste["ownerId"] == owner_id])
+        if len(parts) in (2, 3) and parts[0] == "user" and method == "GET":
+            user: Optional[Dict[str, Any]] = self.users.get(parts[1])
+            if parts[2:] == ["exists"]:
+                return (200, {}, b"") if user is not None else (404, {}, b"")
+            if len(parts) == 2:
+                if user is None or not user["publicProfile"]:
+                    return self.__error(404, "user not found")
+                return self.__json(200, {key: value for key, value in user.items() if key not in _PRIVATE_USER_FIELDS})
+
+        return self.__error(404, "not found")
+
+    def __language(self, field: str, value: str) -> Reply:
+        value = value.lower()
+        for language in self.languages:
+            if (field == "name" and language["name"].lower() == value) or (field == "ext" and value in (ext.lower() for ext in language["ext"])):
+                return self.__json(200, language)
+        return self.__error(404, "language not found")
+
+    def __expires_at(self, query: Dict[str, str]) -> Reply:
+        try:
+            created_at: int = int(query["createdAt"])
+            lifetime: int = EXPIRES_IN[query["expiresIn"]]
+        except (KeyError, ValueError):
+            return self.__error(400, "invalid createdAt or expiresIn")
+        return self.__json(200, {"result": created_at + lifetime if lifetime else 0})
+
+    def __find_paste(self, paste_id: str, username: Optional[str]) -> Optional[Dict[str, Any]]:
+        paste: Optional[Dict[str, Any]] = self.pastes.get(paste_id)
+        if paste is None:
+            return None
+
+        if paste["deletesAt"] and paste["deletesAt"] <= self.clock():
+            del self.pastes[paste_id]
+            return None
+        if paste["isPrivate"] and not self.__owns(paste, username):
+            return None
+        return paste
+
+    def __owns(self, paste: Dict[str, Any], username: Optional[str]) -> bool:
+        user: Optional[Dict[str, Any]] = self.users.get(username) if username is not None else None
+        return user is not None and paste["ownerId"] == user["_id"]
+
+    def __new_pasty(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {"_id": random_id(self.rng), "language": data.get("language", "Autodetect"), "title": data.get("title", ""), "code": data.get("code", "")}
+
+    def __get_paste(self, paste_id: str, username: Optional[str]) -> Reply:
+        paste: Optional[Dict[str, Any]] = self.__find_paste(paste_id, username)
+        if paste is None:
+            return self.__error(404, "paste not found")
+        return self.__json(200, paste)
+
+    def __create_paste(self, username: Optional[str], payload: Any) -> Reply:
+        if not isinstance(payload, dict) or not payload.get("pasties"):
+            return self.__error(400, "a paste needs at least one pasty")
+
+        expires_in: str = payload.get("expiresIn", "never")
+        if expires_in not in EXPIRES_IN:
+            return self.__error(400, "invalid expiresIn")
+
+        user: Optional[Dict[str, Any]] = self.users.get(username) if username is not None else None
+        if user is None and (payload.get("isPrivate") or payload.get("isPublic") or payload.get("tags")):
+            return self.__error(401, "only authenticated users can make private, public or tagged pastes")
+
+        created_at: int = math.floor(self.clock())
+        paste_id: str = random_id(self.rng)
+        while paste_id in self.pastes:
+            paste_id = random_id(self.rng)
+
+        tags: str = payload.get("tags", "")
+        paste: Dict[str, Any] = {
+            "_id": paste_id,
+            "ownerId": user["_id"] if user is not None else "",
+            "title": payload.get("title", ""),
+            "createdAt": created_at,
+            "expiresIn": expires_in,
+            "deletesAt": created_at + EXPIRES_IN[expires_in] if EXPIRES_IN[expires_in] else 0,
+            "stars": 0,
+            "isPrivate": bool(payload.get("isPrivate", False)),
+            "isPublic": bool(payload.get("isPublic", False)),
+            "tags": [tag.strip() for tag in tags.split(",") if tag.strip()] if isinstance(tags, str) else list(tags),
+            "pasties": [self.__new_pasty(pasty) for pasty in payload["pasties"]],
+            "edits": [],
+            "encrypted": False
+        }
+        self.pastes[paste_id] = paste
+        return self.__json(200, paste)
+
+    def __edit_paste(self, paste_id: str, username: Optional[str], payload: Any) -> Reply:
+        paste: Optional[Dict[str, Any]] = self.__find_paste(paste_id, username)
+        if paste is None:
+            return self.__error(404, "paste not found")
+        if not self.__owns(paste, username):
+            return self.__error(401, "only the owner of a paste can edit it")
+        if not isinstance(payload, dict):
+            return self.__error(400, "invalid edit")
+
+        edit_id: str = random_id(self.rng)
+        edited_at: int = math.floor(self.clock())
+        edits: List[Dict[str, Any]] = []
+
+        def record(edit_type: EditType, metadata: List[str], previous: str) -> None:
+            edits.append({"_id": random_id(self.rng), "editId": edit_id, "editType": edit_type.value, "metadata": metadata, "edit": previous, "editedAt": edited_at})
+
+        if "title" in payload and payload["title"] != paste["title"]:
+            record(EditType.TITLE, [], paste["title"])
+            paste["title"] = payload["title"]
+
+        for field in ("isPrivate", "isPublic"):
+            if field in payload:
+                paste[field] = bool(payload[field])
+        if "tags" in payload:
+            tags: str | List[str] = payload["tags"]
+            paste["tags"] = [tag.strip() for tag in tags.split(",") if tag.strip()] if isinstance(tags, str) else list(tags)
+
+        if "pasties" in payload:
+            current: Dict[str, Dict[str, Any]] = {pasty["_id"]: pasty for pasty in paste["pasties"]}
+            pasties: List[Dict[str, Any]] = []
+            for data in payload["pasties"]:
+                pasty: Optional[Dict[str, Any]] = current.pop(data.get("_id"), None) if data.get("_id") else None
+                if pasty is None:
+                    pasty = self.__new_pasty(data)
+                    record(EditType.PASTY_ADDED, [pasty["_id"]], pasty["title"])
+                else:
+                    for field, edit_type in (("title", EditType.PASTY_TITLE), ("language", EditType.PASTY_LANGUAGE), ("code", EditType.PASTY_CONTENT)):
+                        if field in data and data[field] != pasty[field]:
+                            record(edit_type, [pasty["_id"]], pasty[field])
+                            pasty[field] = data[field]
+                pasties.append(pasty)
+
+            for pasty in current.values():
+                record(EditType.PASTY_REMOVED, [pasty["_id"]], pasty["title"])
+            paste["pasties"] = pasties
+
+        paste["edits"].extend(edits)
+        return self.__json(200, paste)
+
+    def __delete_paste(self, paste_id: str, username: Optional[str]) -> Reply:
+        paste: Optional[Dict[str, Any]] = self.__find_paste(paste_id, username)
+        if paste is None:
+            return self.__error(404, "paste not found")
+        if not self.__owns(paste, username):
+            return self.__error(401, "only the owner of a paste can delete it")
+
+        del self.pastes[paste_id]
+        return 200, {}, b""
@@ -1 +1,5 @@
-from .helpers import run_later, camel_to_snake, mangle_attr
+from .helpers import run_later, camel_to_snake, mangle_attr, to_datetime, copy_json
+from .decoder import Decoder, Lazy, snake_to_camel, recording
+from .codec import JsonCodec, StdlibJsonCodec, OrjsonCodec, MsgspecCodec, get_codec, available_codecs
+from .jsonstream import PastyStreamParser, PASTY_START, PASTY_FIELD, CODE_CHUNK, PASTY_END
+from .diff import LineDiff, diff_lines
@@ -0,0 +1,148 @@
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+
+class JsonCodec(ABC):
+    """
+    Encodes objects to JSON bytes, and decodes JSON bytes to objects.
+
+    Working on bytes on both ends lets the fast codecs skip the intermediate `str` copy.
+    Subclasses must implement both `loads` and `dumps`.
+    """
+
+    name: str = ""
+
+    @abstractmethod
+    def loads(self, data: bytes | str) -> Any:
+        """
+        Decodes a JSON document.
+
+        :param data: The JSON document.
+        :type data: bytes | str
+        :return: The decoded object.
+        :rtype: Any
+        """
+
+    @abstractmethod
+    def dumps(self, obj: Any) -> bytes:
+        """
+        Encodes an object to a compact UTF-8 JSON document.
+
+        :param obj: The object to encode.
+        :type obj: Any
+        :return: The encoded JSON document.
+        :rtype: bytes
+        """
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} name={self.name!r}>"
+
+
+class StdlibJsonCodec(JsonCodec):
+    """
+    A codec using the `json` module of the standard library. Always available.
+    """
+
+    name: str = "json"
+
+    def loads(self, data: bytes | str) -> Any:
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class OrjsonCodec(JsonCodec):
+    """
+    A codec using `orjson`. Requires the `orjson` package.
+    """
+
+    name: str = "orjson"
+
+    def __init__(self):
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+
+    def loads(self, data: bytes | str) -> Any:
+        return orjson.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return orjson.dumps(obj)
+
+
+class MsgspecCodec(JsonCodec):
+    """
+    A codec using `msgspec`. Requires the `msgspec` package.
+    """
+
+    __slots__ = ("__encoder", "__decoder")
+
+    name: str = "msgspec"
+
+    def __init__(self):
+        if msgspec is None:
+            raise ImportError("msgspec is not installed")
+
+        self.__encoder = msgspec.json.Encoder()
+        self.__decoder = msgspec.json.Decoder()
+
+    def loads(self, data: bytes | str) -> Any:
+        return self.__decoder.decode(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self.__encoder.encode(obj)
+
+
+CODECS: Dict[str, type] = {
+    StdlibJsonCodec.name: StdlibJsonCodec,
+    OrjsonCodec.name: OrjsonCodec,
+    MsgspecCodec.name: MsgspecCodec
+}
+
+
+def available_codecs() -> Dict[str, type]:
+    """
+    Get the codecs that can be used with the installed packages.
+
+    :return: The usable codec classes, by name.
+    :rtype: Dict[str, type]
+    """
+    codecs: Dict[str, type] = {StdlibJsonCodec.name: StdlibJsonCodec}
+    if orjson is not None:
+        codecs[OrjsonCodec.name] = OrjsonCodec
+    if msgspec is not None:
+        codecs[MsgspecCodec.name] = MsgspecCodec
+    return codecs
+
+
+def get_codec(name: Optional[str] = None) -> JsonCodec:
+    """
+    Get a JSON codec by name, or the fastest installed one.
+    `msgspec` is preferred, then `orjson`, then the standard library. See `benchmarks/bench_codec.py`.
+
+    :param name: The name of the codec: "json", "orjson" or "msgspec". Picks the fastest installed codec if None.
+    :type name: Optional[str]
+    :return: The codec.
+    :rtype: JsonCodec
+    """
+    if name is not None:
+        if name not in CODECS:
+            raise ValueError(f"unknown json codec: {name}")
+        return CODECS[name]()
+
+    if msgspec is not None:
+        return MsgspecCodec()
+    if orjson is not None:
+        return OrjsonCodec()
+    return StdlibJsonCodec()
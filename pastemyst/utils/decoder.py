@@ -0,0 +1,202 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import Enum
+from typing import Any, Callable, Dict, Generic, Iterator, Optional, Tuple, Type, TypeVar
+
+from .helpers import camel_to_snake, to_datetime
+
+
+T = TypeVar("T")
+
+Converter = Callable[[Any], Any]
+Field = Tuple[Callable[[Any, Any], None], Optional[Converter]]
+# takes the name of a phase of decoding, and the wall clock and CPU time of one run of it, in seconds
+Recorder = Callable[[str, float, float], None]
+
+# the phases the decoders time when a recorder is set
+KEY_MAPPING: str = "key mapping"
+CONVERSION: str = "datetime/enum conversion"
+
+_recorder: ContextVar[Optional[Recorder]] = ContextVar("pastemyst_decode_recorder", default=None)
+
+
+@contextmanager
+def recording(recorder: Recorder) -> Iterator[None]:
+    """
+    Times the phases of the decoding done in the block, in the current context only, so decoding done at the same
+    time by other tasks and threads isn't counted.
+
+    :param recorder: Called with the phase, wall clock time and CPU time of every timed step.
+    :type recorder: Recorder
+    :return: A context manager timing the decoding done in the block.
+    :rtype: Iterator[None]
+    """
+    token = _recorder.set(recorder)
+    try:
+        yield
+    finally:
+        _recorder.reset(token)
+
+
+def _is_conversion(converter: Optional[Converter]) -> bool:
+    # enums and timestamps, as opposed to converters that decode nested models, which time themselves
+    return converter is to_datetime or (isinstance(converter, type) and issubclass(converter, Enum))
+
+
+def snake_to_camel(s: str) -> str:
+    """
+    Converts a snake case string to camel case, the reverse of `camel_to_snake`.
+
+    :param s: The snake case string to convert.
+    :type s: str
+    :return: The converted camel case string.
+    :rtype: str
+    """
+    head, *tail = s.split("_")
+    return head + "".join(word[:1].upper() + word[1:] for word in tail)
+
+
+class Lazy:
+    """
+    A raw API value stored in a slot of a lazily decoded model, converted only when it's first read.
+    """
+
+    __slots__ = ("value", "converter")
+
+    def __init__(self, value: Any, converter: Converter):
+        self.value = value
+        self.converter = converter
+
+    def resolve(self) -> Any:
+        """
+        Converts the raw value.
+
+        :return: The converted value.
+        :rtype: Any
+        """
+        return self.converter(self.value)
+
+    def __repr__(self) -> str:
+        return "<Lazy value={0}>".format(type(self.value).__name__)
+
+
+class Decoder(Generic[T]):
+    """
+    Builds model objects from API dictionaries, using a mapping from JSON keys to slot setters and value converters
+    that is worked out once per class instead of for every key of every object.
+
+    Each private slot `__some_field` of the class is filled from the JSON key `someField`, or from the key given for
+    it in `renames`. Keys that aren't in the mapping are converted with `camel_to_snake` the first time they're seen,
+    so snake case keys keep working, and keys that match no slot are ignored from then on.
+
+    Fields listed in `lazy` can be decoded lazily: their slot then holds a `Lazy` with the raw value, which the
+    class's property resolves and stores back on first access.
+
+    Inside a `recording` block, key mapping and datetime/enum conversion are timed. Outside of one, decoding only
+    pays for a single context variable lookup.
+    """
+
+    __slots__ = ("cls", "converters", "fields", "lazy_fields")
+
+    def __init__(self, cls: Type[T], renames: Dict[str, str] = None, converters: Dict[str, Converter] = None, lazy: Dict[str, Converter] = None):
+        """
+        :param cls: The model class, which must define its fields as private slots.
+        :type cls: Type[T]
+        :param renames: The JSON keys of the fields whose key isn't their camel case name, by field name, such as `{"id": "_id"}`.
+        :type renames: Dict[str, str]
+        :param converters: The converters of the raw values of fields, by field name.
+        :type converters: Dict[str, Converter]
+        :param lazy: The fields that are converted on first access when decoding lazily, with the converter to use then, by field name.
+        :type lazy: Dict[str, Converter]
+        """
+        self.cls = cls
+        self.converters: Dict[str, Converter] = dict(converters or {})
+        self.fields: Dict[str, Optional[Field]] = {}
+        self.lazy_fields: Dict[str, Optional[Field]] = {}
+
+        renames = renames or {}
+        lazy = lazy or {}
+        for slot in cls.__dict__.get("__slots__", ()):
+            if slot.startswith("__"):
+                name: str = slot[2:]
+                key: str = renames.get(name, snake_to_camel(name))
+                field: Optional[Field] = self.__field(name)
+
+                self.fields[key] = field
+                if field is not None and name in lazy:
+                    self.lazy_fields[key] = (field[0], lambda value, converter=lazy[name]: Lazy(value, converter))
+                else:
+                    self.lazy_fields[key] = field
+
+    def __field(self, name: str) -> Optional[Field]:
+        descriptor: Any = self.cls.__dict__.get(f"_{self.cls.__name__.lstrip('_')}__{name}")
+        if descriptor is None:
+            return None
+        return descriptor.__set__, self.converters.get(name)
+
+    def __learn(self, key: str) -> Optional[Field]:
+        # camel_to_snake also strips the leading underscore, so "_id" becomes "id"
+        field: Optional[Field] = self.__field(camel_to_snake(key))
+        self.fields[key] = self.lazy_fields[key] = field
+        return field
+
+    def decode(self, data: Dict[str, Any], lazy: bool = False) -> T:
+        """
+        Builds an object of the class from an API dictionary.
+
+        :param data: The dictionary from the API.
+        :type data: Dict[str, Any]
+        :param lazy: Leave the lazy fields raw until they're first read.
+        :type lazy: bool
+        :return: The built object.
+        :rtype: T
+        """
+        recorder: Optional[Recorder] = _recorder.get()
+        if recorder is not None:
+            return self.__decode_recorded(data, lazy, recorder)
+
+        obj: T = self.cls()
+        fields: Dict[str, Optional[Field]] = self.lazy_fields if lazy else self.fields
+        for key, value in data.items():
+            try:
+                field: Optional[Field] = fields[key]
+            except KeyError:
+                field = self.__learn(key)
+            if field is None:
+                continue
+
+            setter, converter = field
+            setter(obj, value if converter is None else converter(value))
+        return obj
+
+    def __decode_recorded(self, data: Dict[str, Any], lazy: bool, recorder: Recorder) -> T:
+        # decode, but timing key mapping and conversions
+        perf_counter, thread_time = time.perf_counter, time.thread_time
+
+        obj: T = self.cls()
+        fields: Dict[str, Optional[Field]] = self.lazy_fields if lazy else self.fields
+        for key, value in data.items():
+            try:
+                field: Optional[Field] = fields[key]
+            except KeyError:
+                wall, cpu = perf_counter(), thread_time()
+                field = self.__learn(key)
+                recorder(KEY_MAPPING, perf_counter() - wall, thread_time() - cpu)
+            if field is None:
+                continue
+
+            setter, converter = field
+            if converter is None:
+                setter(obj, value)
+            elif _is_conversion(converter):
+                wall, cpu = perf_counter(), thread_time()
+                value = converter(value)
+                recorder(CONVERSION, perf_counter() - wall, thread_time() - cpu)
+                setter(obj, value)
+            else:
+                setter(obj, converter(value))
+        return obj
+
+    def __repr__(self) -> str:
+        return "<Decoder cls={0} fields={1}>".format(self.cls.__name__, sum(1 for field in self.fields.values() if field is not None))
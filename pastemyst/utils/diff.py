@@ -0,0 +1,214 @@
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+# (tag, a_start, a_end, b_start, b_end), with the tags of difflib: "equal", "replace", "delete" and "insert"
+Opcode = Tuple[str, int, int, int, int]
+
+
+def _myers(a: Sequence[int], b: Sequence[int]) -> List[Tuple[int, int]]:
+    # Myers' O((N+M)D) greedy algorithm, keeping the part of V each round read to walk the shortest edit script back
+    n, m = len(a), len(b)
+    if n == 0 or m == 0:
+        return []
+
+    offset: int = n + m
+    v: List[int] = [0] * (2 * offset + 2)
+    trace: List[List[int]] = []
+
+    for d in range(n + m + 1):
+        trace.append(v[offset - d:offset + d + 1])
+        for k in range(-d, d + 1, 2):
+            if k == -d or (k != d and v[offset + k - 1] < v[offset + k + 1]):
+                x = v[offset + k + 1]
+            else:
+                x = v[offset + k - 1] + 1
+            y = x - k
+            while x < n and y < m and a[x] == b[y]:
+                x += 1
+                y += 1
+            v[offset + k] = x
+            if x >= n and y >= m:
+                break
+        else:
+            continue
+        break
+
+    matches: List[Tuple[int, int]] = []
+    x, y = n, m
+    for d in range(len(trace) - 1, 0, -1):
+        previous: List[int] = trace[d]
+        k = x - y
+        if k == -d or (k != d and previous[k - 1 + d] < previous[k + 1 + d]):
+            k += 1
+        else:
+            k -= 1
+        start_x: int = previous[k + d]
+        start_y: int = start_x - k
+        while x > start_x and y > start_y:
+            x -= 1
+            y -= 1
+            matches.append((x, y))
+        x, y = start_x, start_y
+    while x > 0 and y > 0:
+        x -= 1
+        y -= 1
+        matches.append((x, y))
+
+    matches.reverse()
+    return matches
+
+
+def diff_lines(a: Sequence[str], b: Sequence[str]) -> List[Opcode]:
+    """
+    Computes a shortest line diff between two lists of lines, with Myers' algorithm.
+
+    The common head and tail are skipped first, lines are compared as small integers, and lines that only appear on
+    one side are left out of the search since they can't match, so large texts with small changes diff quickly.
+
+    :param a: The old lines.
+    :type a: Sequence[str]
+    :param b: The new lines.
+    :type b: Sequence[str]
+    :return: The opcodes turning `a` into `b`, in the format of `difflib.SequenceMatcher.get_opcodes`.
+    :rtype: List[Opcode]
+    """
+    n, m = len(a), len(b)
+    head: int = 0
+    while head < n and head < m and a[head] == b[head]:
+        head += 1
+    tail: int = 0
+    while tail < n - head and tail < m - head and a[n - 1 - tail] == b[m - 1 - tail]:
+        tail += 1
+
+    ids: Dict[str, int] = {}
+    a_ids: List[int] = [ids.setdefault(line, len(ids)) for line in a[head:n - tail]]
+    b_ids: List[int] = [ids.setdefault(line, len(ids)) for line in b[head:m - tail]]
+
+    shared = set(a_ids).intersection(b_ids)
+    a_kept: List[int] = [i for i, line in enumerate(a_ids) if line in shared]
+    b_kept: List[int] = [j for j, line in enumerate(b_ids) if line in shared]
+    matches: List[Tuple[int, int]] = [
+        (head + a_kept[i], head + b_kept[j]) for i, j in _myers([a_ids[i] for i in a_kept], [b_ids[j] for j in b_kept])
+    ]
+    # an end marker, which closes the last change before the common tail
+    matches.append((n - tail, m - tail))
+
+    opcodes: List[Opcode] = []
+    if head:
+        opcodes.append(("equal", 0, head, 0, head))
+    i, j = head, head
+    for x, y in matches:
+        if i < x or j < y:
+            tag: str = "replace" if i < x and j < y else "delete" if i < x else "insert"
+            opcodes.append((tag, i, x, j, y))
+        if x == n - tail and y == m - tail:
+            break
+        if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == x and opcodes[-1][4] == y:
+            _, start_x, _, start_y, _ = opcodes.pop()
+            opcodes.append(("equal", start_x, x + 1, start_y, y + 1))
+        else:
+            opcodes.append(("equal", x, x + 1, y, y + 1))
+        i, j = x + 1, y + 1
+    if tail:
+        if opcodes and opcodes[-1][0] == "equal" and opcodes[-1][2] == n - tail:
+            _, start_x, _, start_y, _ = opcodes.pop()
+            opcodes.append(("equal", start_x, n, start_y, m))
+        else:
+            opcodes.append(("equal", n - tail, n, m - tail, m))
+    return opcodes
+
+
+def _hunk_range(start: int, end: int) -> str:
+    # the line numbers of a hunk side as in unified diffs, where an empty side names the line before it
+    length: int = end - start
+    if length == 1:
+        return str(start + 1)
+    return f"{start + 1 if length else start},{length}"
+
+
+class LineDiff:
+    """
+    The line diff between two texts.
+
+    Attributes:
+        - a (List[str]): The lines of the old text.
+        - b (List[str]): The lines of the new text.
+        - opcodes (List[Opcode]): The opcodes turning the old lines into the new ones.
+    """
+
+    __slots__ = ("a", "b", "opcodes")
+
+    def __init__(self, a: str, b: str):
+        """
+        :param a: The old text.
+        :type a: str
+        :param b: The new text.
+        :type b: str
+        """
+        self.a: List[str] = a.splitlines()
+        self.b: List[str] = b.splitlines()
+        self.opcodes: List[Opcode] = diff_lines(self.a, self.b)
+
+    @property
+    def added(self) -> int:
+        """
+        Get the amount of lines only in the new text.
+
+        :return: The amount of added lines.
+        :rtype: int
+        """
+        return sum(j2 - j1 for tag, _, _, j1, j2 in self.opcodes if tag in ("replace", "insert"))
+
+    @property
+    def removed(self) -> int:
+        """
+        Get the amount of lines only in the old text.
+
+        :return: The amount of removed lines.
+        :rtype: int
+        """
+        return sum(i2 - i1 for tag, i1, i2, _, _ in self.opcodes if tag in ("replace", "delete"))
+
+    def __groups(self, context: int) -> Iterator[List[Opcode]]:
+        group: List[Opcode] = []
+        for index, (tag, i1, i2, j1, j2) in enumerate(self.opcodes):
+            if tag != "equal":
+                group.append((tag, i1, i2, j1, j2))
+                continue
+            if group:
+                # the end of the previous hunk, or the gap to the next one if it's short
+                if index + 1 < len(self.opcodes) and i2 - i1 <= 2 * context:
+                    group.append((tag, i1, i2, j1, j2))
+                    continue
+                group.append((tag, i1, min(i2, i1 + context), j1, min(j2, j1 + context)))
+                yield group
+                group = []
+            if index + 1 < len(self.opcodes):
+                group.append((tag, max(i1, i2 - context), i2, max(j1, j2 - context), j2))
+        if any(opcode[0] != "equal" for opcode in group):
+            yield group
+
+    def unified(self, context: int = 3) -> List[str]:
+        """
+        Formats the diff as the hunks of a unified diff, without the file headers.
+
+        :param context: The amount of unchanged lines shown around changes.
+        :type context: int
+        :return: The lines of the diff.
+        :rtype: List[str]
+        """
+        lines: List[str] = []
+        for group in self.__groups(context):
+            i1, j1 = group[0][1], group[0][3]
+            i2, j2 = group[-1][2], group[-1][4]
+            lines.append(f"@@ -{_hunk_range(i1, i2)} +{_hunk_range(j1, j2)} @@")
+            for tag, a1, a2, b1, b2 in group:
+                if tag == "equal":
+                    lines.extend(" " + line for line in self.a[a1:a2])
+                    continue
+                lines.extend("-" + line for line in self.a[a1:a2])
+                lines.extend("+" + line for line in self.b[b1:b2])
+        return lines
+
+    def __repr__(self) -> str:
+        return "<LineDiff added={0.added} removed={0.removed}>".format(self)
@@ -0,0 +1,299 @@
+import codecs
+import json
+import re
+from typing import Any, Callable, Generator, List, Optional, Tuple
+
+
+# events emitted by PastyStreamParser
+PASTY_START: str = "pasty_start"
+PASTY_FIELD: str = "pasty_field"
+CODE_CHUNK: str = "code_chunk"
+PASTY_END: str = "pasty_end"
+
+_STRING_SPECIAL = re.compile(r'["\\]')
+_STRUCTURE = re.compile(r'["{}\[\]]')
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+# how much consumed text is kept in the buffer before it's dropped
+_COMPACT_AT: int = 64 * 1024
+
+
+class PastyStreamParser:
+    """
+    An incremental parser for paste documents, which picks out the pasties without holding the whole document in memory.
+
+    Feed it the response body in chunks, and it returns events as soon as they can be parsed:
+
+    - `(PASTY_START, index)` when a pasty object starts.
+    - `(PASTY_FIELD, (key, value))` for every field of the pasty except `code`.
+    - `(CODE_CHUNK, text)` for each decoded piece of the pasty's `code`.
+    - `(PASTY_END, index)` when the pasty object ends.
+
+    Every other field of the paste is skipped over without being decoded. Only a small window of the document is kept
+    in memory, so the memory used doesn't grow with the size of the paste.
+    """
+
+    __slots__ = ("__decoder", "__buffer", "__pos", "__eof", "__events", "__recording", "__parser", "__done")
+
+    def __init__(self):
+        self.__decoder = codecs.getincrementaldecoder("utf-8")()
+        self.__buffer: str = ""
+        self.__pos: int = 0
+        self.__eof: bool = False
+        self.__events: List[Tuple[str, Any]] = []
+        self.__recording: bool = False
+        self.__done: bool = False
+
+        self.__parser: Generator[None, None, None] = self.__parse()
+        next(self.__parser)
+
+    @property
+    def is_done(self) -> bool:
+        """
+        Check if the whole document has been parsed.
+
+        :return: True if the document has been parsed, False otherwise.
+        :rtype: bool
+        """
+        return self.__done
+
+    def feed(self, data: bytes) -> List[Tuple[str, Any]]:
+        """
+        Parses the next chunk of the document.
+
+        :param data: The next chunk of the document.
+        :type data: bytes
+        :return: The events parsed from the chunk.
+        :rtype: List[Tuple[str, Any]]
+        """
+        self.__buffer += self.__decoder.decode(data)
+        return self.__resume()
+
+    def close(self) -> List[Tuple[str, Any]]:
+        """
+        Signals the end of the document, and parses what's left of it.
+
+        :return: The last events of the document.
+        :rtype: List[Tuple[str, Any]]
+        :raises ValueError: If the document is incomplete.
+        """
+        self.__buffer += self.__decoder.decode(b"", final=True)
+        self.__eof = True
+        events: List[Tuple[str, Any]] = self.__resume()
+        if not self.__done:
+            raise ValueError("incomplete paste document")
+        return events
+
+    def __resume(self) -> List[Tuple[str, Any]]:
+        if not self.__done:
+            try:
+                next(self.__parser)
+            except StopIteration:
+                self.__done = True
+
+        events: List[Tuple[str, Any]] = self.__events
+        self.__events = []
+        return events
+
+    def __fill(self) -> Generator[None, None, None]:
+        # waits for more text to arrive, dropping what's been consumed so far
+        if self.__eof:
+            raise ValueError("incomplete paste document")
+
+        if not self.__recording and self.__pos >= _COMPACT_AT:
+            self.__buffer = self.__buffer[self.__pos:]
+            self.__pos = 0
+
+        size: int = len(self.__buffer)
+        while len(self.__buffer) == size:
+            if self.__eof:
+                raise ValueError("incomplete paste document")
+            yield
+
+    def __peek(self) -> Generator[None, None, str]:
+        while True:
+            while self.__pos < len(self.__buffer) and self.__buffer[self.__pos] in " \t\r\n":
+                self.__pos += 1
+            if self.__pos < len(self.__buffer):
+                return self.__buffer[self.__pos]
+            yield from self.__fill()
+
+    def __expect(self, chars: str) -> Generator[None, None, str]:
+        char: str = yield from self.__peek()
+        if char not in chars:
+            raise ValueError(f"unexpected {char!r} in paste document, expected one of {chars!r}")
+        self.__pos += 1
+        return char
+
+    def __string(self, emit: Optional[str] = None, keep: bool = True) -> Generator[None, None, Optional[str]]:
+        # reads a string, with the cursor on its opening quote.
+        # the decoded text is emitted as events if `emit` is set, one event per chunk that was fed,
+        # returned if `keep` is set, or thrown away otherwise
+        yield from self.__expect('"')
+        keep = keep or emit is not None
+        parts: List[str] = []
+
+        while True:
+            match: Optional[re.Match] = _STRING_SPECIAL.search(self.__buffer, self.__pos)
+            end: int = match.start() if match else len(self.__buffer)
+
+            if end > self.__pos:
+                if keep:
+                    parts.append(self.__buffer[self.__pos:end])
+                self.__pos = end
+
+            if match is None:
+                if emit is not None and parts:
+                    self.__events.append((emit, "".join(parts)))
+                    parts = []
+                yield from self.__fill()
+                continue
+
+            if self.__buffer[self.__pos] == '"':
+                self.__pos += 1
+                if emit is None:
+                    return "".join(parts) if keep else None
+                if parts:
+                    self.__events.append((emit, "".join(parts)))
+                return None
+
+            text: str = yield from self.__escape()
+            if keep:
+                parts.append(text)
+
+    def __escape(self) -> Generator[None, None, str]:
+        # decodes an escape sequence, with the cursor on its backslash
+        while len(self.__buffer) - self.__pos < 2:
+            yield from self.__fill()
+
+        char: str = self.__buffer[self.__pos + 1]
+        if char != "u":
+            self.__pos += 2
+            if char not in _ESCAPES:
+                raise ValueError(f"invalid escape \\{char} in paste document")
+            return _ESCAPES[char]
+
+        while len(self.__buffer) - self.__pos < 6:
+            yield from self.__fill()
+        code: int = int(self.__buffer[self.__pos + 2:self.__pos + 6], 16)
+        self.__pos += 6
+
+        if 0xD800 <= code < 0xDC00:
+            # a high surrogate, which pairs up with the low surrogate that follows it
+            while len(self.__buffer) - self.__pos < 6:
+                if self.__eof:
+                    return chr(code)
+                yield from self.__fill()
+            if self.__buffer[self.__pos:self.__pos + 2] == "\\u":
+                low: int = int(self.__buffer[self.__pos + 2:self.__pos + 6], 16)
+                if 0xDC00 <= low < 0xE000:
+                    self.__pos += 6
+                    return chr(0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00))
+        return chr(code)
+
+    def __skip(self) -> Generator[None, None, None]:
+        # skips over a value without decoding it, with the cursor on its first character
+        char: str = yield from self.__peek()
+
+        if char == '"':
+            yield from self.__string(keep=False)
+            return
+
+        if char not in "{[":
+            # numbers, true, false and null
+            while True:
+                while self.__pos < len(self.__buffer) and self.__buffer[self.__pos] not in ",}] \t\r\n":
+                    self.__pos += 1
+                if self.__pos < len(self.__buffer) or self.__eof:
+                    return
+                yield from self.__fill()
+
+        depth: int = 0
+        while True:
+            match: Optional[re.Match] = _STRUCTURE.search(self.__buffer, self.__pos)
+            if match is None:
+                self.__pos = len(self.__buffer)
+                yield from self.__fill()
+                continue
+
+            self.__pos = match.start()
+            char = self.__buffer[self.__pos]
+            if char == '"':
+                yield from self.__string(keep=False)
+                continue
+
+            self.__pos += 1
+            depth += 1 if char in "{[" else -1
+            if depth == 0:
+                return
+
+    def __value(self) -> Generator[None, None, Any]:
+        # reads a small value in full
+        yield from self.__peek()
+        self.__recording = True
+        start: int = self.__pos
+        try:
+            yield from self.__skip()
+        finally:
+            self.__recording = False
+        return json.loads(self.__buffer[start:self.__pos])
+
+    def __object(self, member: Callable[[str], Generator[None, None, None]]) -> Generator[None, None, None]:
+        # walks over the members of an object, calling `member` with the cursor on each value
+        yield from self.__expect("{")
+        if (yield from self.__peek()) == "}":
+            self.__pos += 1
+            return
+
+        while True:
+            key: str = yield from self.__string()
+            yield from self.__expect(":")
+            yield from member(key)
+            if (yield from self.__expect(",}")) == "}":
+                return
+
+    def __parse(self) -> Generator[None, None, None]:
+        yield
+
+        yield from self.__object(self.__paste_member)
+        if (yield from self.__trailing()):
+            raise ValueError("unexpected data after paste document")
+
+    def __paste_member(self, key: str) -> Generator[None, None, None]:
+        if key == "pasties":
+            yield from self.__pasties()
+        else:
+            yield from self.__skip()
+
+    def __pasty_member(self, key: str) -> Generator[None, None, None]:
+        if key == "code" and (yield from self.__peek()) == '"':
+            yield from self.__string(emit=CODE_CHUNK)
+        else:
+            value: Any = yield from self.__value()
+            self.__events.append((PASTY_FIELD, (key, value)))
+
+    def __pasties(self) -> Generator[None, None, None]:
+        yield from self.__expect("[")
+        if (yield from self.__peek()) == "]":
+            self.__pos += 1
+            return
+
+        index: int = 0
+        while True:
+            self.__events.append((PASTY_START, index))
+            yield from self.__object(self.__pasty_member)
+            self.__events.append((PASTY_END, index))
+
+            index += 1
+            if (yield from self.__expect(",]")) == "]":
+                return
+
+    def __trailing(self) -> Generator[None, None, bool]:
+        while True:
+            while self.__pos < len(self.__buffer) and self.__buffer[self.__pos] in " \t\r\n":
+                self.__pos += 1
+            if self.__pos < len(self.__buffer):
+                return True
+            if self.__eof:
+                return False
+            yield
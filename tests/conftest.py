@@ -0,0 +1,12 @@
+import os
+from typing import Optional
+
+import pytest
+
+from pastemyst.testing import FakePasteMyst
+
+
+@pytest.fixture
+def transport() -> Optional[FakePasteMyst]:
+    # set PASTEMYST_LIVE to run against paste.myst.rs instead of the fake API
+    return None if os.environ.get("PASTEMYST_LIVE") else FakePasteMyst()
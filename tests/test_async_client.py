@@ -0,0 +1,67 @@
+import asyncio
+from typing import List
+
+import anyio
+import httpx
+import trio
+
+from pastemyst import AsyncClient
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "example paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print('hello')"}],
+    "edits": [],
+    "encrypted": False
+}
+
+USER: dict = {
+    "_id": "u1",
+    "username": "munchii",
+    "avatarUrl": "",
+    "defaultLang": "Autodetect",
+    "publicProfile": True,
+    "supporterLength": 0,
+    "contributor": True
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.startswith("/api/v2/paste/"):
+        return httpx.Response(200, json=dict(PASTE, _id=request.url.path.rsplit("/", 1)[1]))
+    elif request.url.path == "/api/v2/user/munchii":
+        return httpx.Response(200, json=USER)
+    return httpx.Response(404, json={"statusMessage": "not found"})
+
+
+async def fetch_concurrently(n: int) -> List[str]:
+    async with AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        assert (await client.get_user("munchii")).username == "munchii"
+
+        ids: List[str] = [None] * n
+
+        async def fetch(index: int) -> None:
+            ids[index] = (await client.get_paste(f"paste{index}")).id
+
+        async with anyio.create_task_group() as tg:
+            for i in range(n):
+                tg.start_soon(fetch, i)
+
+        return ids
+
+
+def test_runs_under_trio():
+    assert trio.run(fetch_concurrently, 50) == [f"paste{i}" for i in range(50)]
+
+
+def test_runs_under_asyncio():
+    assert asyncio.run(fetch_concurrently(50)) == [f"paste{i}" for i in range(50)]
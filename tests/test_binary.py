@@ -0,0 +1,97 @@
+import pickle
+
+import pytest
+
+from pastemyst import PasteResult, Pasty, PasteEdit, Paste, User, LanguageInfo, Language, ExpiresIn, SerializationError
+from pastemyst.models import binary
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "munchii",
+    "title": "binary",
+    "createdAt": 1700000000,
+    "expiresIn": "1d",
+    "deletesAt": 1700086400,
+    "stars": 2,
+    "isPrivate": False,
+    "isPublic": True,
+    "tags": ["a", "b"],
+    "pasties": [
+        {"_id": "p1", "language": "Python", "title": "small.py", "code": "print(1)"},
+        {"_id": "p2", "language": "Rust", "title": "big.rs", "code": "fn main() {}\n" * 10_000}
+    ],
+    "edits": [{"_id": "e1", "editId": "x", "editType": 3, "metadata": ["p1"], "edit": "print(0)", "editedAt": 1700000001}],
+    "encrypted": False
+}
+
+USER: dict = {
+    "_id": "x9mm7mh7",
+    "username": "munchii",
+    "avatarUrl": "https://paste.myst.rs/static/assets/icons/default.png",
+    "defaultLang": "Python",
+    "publicProfile": True,
+    "supporterLength": 0,
+    "contributor": True
+}
+
+
+def test_models_round_trip_exactly():
+    paste: PasteResult = PasteResult.from_dict(PASTE)
+    paste.pasties[0].code = "print(2)"
+    models: list = [
+        paste,
+        PasteResult.from_dict(PASTE, lazy=True),
+        Paste(title="local", pasties=[Pasty(title="a.py", code="a", language=Language.PYTHON)], expires_in=ExpiresIn.NEVER),
+        paste.edits[0],
+        User.from_dict(USER),
+        User.from_dict(dict(USER, stars=["abcd1234"], serviceIds={"github": "1"})),
+        LanguageInfo.from_dict({"name": "Python", "mode": "python", "mimes": ["text/x-python"], "ext": ["py"], "color": "#3572A5"})
+    ]
+
+    for model in models:
+        restored = type(model).from_bytes(model.to_bytes())
+        assert type(restored) is type(model)
+        assert restored.to_bytes() == model.to_bytes()
+
+    restored: PasteResult = PasteResult.from_bytes(paste.to_bytes())
+    assert restored.to_dict() == paste.to_dict()
+    assert restored.created_at == paste.created_at and restored.created_at.tzinfo is not None
+    assert restored.pasties[0].changed == {"code"}
+    assert restored.get_pasty_by_name("big.rs").language == Language.RUST
+    assert restored.edits[0].edited_at == paste.edits[0].edited_at
+
+    assert User.from_bytes(models[4].to_bytes()).stars is None
+    assert User.from_bytes(models[5].to_bytes()).service_ids == {"github": "1"}
+
+
+def test_pickle_sends_long_code_out_of_band():
+    paste: PasteResult = PasteResult.from_dict(PASTE)
+
+    buffers: list = []
+    data: bytes = pickle.dumps(paste, protocol=5, buffer_callback=buffers.append)
+    assert len(buffers) == 1
+    assert len(data) < 1000
+
+    restored: PasteResult = pickle.loads(data, buffers=buffers)
+    assert restored.to_bytes() == paste.to_bytes()
+    assert pickle.loads(pickle.dumps(paste, protocol=4)).to_bytes() == paste.to_bytes()
+
+
+def test_wrong_data_is_rejected():
+    pasty_bytes: bytes = Pasty(title="a.py").to_bytes()
+    with pytest.raises(SerializationError):
+        PasteEdit.from_bytes(pasty_bytes)
+    with pytest.raises(SerializationError):
+        Pasty.from_bytes(b"not a model")
+    with pytest.raises(SerializationError):
+        Pasty.from_bytes(pasty_bytes[:-3])
+
+
+def test_other_python_runtimes_are_rejected():
+    pasty_bytes: bytes = Pasty(title="a.py").to_bytes()
+    assert binary.RUNTIME in pasty_bytes[:32]
+
+    other: bytes = pasty_bytes.replace(binary.RUNTIME, b"cpython-399/marshal4".ljust(len(binary.RUNTIME), b"0"), 1)
+    with pytest.raises(SerializationError, match="cpython-399"):
+        Pasty.from_bytes(other)
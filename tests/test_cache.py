@@ -0,0 +1,85 @@
+import time
+
+import httpx
+
+from pastemyst import Client, ResponseCache
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "example paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print('hello')"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def test_cached_paste_skips_the_network():
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if request.method == "PATCH":
+            return httpx.Response(200, json=dict(PASTE, title="edited"))
+        return httpx.Response(200, json=PASTE)
+
+    with Client(transport=httpx.MockTransport(handler), cache=ResponseCache()) as client:
+        first = client.get_paste("abcd1234")
+        second = client.get_paste("abcd1234")
+        assert first is not second
+        assert len(calls) == 1
+
+        first.pasties[0].code = "print('edited')"
+        client.edit_paste(first)
+        assert client.get_paste("abcd1234").title == "edited"
+        assert len(calls) == 2
+
+        stats = client.cache.stats()
+        assert stats.hits == 2
+        assert stats.misses == 1
+        assert stats.invalidations == 1
+
+
+def test_cache_hits_do_not_share_data():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=dict(PASTE, tags=["a"]))
+
+    with Client(transport=httpx.MockTransport(handler), cache=ResponseCache()) as client:
+        first = client.get_paste("abcd1234")
+        first.tags.append("MUTATED")
+        first.pasties[0].code = "changed"
+
+        second = client.get_paste("abcd1234")
+        assert second.tags == ["a"]
+        assert second.pasties[0].code == "print('hello')"
+        assert client.cache.stats().hits == 1
+
+
+def test_entries_expire_at_deletes_at():
+    cache: ResponseCache = ResponseCache()
+    cache.set("paste", "gone", dict(PASTE, deletesAt=int(time.time()) - 1), expires_at=time.time() - 1)
+    cache.set("paste", "kept", PASTE)
+
+    assert cache.get("paste", "gone") is None
+    assert cache.get("paste", "kept") == PASTE
+    assert cache.stats().expirations == 1
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache: ResponseCache = ResponseCache(max_size=2)
+    cache.set("user", "a", 1)
+    cache.set("user", "b", 2)
+    cache.get("user", "a")
+    cache.set("user", "c", 3)
+
+    assert cache.get("user", "b") is None
+    assert cache.get("user", "a") == 1
+    assert cache.stats().evictions == 1
@@ -0,0 +1,67 @@
+import gzip
+
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, Paste, Pasty, CassetteError
+from pastemyst.testing import FakePasteMyst, RecordingTransport, ReplayTransport, Cassette
+
+
+def record(path: str, latency: float = 0.0) -> RecordingTransport:
+    transport: RecordingTransport = RecordingTransport(FakePasteMyst(keys={"secret": "munchii"}, latency=latency), str(path))
+    with Client("secret", transport=transport, coalesce=False) as client:
+        client.get_paste("21y82rbw")
+        client.create_paste(Paste(title="recorded", pasties=[Pasty(title="a.txt", code="ü" * 2000)]))
+        client.get_user("munchii")
+        client.get_paste("21y82rbw")
+    return transport
+
+
+def test_record_redacts_credentials(tmp_path):
+    path = tmp_path / "session.cassette"
+    transport: RecordingTransport = record(path)
+    assert len(transport.cassette) == 4
+
+    raw: str = gzip.decompress(path.read_bytes()).decode("utf-8")
+    assert "secret" not in raw
+    assert "<redacted>" in raw
+
+    cassette: Cassette = Cassette.load(str(path))
+    assert [(i.method, i.target, i.status_code) for i in cassette.interactions] == [
+        (i.method, i.target, i.status_code) for i in transport.cassette.interactions
+    ]
+    assert cassette.interactions[1].request_body == transport.cassette.interactions[1].request_body
+
+
+def test_replay_serves_recorded_responses(tmp_path):
+    path = tmp_path / "session.cassette"
+    record(path)
+
+    transport: ReplayTransport = ReplayTransport(str(path))
+    with Client("another key", transport=transport, coalesce=False) as client:
+        assert client.get_paste("21y82rbw").pasties[0].title == "shellsort.adb"
+        assert client.get_user("munchii").is_contributor is True
+        assert client.get_paste("21y82rbw").title == "shellsort"
+        assert transport.remaining == 1
+
+        # the paste was only fetched twice while recording
+        with pytest.raises(CassetteError):
+            client.get_paste("21y82rbw")
+
+
+def test_replay_timing(tmp_path):
+    path = tmp_path / "session.cassette"
+    record(path, latency=0.05)
+
+    async def elapsed(timing: str) -> float:
+        async with AsyncClient(transport=ReplayTransport(str(path), timing=timing, repeat=True), coalesce=False) as client:
+            started_at: float = trio.current_time()
+            for _ in range(4):
+                await client.get_paste("21y82rbw")
+            return trio.current_time() - started_at
+
+    assert trio.run(elapsed, "original") >= 0.2
+    assert trio.run(elapsed, "fast") < 0.1
+
+    with pytest.raises(ValueError):
+        ReplayTransport(Cassette(), timing="slow")
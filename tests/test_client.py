@@ -0,0 +1,63 @@
+import gc
+import threading
+
+import httpx
+import pytest
+
+from pastemyst import Client, PastemystError
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "example paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print('hello')"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def test_loop_is_reused_between_calls():
+    threads: set = set()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        threads.add(threading.get_ident())
+        return httpx.Response(200, json=PASTE)
+
+    with Client(transport=httpx.MockTransport(handler)) as client:
+        for _ in range(5):
+            assert client.get_paste("abcd1234").id == "abcd1234"
+
+    assert len(threads) == 1
+    assert threading.get_ident() not in threads
+
+
+def test_closed_client_raises():
+    client: Client = Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=PASTE)))
+    client.get_paste("abcd1234")
+    client.close()
+
+    assert client.is_closed
+    with pytest.raises(PastemystError):
+        client.get_paste("abcd1234")
+
+
+def test_unclosed_client_is_closed_when_collected():
+    baseline: int = threading.active_count()
+
+    for _ in range(3):
+        client: Client = Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=PASTE)))
+        assert client.get_paste("abcd1234").id == "abcd1234"
+        assert threading.active_count() == baseline + 1
+
+        del client
+        gc.collect()
+
+    assert threading.active_count() == baseline
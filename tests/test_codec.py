@@ -0,0 +1,58 @@
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Paste, Pasty
+from pastemyst.utils import JsonCodec, StdlibJsonCodec, available_codecs, get_codec
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "exämple paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(\"hello\")\n"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+@pytest.mark.parametrize("name", list(available_codecs()))
+def test_codecs_round_trip(name: str):
+    codec: JsonCodec = get_codec(name)
+    raw: bytes = codec.dumps(PASTE)
+    assert isinstance(raw, bytes)
+    assert codec.loads(raw) == PASTE
+    assert StdlibJsonCodec().loads(raw) == PASTE
+
+
+def test_client_uses_codec_for_bodies():
+    bodies: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(200, content=StdlibJsonCodec().dumps(PASTE), headers={"content-type": "application/json"})
+
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.MockTransport(handler), codec=StdlibJsonCodec()) as client:
+            assert (await client.get_paste("abcd1234")).title == "exämple paste"
+            await client.create_paste(Paste(title="exämple paste", pasties=[Pasty(code="print(1)")]))
+
+    trio.run(main)
+    assert bodies[0] == b""
+    assert StdlibJsonCodec().loads(bodies[1])["title"] == "exämple paste"
+
+
+def test_incomplete_codec_fails_on_creation():
+    class LoadsOnly(JsonCodec):
+        def loads(self, data: bytes | str) -> dict:
+            return {}
+
+    with pytest.raises(TypeError):
+        LoadsOnly()
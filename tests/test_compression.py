@@ -0,0 +1,93 @@
+import gzip
+import json
+import zlib
+
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, Compression, Paste, Pasty
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "big log",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Plain Text", "title": "log.txt", "code": "INFO request handled in 12ms\n" * 2000}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def compressed_handler(requests: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        body: bytes = json.dumps(PASTE).encode("utf-8")
+
+        async def stream():
+            yield gzip.compress(body)
+
+        return httpx.Response(200, content=stream(), headers={"content-type": "application/json", "content-encoding": "gzip"})
+
+    return handler
+
+
+@pytest.mark.parametrize("encoding, decompress", [("gzip", gzip.decompress), ("deflate", zlib.decompress)])
+def test_compresses_large_request_bodies(encoding: str, decompress):
+    requests: list = []
+
+    async def main() -> AsyncClient:
+        async with AsyncClient(transport=httpx.MockTransport(compressed_handler(requests)), compression=Compression(encoding)) as client:
+            pasty: Pasty = Pasty(title="log.txt", code=PASTE["pasties"][0]["code"])
+            assert (await client.create_paste(Paste(title="big log", pasties=[pasty]))).id == "abcd1234"
+            return client
+
+    client: AsyncClient = trio.run(main)
+    request: httpx.Request = requests[0]
+    assert request.headers["content-encoding"] == encoding
+    assert json.loads(decompress(request.content))["title"] == "big log"
+
+    stats = client.compression_stats[0]
+    assert stats.route == "POST./paste"
+    assert stats.request_encoding == encoding
+    assert stats.request_sent == len(request.content)
+    assert stats.request_ratio > 10
+    assert stats.response_encoding == "gzip"
+    assert stats.response_ratio > 10
+
+
+def test_small_bodies_are_not_compressed():
+    requests: list = []
+
+    with Client(transport=httpx.MockTransport(compressed_handler(requests)), compression=Compression("gzip", threshold=1 << 20)) as client:
+        client.create_paste(Paste(title="tiny", pasties=[Pasty(code="print(1)")]))
+        stats = client.compression_stats[0]
+
+    assert "content-encoding" not in requests[0].headers
+    assert json.loads(requests[0].content)["title"] == "tiny"
+    assert stats.request_encoding is None
+    assert stats.request_ratio == 1.0
+
+
+def test_negotiates_response_encoding():
+    requests: list = []
+
+    with Client(transport=httpx.MockTransport(compressed_handler(requests))) as client:
+        assert client.get_paste("abcd1234").pasties[0].code == PASTE["pasties"][0]["code"]
+    with Client(transport=httpx.MockTransport(compressed_handler(requests)), compression=Compression(None, accept=["deflate"])) as client:
+        client.get_paste("abcd1234")
+
+    assert requests[0].headers["accept-encoding"] == Compression().accept_encoding
+    assert requests[1].headers["accept-encoding"] == "deflate"
+
+
+def test_rejects_unsupported_encoding():
+    with pytest.raises(ValueError):
+        Compression("zstd")
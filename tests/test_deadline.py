@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, PastemystTimeoutError, RetryPolicy, RetryBudget, CircuitBreaker
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "deadline",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(1)"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def ok_handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=PASTE)
+
+
+def test_deadline_covers_rate_limit_wait():
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.MockTransport(ok_handler)) as client:
+            client.api.ratelimiter.pause(60)
+            await client.get_paste("abcd1234", timeout=0.05)
+
+    start: float = time.monotonic()
+    with pytest.raises(PastemystTimeoutError):
+        trio.run(main)
+    assert time.monotonic() - start < 5
+
+
+def test_deadline_covers_retries_under_asyncio():
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        return httpx.Response(503, text="unavailable")
+
+    async def main() -> None:
+        policy: RetryPolicy = RetryPolicy(max_attempts=100, base_delay=0.02, max_delay=0.02)
+        async with AsyncClient(
+            transport=httpx.MockTransport(handler),
+            retry_policy=policy,
+            retry_budget=RetryBudget(capacity=1000),
+            circuit_breaker=CircuitBreaker(failure_threshold=1000),
+            timeout=0.2
+        ) as client:
+            await client.get_paste("abcd1234")
+
+    with pytest.raises(TimeoutError):
+        asyncio.run(main())
+    assert 1 < len(calls) < 100
+
+
+def test_deadline_covers_slow_responses_in_sync_client():
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await trio.sleep(10)
+        return httpx.Response(200, json=PASTE)
+
+    with Client(transport=httpx.MockTransport(handler), timeout=10) as client:
+        with pytest.raises(PastemystTimeoutError):
+            client.get_paste("abcd1234", timeout=0.05)
+        with pytest.raises(PastemystTimeoutError):
+            next(client.stream_paste("abcd1234", timeout=0.05))
+
+
+def test_fast_calls_are_not_affected():
+    with Client(transport=httpx.MockTransport(ok_handler), timeout=5) as client:
+        assert client.get_paste("abcd1234", timeout=1).title == "deadline"
+        assert client.paste_exists("abcd1234")
@@ -0,0 +1,51 @@
+from datetime import datetime, timezone
+
+from pastemyst import PasteResult, Pasty, User, LanguageInfo, Language, ExpiresIn, EditType
+from pastemyst.utils import Decoder, snake_to_camel
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "owner",
+    "title": "decoded",
+    "createdAt": 1700000000,
+    "expiresIn": "1d",
+    "deletesAt": 1700086400,
+    "stars": 2,
+    "isPrivate": False,
+    "isPublic": True,
+    "tags": ["a"],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(1)"}],
+    "edits": [{"_id": "e1", "editId": "x", "editType": 1, "metadata": ["p1"], "edit": "old", "editedAt": 1700000001}],
+    "encrypted": False
+}
+
+
+def test_decoder_maps_every_field():
+    paste: PasteResult = PasteResult.from_dict(PASTE)
+    assert (paste.id, paste.owner_id, paste.title, paste.stars, paste.is_public, paste.tags) == ("abcd1234", "owner", "decoded", 2, True, ["a"])
+    assert paste.created_at == datetime(2023, 11, 14, 22, 13, 20, tzinfo=timezone.utc)
+    assert paste.expires_in == ExpiresIn.ONE_DAY
+    assert paste.pasties[0].id == "p1"
+    assert paste.pasties[0].language == Language.PYTHON
+    assert paste.edits[0].edit_type == EditType.PASTY_TITLE
+    assert paste.edits[0].edited_at.timestamp() == 1700000001
+
+    pasty: Pasty = Pasty(title="kept")
+    assert PasteResult.from_dict({**PASTE, "pasties": [pasty]}).pasties[0] is pasty
+
+
+def test_decoder_handles_unknown_and_snake_case_keys():
+    user: User = User.from_dict({"_id": "u1", "username": "someone", "avatar_url": "x.png", "newField": 1, "another_new_field": [1]})
+    assert (user.id, user.username, user.avatar_url) == ("u1", "someone", "x.png")
+
+    info: LanguageInfo = LanguageInfo.from_dict({"name": "Python", "mode": "python", "mimes": [], "ext": ["py"], "color": None, "file": "python.js"})
+    assert info.extensions == ["py"]
+
+    decoder: Decoder = Decoder(User, renames={"id": "_id"})
+    assert decoder.fields["avatarUrl"] is not None
+    decoder.decode({"unknownKey": 1})
+    assert decoder.fields["unknownKey"] is None
+
+    assert snake_to_camel("supporter_length") == "supporterLength"
+    assert snake_to_camel("id") == "id"
@@ -0,0 +1,98 @@
+import json
+
+from pastemyst import Client, Paste, Pasty, PasteResult, Language, EditType
+from pastemyst.testing import FakePasteMyst, RecordingTransport
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "munchii",
+    "title": "edits",
+    "createdAt": 1700000000,
+    "expiresIn": "1d",
+    "deletesAt": 1700086400,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": ["a"],
+    "pasties": [
+        {"_id": "p1", "language": "Python", "title": "one.py", "code": "print(1)" * 1000},
+        {"_id": "p2", "language": "Python", "title": "two.py", "code": "print(2)" * 1000}
+    ],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def test_fetched_paste_starts_clean():
+    paste: PasteResult = PasteResult.from_dict(PASTE)
+    assert paste.changed == frozenset()
+
+    paste.title = "edits"
+    paste.pasties[0].code = "print(1)" * 1000
+    assert paste.changed == frozenset()
+
+    paste.title = "renamed"
+    paste.tags = ["a", "b"]
+    assert paste.changed == {"title", "tags"}
+    assert paste.to_edit_dict() == {"_id": "abcd1234", "title": "renamed", "tags": "a,b"}
+
+
+def test_changed_pasties_send_only_their_changes():
+    paste: PasteResult = PasteResult.from_dict(PASTE, lazy=True)
+    paste.pasties[1].language = Language.RUST
+    paste.add_pasty(Pasty(title="three.txt", code="3"))
+
+    assert paste.pasties[1].changed == {"language"}
+    assert paste.changed == {"pasties"}
+    assert paste.to_edit_dict() == {"_id": "abcd1234", "pasties": [
+        {"_id": "p1"},
+        {"_id": "p2", "language": "Rust"},
+        {"title": "three.txt", "code": "3", "language": "Autodetect"}
+    ]}
+
+    paste.remove_pasty("three.txt")
+    paste.mark_clean()
+    assert paste.changed == frozenset()
+    assert paste.pasties[1].changed == frozenset()
+
+
+def test_new_paste_is_entirely_changed():
+    paste: Paste = Paste(title="new")
+    assert paste.changed == {"title", "is_private", "is_public", "tags", "pasties"}
+
+    paste.mark_clean()
+    paste.is_private = True
+    assert paste.to_edit_dict() == {"isPrivate": True}
+
+
+def test_edit_paste_sends_the_difference():
+    recorder: RecordingTransport = RecordingTransport(FakePasteMyst(keys={"secret": "munchii"}))
+
+    with Client("secret", transport=recorder) as client:
+        paste: PasteResult = client.create_paste(Paste(
+            title="big",
+            pasties=[Pasty(title="a.py", code="x" * 100_000), Pasty(title="b.py", code="y" * 100_000)]
+        ))
+
+        # nothing changed, so no edit is made
+        assert client.edit_paste(paste) is paste
+        assert len(recorder.cassette) == 1
+
+        paste.title = "renamed"
+        paste.pasties[1].code = "z"
+        edited: PasteResult = client.edit_paste(paste)
+        assert paste.changed == frozenset()
+
+        sent: dict = json.loads(recorder.cassette.interactions[-1].request_body)
+        assert sent == {"_id": paste.id, "title": "renamed", "pasties": [{"_id": paste.pasties[0].id}, {"_id": paste.pasties[1].id, "code": "z"}]}
+        assert edited.title == "renamed"
+        assert [pasty.code for pasty in edited.pasties] == ["x" * 100_000, "z"]
+        assert sorted(edit.edit_type for edit in edited.edits) == [EditType.TITLE, EditType.PASTY_CONTENT]
+
+        # a saved paste that wasn't changed again is fetched instead of edited
+        edit: Paste = Paste(title="again", pasties=list(edited.pasties))
+        client.edit_paste(edit, edited.id)
+        client.edit_paste(edit, edited.id)
+        assert [interaction.method for interaction in recorder.cassette.interactions] == ["POST", "PATCH", "PATCH", "GET"]
+
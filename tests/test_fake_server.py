@@ -0,0 +1,119 @@
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, Paste, Pasty, Language, ExpiresIn, EditType, HttpError, RetryPolicy
+from pastemyst.testing import FakePasteMyst, default_dataset, generate_dataset
+
+
+def test_create_edit_and_delete_paste():
+    fake: FakePasteMyst = FakePasteMyst(keys={"secret": "munchii"}, clock=lambda: 1700000000)
+    with Client("secret", transport=fake) as client:
+        paste = client.create_paste(Paste(
+            title="mine",
+            pasties=[Pasty(title="a.py", code="print(1)", language=Language.PYTHON), Pasty(title="b.txt", code="b")],
+            expires_in=ExpiresIn.ONE_DAY,
+            is_private=True
+        ))
+        assert paste.id in fake.pastes
+        assert paste.is_private is True
+        assert client.get_expire_stamp(paste).timestamp() == 1700000000 + 86400
+        assert [p.id for p in client.get_self_user_pastes()] == [paste.id]
+
+        edit: Paste = Paste(title="renamed", pasties=[paste.pasties[0]], expires_in=ExpiresIn.ONE_DAY, is_private=True)
+        edit.pasties[0].code = "print(2)"
+        edited = client.edit_paste(edit, paste.id)
+        assert edited.title == "renamed"
+        assert edited.pasties[0].code == "print(2)"
+        assert {e.edit_type for e in edited.edits} == {EditType.TITLE, EditType.PASTY_CONTENT, EditType.PASTY_REMOVED}
+
+        # private pastes are hidden from everyone but their owner
+        with Client(transport=fake) as other, pytest.raises(HttpError):
+            other.get_paste(paste.id)
+
+        assert client.delete_paste(paste.id) is True
+        assert paste.id not in fake.pastes
+
+
+def test_self_user_needs_a_known_key():
+    fake: FakePasteMyst = FakePasteMyst(keys={"secret": "munchii"})
+
+    with Client("secret", transport=fake) as client:
+        assert client.get_self_user().service_ids == {"github": "30643112"}
+    with Client(transport=fake) as client:
+        assert client.get_user("munchii").service_ids is None
+    with Client("wrong", transport=fake) as client, pytest.raises(HttpError) as error:
+        client.get_self_user()
+    assert error.value.status_code == 401
+
+
+def test_injected_faults_are_retried():
+    fake: FakePasteMyst = FakePasteMyst()
+    fake.inject(503, times=2, path="/paste")
+    fake.inject(429, retry_after=0.01, path="/paste")
+
+    async def main() -> None:
+        async with AsyncClient(transport=fake, coalesce=False, retry_policy=RetryPolicy(base_delay=0.001, max_delay=0.01)) as client:
+            paste = await client.get_paste("21y82rbw")
+            assert paste.pasties[0].title == "shellsort.adb"
+            assert (await client.get_language_info(extension="rs")).name == Language.RUST
+
+    trio.run(main)
+    assert fake.log.count(("GET", "/paste/21y82rbw")) == 4
+    assert fake.faults == []
+
+
+def test_ratelimit_headers():
+    fake: FakePasteMyst = FakePasteMyst(ratelimit=2, window=60)
+
+    async def main() -> None:
+        async with httpx.AsyncClient(transport=fake, base_url="https://paste.myst.rs/api/v2") as session:
+            first: httpx.Response = await session.get("/data/language?name=python")
+            assert first.headers["x-ratelimit-limit"] == "2"
+            assert first.headers["x-ratelimit-remaining"] == "1"
+
+            await session.get("/data/language?name=python")
+            limited: httpx.Response = await session.get("/data/language?name=python")
+            assert limited.status_code == 429
+            assert float(limited.headers["retry-after"]) > 0
+
+            # every api key gets its own window
+            other: httpx.Response = await session.get("/data/language?name=python", headers={"Authorization": "key"})
+            assert other.status_code == 200
+
+    trio.run(main)
+
+
+def test_random_faults_are_seeded():
+    def statuses(seed: int) -> list:
+        fake: FakePasteMyst = FakePasteMyst(error_rate=0.5, seed=seed)
+
+        async def main() -> list:
+            async with httpx.AsyncClient(transport=fake) as session:
+                return [(await session.get("https://paste.myst.rs/api/v2/paste/21y82rbw")).status_code for _ in range(20)]
+
+        return trio.run(main)
+
+    assert statuses(1) == statuses(1)
+    assert {200, 500, 502, 503} >= set(statuses(1)) > {200}
+    assert generate_dataset(seed=3) == generate_dataset(seed=3)
+
+
+def test_asgi_and_local_server():
+    fake: FakePasteMyst = FakePasteMyst(generate_dataset(pastes=5, code_size=100))
+    paste_id: str = next(iter(fake.pastes))
+
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.ASGITransport(app=fake)) as client:
+            assert (await client.get_paste(paste_id)).id == paste_id
+
+        async with trio.open_nursery() as nursery:
+            port: int = await nursery.start(fake.serve)
+            async with AsyncClient(endpoint=f"http://127.0.0.1:{port}/api/v2") as client:
+                assert (await client.get_paste(paste_id)).pasties[0].code == fake.pastes[paste_id]["pasties"][0]["code"]
+                assert await client.user_exists("user0") is True
+                assert await client.user_exists("nobody") is False
+            nursery.cancel_scope.cancel()
+
+    trio.run(main)
+    assert default_dataset()["pastes"][0]["_id"] == "21y82rbw"
@@ -0,0 +1,96 @@
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, HedgePolicy
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "hedged",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(1)"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def slow_first_handler(calls: list, delay: float = 5.0, headers: dict = None):
+    async def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.method)
+        if len(calls) == 1:
+            await trio.sleep(delay)
+        return httpx.Response(200, json=PASTE, headers=headers or {})
+
+    return handler
+
+
+def test_hedge_percentile_delay():
+    policy: HedgePolicy = HedgePolicy(percentile=90, min_delay=0.01, max_delay=1.0, min_samples=10)
+    assert policy.delay("GET./paste/{paste_id}") == 1.0
+
+    for latency in range(1, 101):
+        policy.record("GET./paste/{paste_id}", latency / 1000)
+    assert policy.delay("GET./paste/{paste_id}") == pytest.approx(0.09)
+
+    with pytest.raises(ValueError):
+        HedgePolicy(percentile=0)
+
+
+def test_slow_request_is_hedged():
+    calls: list = []
+
+    async def main() -> AsyncClient:
+        policy: HedgePolicy = HedgePolicy(max_delay=0.05)
+        async with AsyncClient(transport=httpx.MockTransport(slow_first_handler(calls)), coalesce=False, hedge_policy=policy) as client:
+            with trio.fail_after(2):
+                assert (await client.get_paste("abcd1234")).title == "hedged"
+            return client
+
+    client: AsyncClient = trio.run(main)
+    state = client.hedge_state
+    assert calls == ["GET", "GET"]
+    assert (state.requests, state.hedges, state.wins, state.skipped) == (1, 1, 1, 0)
+    assert "GET./paste/{paste_id}" in state.delays
+    # the cancelled original is recorded too, with at least the time it ran
+    latencies: list = sorted(client.api.hedge.latencies["GET./paste/{paste_id}"])
+    assert len(latencies) == 2 and latencies[1] >= 0.05
+
+
+def test_fast_request_is_not_hedged():
+    calls: list = []
+
+    with Client(transport=httpx.MockTransport(slow_first_handler(calls, delay=0)), hedge_policy=HedgePolicy(max_delay=1.0)) as client:
+        client.get_paste("abcd1234")
+        state = client.hedge_state
+
+    assert calls == ["GET"]
+    assert (state.requests, state.hedges, state.wins) == (1, 0, 0)
+
+
+def test_no_hedge_when_bucket_is_nearly_empty():
+    calls: list = []
+    headers: dict = {"X-Ratelimit-Limit": "10", "X-Ratelimit-Remaining": "1", "X-Ratelimit-Reset-After": "60"}
+
+    async def main() -> AsyncClient:
+        async with AsyncClient(transport=httpx.MockTransport(slow_first_handler(calls, 0.2, headers)), hedge_policy=HedgePolicy(max_delay=0.01)) as client:
+            client.api.ratelimiter.update("GET./paste/{paste_id}", headers)
+            await client.get_paste("abcd1234")
+            return client
+
+    state = trio.run(main).hedge_state
+    assert calls == ["GET"]
+    assert (state.hedges, state.skipped) == (0, 1)
+
+
+def test_hedging_is_off_by_default():
+    with Client(transport=httpx.MockTransport(slow_first_handler([], delay=0))) as client:
+        client.get_paste("abcd1234")
+        assert client.hedge_state is None
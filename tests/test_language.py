@@ -1,15 +1,18 @@
+from typing import Optional
+
 from pastemyst import Client, LanguageInfo, Language
+from pastemyst.testing import FakePasteMyst
 
 
-def test_get_by_name():
-    client: Client = Client()
-    language: LanguageInfo = client.get_language_info(name="Python")
-    assert language.name == "Python" == Language.PYTHON
-    assert "py" in language.extensions
+def test_get_by_name(transport: Optional[FakePasteMyst]):
+    with Client(transport=transport) as client:
+        language: LanguageInfo = client.get_language_info(name="Python")
+        assert language.name == "Python" == Language.PYTHON
+        assert "py" in language.extensions
 
 
-def test_get_by_extension():
-    client: Client = Client()
-    language: LanguageInfo = client.get_language_info(extension="py")
-    assert language.name == "Python" == Language.PYTHON
-    assert "py" in language.extensions
+def test_get_by_extension(transport: Optional[FakePasteMyst]):
+    with Client(transport=transport) as client:
+        language: LanguageInfo = client.get_language_info(extension="py")
+        assert language.name == "Python" == Language.PYTHON
+        assert "py" in language.extensions
@@ -0,0 +1,53 @@
+import httpx
+import trio
+
+from pastemyst import AsyncClient, PasteResult, Language, EditType
+from pastemyst.utils import Lazy
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "lazy",
+    "createdAt": 1700000000,
+    "expiresIn": "1d",
+    "deletesAt": 1700086400,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(1)"}],
+    "edits": [{"_id": "e1", "editId": "x", "editType": 1, "metadata": [], "edit": "", "editedAt": 1700000001}],
+    "encrypted": False
+}
+
+
+def test_lazy_fields_are_built_on_first_access():
+    paste: PasteResult = PasteResult.from_dict(PASTE, lazy=True)
+    assert paste.id == "abcd1234"
+    assert type(paste._PasteResult__pasties) is Lazy
+    assert type(paste._PasteResult__created_at) is Lazy
+
+    pasties = paste.pasties
+    assert pasties[0].language == Language.PYTHON
+    assert paste.pasties is pasties
+    assert type(paste._PasteResult__edits) is Lazy
+
+    edit = paste.edits[0]
+    assert edit.edit_type == EditType.PASTY_TITLE
+    assert type(edit._PasteEdit__edited_at) is Lazy
+    assert edit.edited_at.timestamp() == 1700000001
+
+    eager: PasteResult = PasteResult.from_dict(PASTE)
+    assert (paste.created_at, paste.deletes_at) == (eager.created_at, eager.deletes_at)
+    assert paste.to_dict() == eager.to_dict()
+
+
+def test_lazy_client():
+    async def main() -> PasteResult:
+        async with AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200, json=PASTE)), lazy=True) as client:
+            return await client.get_paste("abcd1234")
+
+    paste: PasteResult = trio.run(main)
+    assert type(paste._PasteResult__pasties) is Lazy
+    assert paste.pasties[0].title == "example.py"
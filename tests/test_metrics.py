@@ -0,0 +1,89 @@
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, EventType, HttpError, MetricsRegistry, RetryPolicy
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "metrics",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(1)"}],
+    "edits": [],
+    "encrypted": False
+}
+
+ROUTE: str = "GET./paste/{paste_id}"
+
+
+def flaky_handler(calls: list):
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404, json={"statusMessage": "paste not found"})
+        if len(calls) == 1:
+            return httpx.Response(503, text="unavailable")
+        return httpx.Response(200, json=PASTE)
+
+    return handler
+
+
+def test_hooks_see_every_step_of_a_call():
+    events: list = []
+
+    async def main() -> None:
+        policy: RetryPolicy = RetryPolicy(base_delay=0.01)
+        async with AsyncClient(transport=httpx.MockTransport(flaky_handler([])), retry_policy=policy, hooks=[events.append]) as client:
+            client.api.ratelimiter.pause(0.01, ROUTE)
+            await client.get_paste("abcd1234")
+
+    trio.run(main)
+    assert [event.type for event in events] == [
+        EventType.REQUEST, EventType.RATELIMIT_WAIT, EventType.RESPONSE, EventType.RETRY, EventType.RESPONSE
+    ]
+    assert all(event.route == ROUTE for event in events)
+    assert events[1].lock_wait > 0
+    assert (events[2].status_code, events[2].attempt) == (503, 1)
+    assert (events[4].status_code, events[4].attempt) == (200, 2)
+    assert events[4].bytes_received == len(httpx.Response(200, json=PASTE).content)
+    assert events[4].latency >= events[2].latency > 0
+
+
+def test_metrics_registry():
+    metrics: MetricsRegistry = MetricsRegistry(bounds=[0.5, 1.0])
+
+    with Client(transport=httpx.MockTransport(flaky_handler([])), retry_policy=RetryPolicy(base_delay=0.01)) as client:
+        client.add_hook(metrics)
+        client.create_paste(client.get_paste("abcd1234"))
+        with pytest.raises(HttpError):
+            client.get_paste("missing")
+        client.remove_hook(metrics)
+        client.get_paste("abcd1234")
+
+    assert metrics.counter("pastemyst_requests_total", route=ROUTE) == 2
+    assert metrics.counter("pastemyst_requests_total", route="POST./paste") == 1
+    assert metrics.counter("pastemyst_retries_total", route=ROUTE) == 1
+    assert metrics.counter("pastemyst_responses_total", route=ROUTE, status="503") == 1
+    assert metrics.counter("pastemyst_responses_total", route=ROUTE, status="404") == 1
+    assert metrics.counter("pastemyst_errors_total", route=ROUTE, error="HttpError") == 1
+    assert metrics.counter("pastemyst_bytes_sent_total", route="POST./paste") > 0
+    assert metrics.histogram("pastemyst_response_latency_seconds", route=ROUTE).count == 3
+
+    text: str = metrics.to_prometheus()
+    assert "# TYPE pastemyst_requests_total counter\n" in text
+    assert 'pastemyst_requests_total{route="GET./paste/{paste_id}"} 2\n' in text
+    assert 'pastemyst_response_latency_seconds_bucket{route="GET./paste/{paste_id}",le="+Inf"} 3\n' in text
+    assert 'pastemyst_response_latency_seconds_count{route="GET./paste/{paste_id}"} 3\n' in text
+
+    snapshot: dict = metrics.snapshot()
+    metrics.reset()
+    assert metrics.to_prometheus() == ""
+    assert snapshot["pastemyst_retries_total"][(("route", ROUTE),)] == 1
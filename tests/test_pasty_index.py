@@ -0,0 +1,80 @@
+from pastemyst import Paste, Pasty, PasteResult, PastyList
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "bundle",
+    "createdAt": 1700000000,
+    "expiresIn": "1d",
+    "deletesAt": 1700086400,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [
+        {"_id": "p1", "language": "Python", "title": "main.py", "code": "1"},
+        {"_id": "p2", "language": "Python", "title": "util.py", "code": "2"},
+        {"_id": "p3", "language": "Python", "title": "main.py", "code": "3"}
+    ],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def test_lookups_find_the_first_match():
+    for lazy in (False, True):
+        paste: PasteResult = PasteResult.from_dict(PASTE, lazy=lazy)
+        assert isinstance(paste.pasties, PastyList)
+        assert paste.get_pasty_by_id("p2").code == "2"
+        assert paste.get_pasty_by_name("main.py").code == "1"
+        assert paste.get_pasty_by_id("missing") is None
+
+        paste.remove_pasty("main.py")
+        assert paste.get_pasty_by_name("main.py").code == "3"
+        assert paste.get_pasty_by_id("p1") is None
+
+
+def test_indexes_follow_changes():
+    paste: Paste = Paste(pasties=[Pasty(title=f"file{i}.py") for i in range(100)])
+    assert paste.get_pasty_by_name("file50.py") is paste.pasties[50]
+
+    added: Pasty = Pasty(title="file50.py")
+    paste.add_pasty(added)
+    assert paste.get_pasty_by_name("file50.py") is paste.pasties[50]
+    paste.pasties.insert(0, added)
+    assert paste.get_pasty_by_name("file50.py") is added
+
+    paste.pasties[10].title = "renamed.py"
+    assert paste.get_pasty_by_name("renamed.py") is paste.pasties[10]
+    assert paste.get_pasty_by_name("file9.py") is None
+
+    del paste.pasties[:]
+    assert paste.get_pasty_by_name("renamed.py") is None
+
+
+def test_moved_pasty_loses_its_id():
+    source: PasteResult = PasteResult.from_dict(PASTE)
+    pasty: Pasty = source.get_pasty_by_id("p2")
+
+    Paste().add_pasty(pasty)
+    assert source.get_pasty_by_id("p2") is None
+
+
+def test_renames_only_reindex_their_own_lists():
+    first: PastyList = PastyList([Pasty(title="a.py"), Pasty(title="b.py")])
+    second: PastyList = PastyList([Pasty(title="a.py")])
+    shared: PastyList = PastyList([first[1]])
+    for pasties in (first, second):
+        assert pasties.find_by_title("a.py") is pasties[0]
+    assert shared.find_by_title("b.py") is first[1]
+
+    first[1].title = "a.py"
+    first[0].title = "c.py"
+    assert first.find_by_title("a.py") is first[1]
+    assert shared.find_by_title("a.py") is first[1]
+    assert shared.find_by_title("b.py") is None
+    # the second list has no renamed pasty, so its index is kept
+    assert second._PastyList__by_title is not None
+
+    assert Pasty.from_bytes(first[0].to_bytes()).title == "c.py"
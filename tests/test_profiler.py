@@ -0,0 +1,74 @@
+import httpx
+import trio
+
+from pastemyst import AsyncClient, Client, PasteResult, Profiler, RecordingTracer
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "profiled",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(1)"}],
+    "edits": [{"_id": "e1", "editId": "x", "editType": 1, "metadata": [], "edit": "", "editedAt": 1700000001}],
+    "encrypted": False
+}
+
+
+def handler(request: httpx.Request) -> httpx.Response:
+    return httpx.Response(200, json=PASTE)
+
+
+def test_profiler_reports_every_phase():
+    with Client(transport=httpx.MockTransport(handler), coalesce=False) as client:
+        profiler: Profiler = client.start_profiling()
+        assert client.start_profiling() is profiler
+        for _ in range(3):
+            client.get_paste("abcd1234")
+        assert client.stop_profiling() is profiler
+        assert client.profiler is None
+        client.get_paste("abcd1234")
+
+    report: dict = {stats.phase: stats for stats in profiler.report()}
+    # the decoders map known keys up front, so key mapping only shows up for keys they haven't seen before
+    assert set(report) - {"key mapping"} == {
+        "call", "loop startup", "lock wait", "network", "json decode", "model construction", "datetime/enum conversion"
+    }
+    assert report["call"].calls == 3
+    assert report["loop startup"].calls == 1
+    assert report["network"].calls == 3
+    assert report["datetime/enum conversion"].calls == 3 * 6
+    assert report["call"].share == 1.0
+    assert report["model construction"].wall <= report["call"].wall
+    assert [stats.phase for stats in profiler.report()][0] in ("call", "loop startup")
+
+    summary: str = profiler.summary()
+    assert summary.splitlines()[0].split()[0] == "phase"
+    assert "model construction" in summary
+
+
+def test_profiling_restores_tracer_and_times_only_its_client():
+    tracer: RecordingTracer = RecordingTracer()
+
+    async def main() -> Profiler:
+        async with AsyncClient(transport=httpx.MockTransport(handler), tracer=tracer) as client:
+            async with AsyncClient(transport=httpx.MockTransport(handler)) as other:
+                profiler: Profiler = client.start_profiling()
+                await client.get_paste("abcd1234")
+                await other.get_paste("abcd1234")
+                PasteResult.from_dict(PASTE)
+                client.stop_profiling()
+                assert client.api.tracer is tracer
+                return profiler
+
+    profiler: Profiler = trio.run(main)
+    assert [root.name for root in tracer.roots] == ["pastemyst.get_paste"]
+    report: dict = {stats.phase: stats for stats in profiler.report()}
+    assert "loop startup" not in report
+    assert report["datetime/enum conversion"].calls == 6
@@ -0,0 +1,78 @@
+import time
+
+import httpx
+import trio
+
+from pastemyst import AsyncClient
+from pastemyst.api import RateLimiter
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "example paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def test_buckets_are_keyed_by_route_template():
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json=PASTE, headers={"X-Ratelimit-Limit": "5", "X-Ratelimit-Remaining": "4", "X-Ratelimit-Reset-After": "1"})
+
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            for paste_id in ("a", "b", "c"):
+                await client.get_paste(paste_id)
+
+            assert list(client.rate_limits) == ["GET./paste/{paste_id}"]
+            assert client.rate_limits["GET./paste/{paste_id}"].limit == 5
+
+    trio.run(main)
+
+
+def test_retries_after_429():
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(time.monotonic())
+        if len(calls) == 1:
+            return httpx.Response(429, json={"statusMessage": "slow down"}, headers={"Retry-After": "0.2"})
+        return httpx.Response(200, json=PASTE)
+
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.MockTransport(handler)) as client:
+            assert (await client.get_paste("abcd1234")).id == "abcd1234"
+
+    trio.run(main)
+    assert len(calls) == 2
+    assert calls[1] - calls[0] >= 0.2
+
+
+def test_global_pause_holds_every_bucket():
+    limiter: RateLimiter = RateLimiter()
+    limiter.handle_429("GET./paste/{paste_id}", {"X-Ratelimit-Global": "true", "Retry-After": "0.2"}, "")
+
+    assert limiter.predicted_wait("GET./user/{username}") > 0.1
+
+    async def main() -> float:
+        return await limiter.acquire("GET./user/{username}")
+
+    assert trio.run(main) >= 0.15
+
+
+def test_empty_bucket_predicts_wait():
+    limiter: RateLimiter = RateLimiter()
+    limiter.update("GET./paste/{paste_id}", {"X-Ratelimit-Limit": "2", "X-Ratelimit-Remaining": "0", "X-Ratelimit-Reset-After": "5"})
+
+    state = limiter.snapshot()["GET./paste/{paste_id}"]
+    assert state.remaining == 0
+    assert 4 < state.wait_time <= 5
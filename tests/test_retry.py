@@ -0,0 +1,104 @@
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, HttpError, CircuitOpenError, Paste, Pasty
+from pastemyst.api import RetryPolicy, CircuitBreaker, CircuitState
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "example paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [],
+    "edits": [],
+    "encrypted": False
+}
+
+FAST: RetryPolicy = RetryPolicy(base_delay=0.001, max_delay=0.01)
+
+
+def test_retries_connect_errors_and_server_errors():
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            raise httpx.ConnectError("connection refused", request=request)
+        if len(calls) == 2:
+            return httpx.Response(503, json={"statusMessage": "unavailable"})
+        return httpx.Response(200, json=PASTE)
+
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.MockTransport(handler), retry_policy=FAST) as client:
+            assert (await client.get_paste("abcd1234")).id == "abcd1234"
+            assert client.retry_state.retries == 2
+            assert client.retry_state.circuit_state == CircuitState.CLOSED
+
+    trio.run(main)
+    assert len(calls) == 3
+
+
+def test_post_is_not_retried_on_server_error():
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(500, json={"statusMessage": "oops"})
+
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.MockTransport(handler), retry_policy=FAST) as client:
+            with pytest.raises(HttpError):
+                await client.create_paste(Paste(pasties=[Pasty()]))
+
+    trio.run(main)
+    assert len(calls) == 1
+
+
+def test_circuit_breaker_fails_fast():
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(502, json={"statusMessage": "bad gateway"})
+
+    async def main() -> None:
+        breaker: CircuitBreaker = CircuitBreaker(failure_threshold=3, recovery_time=60)
+        async with AsyncClient(transport=httpx.MockTransport(handler), retry_policy=FAST, circuit_breaker=breaker) as client:
+            with pytest.raises(HttpError):
+                await client.get_paste("abcd1234")
+            assert client.retry_state.circuit_state == CircuitState.OPEN
+
+            with pytest.raises(CircuitOpenError):
+                await client.get_paste("abcd1234")
+            assert client.retry_state.rejected == 1
+
+    trio.run(main)
+    assert len(calls) == 3
+
+
+def test_rate_limit_retry_respects_max_retry_time():
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(429, headers={"Retry-After": "30"}, json={"statusMessage": "too many requests"})
+
+    async def main() -> None:
+        policy: RetryPolicy = RetryPolicy(base_delay=0.001, max_delay=0.01, max_retry_time=1.0)
+        async with AsyncClient(transport=httpx.MockTransport(handler), retry_policy=policy) as client:
+            with trio.fail_after(5):
+                with pytest.raises(HttpError):
+                    await client.get_paste("abcd1234")
+            assert client.retry_state.retries == 0
+            assert client.retry_state.budget == pytest.approx(10.0)
+
+    trio.run(main)
+    assert len(calls) == 1
@@ -0,0 +1,96 @@
+from typing import List, Tuple
+
+import pytest
+
+from pastemyst import Client, Paste, Pasty, PasteResult, Language, RevisionHistory, RevisionError, LineDiff, diff_lines
+from pastemyst.testing import FakePasteMyst
+
+
+def state(paste) -> Tuple[str, List[Tuple[str, str, Language, str]]]:
+    return paste.title, sorted((pasty.id, pasty.title, pasty.language, pasty.code) for pasty in paste.pasties)
+
+
+def test_revisions_match_every_saved_paste():
+    clock: List[int] = [1700000000]
+    fake: FakePasteMyst = FakePasteMyst(keys={"secret": "munchii"}, clock=lambda: clock[0])
+
+    with Client("secret", transport=fake) as client:
+        paste: PasteResult = client.create_paste(Paste(title="v0", pasties=[Pasty(title="main.py", code="a\nb\nc", language=Language.PYTHON)]))
+        saved: list = [state(paste)]
+        # the revision each removed pasty was removed at
+        removed: dict = {}
+
+        for version in range(1, 40):
+            clock[0] += 60
+            paste.title = f"v{version}"
+            paste.pasties[0].code += f"\nline {version}"
+            if version % 7 == 0:
+                paste.add_pasty(Pasty(title=f"extra{version}.txt", code=str(version)))
+            if version % 11 == 0:
+                paste.pasties[0].language = Language.RUST
+                removed[paste.pasties[-1].id] = version
+                paste.remove_pasty(paste.pasties[-1])
+            paste = client.edit_paste(paste)
+            saved.append(state(paste))
+
+    history: RevisionHistory = RevisionHistory(paste, snapshot_every=8)
+    assert len(history) == 40
+    for number in (39, 3, 38, 0, 17, 16, 25):
+        title, pasties = saved[number]
+        # the edits removing pasties only kept their titles
+        pasties = [
+            (id, pasty_title, Language.AUTODETECT, None) if number < removed.get(id, 0) else (id, pasty_title, language, code)
+            for id, pasty_title, language, code in pasties
+        ]
+        assert state(history[number]) == (title, pasties)
+    assert history[-1].title == "v39"
+    assert history[5].edited_at.timestamp() == 1700000000 + 5 * 60
+    assert history[0].edited_at == paste.created_at
+
+    diff: LineDiff = history.diff(paste.pasties[0].id, 10, 12)
+    assert diff.added == 2 and diff.removed == 0
+    assert diff.unified(1) == ["@@ -13 +13,3 @@", " line 10", "+line 11", "+line 12"]
+
+    with pytest.raises(RevisionError):
+        history.revision(40)
+    with pytest.raises(RevisionError):
+        history.diff(next(iter(removed)), 5, 10)
+
+
+def test_added_and_removed_pasties_are_undone():
+    edit: dict = {"editId": "e1", "editedAt": 1700000060}
+    paste: PasteResult = PasteResult.from_dict({
+        "_id": "abcd1234",
+        "ownerId": "munchii",
+        "title": "swapped",
+        "createdAt": 1700000000,
+        "expiresIn": "never",
+        "deletesAt": 0,
+        "stars": 0,
+        "isPrivate": False,
+        "isPublic": False,
+        "tags": [],
+        "pasties": [{"_id": "p2", "language": "Python", "title": "new.py", "code": "new"}],
+        "edits": [
+            {**edit, "_id": "x1", "editType": 5, "metadata": ["p1"], "edit": "old.py"},
+            {**edit, "_id": "x2", "editType": 4, "metadata": ["p2"], "edit": "new.py"}
+        ],
+        "encrypted": False
+    })
+
+    history: RevisionHistory = RevisionHistory(paste)
+    assert [(pasty.id, pasty.title, pasty.code) for pasty in history[0].pasties] == [("p1", "old.py", None)]
+    assert history[0].title == "swapped"
+    assert state(history[1]) == state(paste)
+
+
+def test_diff_lines_is_minimal():
+    a: List[str] = ["a", "b", "c", "a", "b", "b", "a"]
+    b: List[str] = ["c", "b", "a", "b", "a", "c"]
+    opcodes = diff_lines(a, b)
+    assert sum(i2 - i1 for tag, i1, i2, _, _ in opcodes if tag == "equal") == 4
+
+    rebuilt: List[str] = []
+    for tag, i1, i2, j1, j2 in opcodes:
+        rebuilt += a[i1:i2] if tag == "equal" else b[j1:j2]
+    assert rebuilt == b
@@ -0,0 +1,72 @@
+import anyio
+import httpx
+import trio
+
+from pastemyst import AsyncClient, PasteResult
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "example paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [],
+    "edits": [],
+    "encrypted": False
+}
+
+
+class SlowTransport(httpx.AsyncBaseTransport):
+    def __init__(self):
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        await anyio.sleep(0.05)
+        return httpx.Response(200, json=PASTE)
+
+
+def test_concurrent_gets_share_one_request():
+    transport: SlowTransport = SlowTransport()
+    results: list = []
+
+    async def main() -> None:
+        async with AsyncClient(transport=transport) as client:
+            async def fetch() -> None:
+                results.append(await client.get_paste("abcd1234"))
+
+            async with anyio.create_task_group() as tg:
+                for _ in range(20):
+                    tg.start_soon(fetch)
+
+            assert client.flights.coalesced == 19
+
+    trio.run(main)
+    assert transport.calls == 1
+    assert len(results) == 20
+    assert isinstance(results[0], PasteResult)
+    # every caller gets its own paste, so changing one doesn't change the others
+    assert len({id(result) for result in results}) == 20
+    results[0].tags.append("mine")
+    results[0].mark_clean()
+    results[1].title = "theirs"
+    assert results[1].tags == [] and results[2].title == "example paste"
+    assert results[1].changed == {"title"}
+
+
+def test_sequential_gets_are_not_coalesced():
+    transport: SlowTransport = SlowTransport()
+
+    async def main() -> None:
+        async with AsyncClient(transport=transport) as client:
+            await client.get_paste("abcd1234")
+            await client.get_paste("abcd1234")
+
+    trio.run(main)
+    assert transport.calls == 2
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import sqlite3
+import time
+
+import httpx
+
+from pastemyst import Client, PasteStore
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "example paste",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print('hello')"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+def test_store_survives_restarts(tmp_path):
+    calls: list = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        return httpx.Response(200, json=PASTE)
+
+    path: str = os.path.join(tmp_path, "pastes.db")
+    for _ in range(2):
+        store: PasteStore = PasteStore(path)
+        with Client(transport=httpx.MockTransport(handler), store=store) as client:
+            assert client.get_paste("abcd1234").pasties[0].code == "print('hello')"
+        store.close()
+
+    assert len(calls) == 1
+
+
+def test_expired_pastes_are_removed(tmp_path):
+    store: PasteStore = PasteStore(os.path.join(tmp_path, "pastes.db"))
+    store.put(dict(PASTE, _id="soon", deletesAt=int(time.time()) + 1))
+    store.put(PASTE)
+    assert store.stats().count == 2
+
+    time.sleep(1.1)
+    assert store.get("soon") is None
+    assert store.get("abcd1234") == PASTE
+
+
+def test_stored_pastes_are_refetched_after_max_age(tmp_path):
+    store: PasteStore = PasteStore(os.path.join(tmp_path, "pastes.db"), max_age=0.5)
+    store.put(PASTE)
+    assert store.get("abcd1234") == PASTE
+
+    time.sleep(0.6)
+    assert store.get("abcd1234") is None
+    assert PasteStore(os.path.join(tmp_path, "other.db")).max_age is not None
+
+
+def test_existing_database_gets_incremental_vacuum(tmp_path):
+    path: str = os.path.join(tmp_path, "pastes.db")
+    connection: sqlite3.Connection = sqlite3.connect(path)
+    connection.execute("CREATE TABLE unrelated (x)")
+    connection.close()
+
+    store: PasteStore = PasteStore(path)
+    store.put(PASTE)
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA auto_vacuum").fetchone()[0] == 2
+    connection.close()
+    store.close()
+
+
+def test_compaction_drops_least_recently_used(tmp_path):
+    store: PasteStore = PasteStore(os.path.join(tmp_path, "pastes.db"), max_size=1000, compact_every=0)
+    for i in range(10):
+        store.put(dict(PASTE, _id=f"paste{i}"))
+        time.sleep(0.01)
+    store.get("paste0")
+
+    store.compact()
+    assert store.stats().size <= 1000
+    assert store.get("paste0") is not None
+    assert store.get("paste1") is None
+
+
+def write_pastes(path: str, offset: int) -> None:
+    store: PasteStore = PasteStore(path)
+    for i in range(50):
+        store.put(dict(PASTE, _id=f"paste{offset + i}"))
+
+
+def test_processes_share_a_store(tmp_path):
+    path: str = os.path.join(tmp_path, "pastes.db")
+    PasteStore(path).close()
+
+    processes: list = [multiprocessing.Process(target=write_pastes, args=(path, i * 50)) for i in range(4)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+        assert process.exitcode == 0
+
+    assert PasteStore(path).stats().count == 200
@@ -0,0 +1,131 @@
+import json
+import random
+
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, HttpError
+from pastemyst.utils import PastyStreamParser, PASTY_START, PASTY_FIELD, CODE_CHUNK, PASTY_END
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "stream \"me\"",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": ["a", "b"],
+    "pasties": [
+        {"_id": "p1", "language": "Python", "title": "big.py", "code": "print(\"hëllo\")\n\t\\ 😀 {[]}\n" * 5000},
+        {"_id": "p2", "language": "Plain Text", "title": "empty", "code": ""},
+        {"_id": "p3", "title": "code first", "code": "x = 1\n", "language": "Python"}
+    ],
+    "edits": [{"_id": "e1", "editId": "x", "editType": 1, "metadata": ["{\"pasties\": [\""], "edit": "", "editedAt": 1}],
+    "encrypted": False
+}
+
+
+def chunked(data: bytes, size: int) -> list:
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def parse(data: bytes, size: int) -> list:
+    parser: PastyStreamParser = PastyStreamParser()
+    events: list = []
+    for chunk in chunked(data, size):
+        events.extend(parser.feed(chunk))
+    events.extend(parser.close())
+    assert parser.is_done
+    return events
+
+
+def collect(events: list) -> list:
+    pasties: list = []
+    for event, value in events:
+        if event == PASTY_START:
+            pasties.append({"code": ""})
+        elif event == PASTY_FIELD:
+            pasties[-1][value[0]] = value[1]
+        elif event == CODE_CHUNK:
+            pasties[-1]["code"] += value
+    return pasties
+
+
+@pytest.mark.parametrize("ensure_ascii", [True, False])
+def test_parser_handles_any_chunking(ensure_ascii: bool):
+    data: bytes = json.dumps(PASTE, ensure_ascii=ensure_ascii, indent=1).encode("utf-8")
+    rng: random.Random = random.Random(7)
+
+    for size in [1, 2, 3, 7, 64, 4096, len(data)] + [rng.randint(1, 512) for _ in range(10)]:
+        events: list = parse(data, size)
+        assert collect(events) == PASTE["pasties"]
+        assert [event for event, _ in events].count(PASTY_END) == 3
+
+
+def test_parser_rejects_incomplete_document():
+    parser: PastyStreamParser = PastyStreamParser()
+    parser.feed(json.dumps(PASTE).encode("utf-8")[:-10])
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def stream_handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/missing"):
+        return httpx.Response(404, json={"statusMessage": "paste not found"})
+
+    async def body():
+        for chunk in chunked(json.dumps(PASTE).encode("utf-8"), 1000):
+            yield chunk
+
+    return httpx.Response(200, content=body(), headers={"content-type": "application/json"})
+
+
+def test_async_stream_paste():
+    async def main() -> list:
+        async with AsyncClient(transport=httpx.MockTransport(stream_handler)) as client:
+            return [pasty async for pasty in client.stream_paste("abcd1234")]
+
+    pasties: list = trio.run(main)
+    assert [pasty.to_dict() for pasty in pasties] == PASTE["pasties"]
+
+
+def test_async_stream_paste_errors():
+    async def main() -> None:
+        async with AsyncClient(transport=httpx.MockTransport(stream_handler)) as client:
+            async for _ in client.stream_paste("missing"):
+                pass
+
+    with pytest.raises(HttpError):
+        trio.run(main)
+
+
+def test_sync_stream_paste_to_sinks(tmp_path):
+    opened: list = []
+
+    def open_sink(pasty):
+        opened.append(pasty.title)
+        return open(tmp_path / pasty.id, "w", encoding="utf-8", newline="")
+
+    with Client(transport=httpx.MockTransport(stream_handler)) as client:
+        pasties: list = list(client.stream_paste("abcd1234", open_sink))
+
+    assert [pasty.id for pasty in pasties] == ["p1", "p2", "p3"]
+    assert all(pasty.code == "" for pasty in pasties)
+    assert pasties[0].title == "big.py"
+    assert opened == ["big.py", "code first"]
+    assert (tmp_path / "p1").read_text(encoding="utf-8") == PASTE["pasties"][0]["code"]
+    assert (tmp_path / "p3").read_text(encoding="utf-8") == "x = 1\n"
+    assert not (tmp_path / "p2").exists()
+
+
+def test_sync_stream_paste_can_stop_early():
+    with Client(transport=httpx.MockTransport(stream_handler)) as client:
+        for pasty in client.stream_paste("abcd1234"):
+            break
+        assert pasty.id == "p1"
+        assert client.get_paste("abcd1234").id == "abcd1234"
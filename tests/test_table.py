@@ -0,0 +1,71 @@
+import sys
+
+from pastemyst import PasteTable, PasteResult, Language, ExpiresIn
+from pastemyst.testing import generate_dataset
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "owner",
+    "title": "tabled ü",
+    "createdAt": 1700000000,
+    "expiresIn": "1d",
+    "deletesAt": 1700086400,
+    "stars": 5,
+    "isPrivate": True,
+    "isPublic": False,
+    "tags": ["logs", "ci"],
+    "pasties": [
+        {"_id": "p1", "language": "Python", "title": "a.py", "code": "print('ü')"},
+        {"_id": "p2", "language": "Rust", "title": "b.rs", "code": "fn main() {}"}
+    ],
+    "edits": [{"_id": "e1", "editId": "x", "editType": 1, "metadata": ["p1"], "edit": "old", "editedAt": 1700000001}],
+    "encrypted": False
+}
+
+
+def test_rows_round_trip():
+    pastes: list = [PASTE] + generate_dataset(seed=1, pastes=20)["pastes"]
+    table: PasteTable = PasteTable.from_dicts(pastes)
+
+    assert len(table) == 21
+    assert [table.to_dict(row) for row in range(len(table))] == pastes
+    assert table.index("abcd1234") == 0
+
+    paste: PasteResult = table[0]
+    assert paste.title == "tabled ü"
+    assert paste.expires_in == ExpiresIn.ONE_DAY
+    assert paste.pasties[1].language == Language.RUST
+    assert paste.edits[0].metadata == ["p1"]
+    assert table.row(0, lazy=True).to_dict() == paste.to_dict()
+
+
+def test_filters_and_aggregations():
+    table: PasteTable = PasteTable([
+        PASTE,
+        {**PASTE, "_id": "x2", "expiresIn": "never", "tags": ["logs"], "stars": 1, "pasties": [{"_id": "p3", "language": "Python", "title": "c.py", "code": "pass"}]},
+        {**PASTE, "_id": "x3", "tags": [], "stars": 2, "pasties": [{"_id": "p4", "language": "Go", "title": "d.go", "code": "package main"}]}
+    ])
+
+    assert list(table.with_language(Language.PYTHON)) == [0, 1]
+    assert list(table.with_language("Haskell")) == []
+    assert list(table.with_expires_in(ExpiresIn.ONE_DAY)) == [0, 2]
+    assert list(table.with_tag("logs")) == [0, 1]
+    assert list(table.where(language=Language.PYTHON, expires_in=ExpiresIn.ONE_DAY)) == [0]
+    assert list(table.where(tag="logs", rows=[1, 2])) == [1]
+
+    assert table.count_by_language() == {"Python": 2, "Rust": 1, "Go": 1}
+    assert table.count_by_language(rows=[2]) == {"Go": 1}
+    assert table.code_size_by_language() == {"Python": len("print('ü')".encode()) + 4, "Go": 12, "Rust": 12}
+    assert table.count_by_expires_in() == {"1d": 2, "never": 1}
+    assert table.count_by_tag() == {"logs": 2, "ci": 1}
+    assert table.total_stars() == 8
+    assert table.total_stars(table.with_tag("ci")) == 5
+
+
+def test_table_is_smaller_than_objects():
+    pastes: list = generate_dataset(seed=2, pastes=200, pasties=3, code_size=64)["pastes"]
+    table: PasteTable = PasteTable(pastes)
+
+    objects: int = sum(sys.getsizeof(p) + sum(sys.getsizeof(y) + sys.getsizeof(y.code) + sys.getsizeof(y.title) for y in p.pasties) for p in map(PasteResult.from_dict, pastes))
+    assert table.nbytes < objects
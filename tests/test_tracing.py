@@ -0,0 +1,114 @@
+import httpx
+import pytest
+import trio
+
+from pastemyst import AsyncClient, Client, HttpError, RecordingTracer, Tracer, OpenTelemetryTracer
+
+
+PASTE: dict = {
+    "_id": "abcd1234",
+    "ownerId": "",
+    "title": "traced",
+    "createdAt": 1700000000,
+    "expiresIn": "never",
+    "deletesAt": 0,
+    "stars": 0,
+    "isPrivate": False,
+    "isPublic": False,
+    "tags": [],
+    "pasties": [{"_id": "p1", "language": "Python", "title": "example.py", "code": "print(1)"}],
+    "edits": [],
+    "encrypted": False
+}
+
+
+class TracedTransport(httpx.AsyncBaseTransport):
+    """
+    Answers every request, reporting the same trace events as a real network transport.
+    """
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        trace = request.extensions.get("trace")
+        events: list = [
+            "connection.connect_tcp.started", "connection.connect_tcp.complete",
+            "http11.send_request_headers.started", "http11.send_request_headers.complete",
+            "http11.receive_response_headers.started", "http11.receive_response_headers.complete",
+            "http11.receive_response_body.started", "http11.receive_response_body.complete"
+        ]
+        for event in events if trace is not None else ():
+            await trace(event, {})
+            await trio.sleep(0.001)
+
+        if request.url.path.endswith("/missing"):
+            return httpx.Response(404, json={"statusMessage": "paste not found"})
+        return httpx.Response(200, json=PASTE)
+
+
+def names(span) -> list:
+    return [child.name for child in span.children]
+
+
+def test_span_tree_covers_every_phase():
+    tracer: RecordingTracer = RecordingTracer()
+
+    async def main() -> None:
+        async with AsyncClient(transport=TracedTransport(), tracer=tracer) as client:
+            client.api.ratelimiter.pause(0.01, "GET./paste/{paste_id}")
+            await client.get_paste("abcd1234")
+
+    trio.run(main)
+    assert [root.name for root in tracer.roots] == ["pastemyst.get_paste"]
+
+    root = tracer.roots[0]
+    assert names(root) == ["http.request", "model.from_dict"]
+    assert root.children[1].attributes == {"model": "PasteResult"}
+
+    request = root.children[0]
+    assert request.attributes["route"] == "GET./paste/{paste_id}"
+    assert names(request) == ["ratelimit.acquire", "http.attempt", "json.decode"]
+    assert names(request.children[0]) == ["ratelimit.bucket_wait"]
+
+    attempt = request.children[1]
+    assert attempt.attributes == {"attempt": 1, "status_code": 200}
+    assert names(attempt) == ["http.connect", "http.send", "http.ttfb", "http.body"]
+    assert all(child.duration > 0 for child in attempt.children)
+    assert root.duration >= request.duration >= attempt.duration
+
+
+def test_failed_calls_record_errors():
+    tracer: RecordingTracer = RecordingTracer()
+
+    with Client(transport=TracedTransport(), tracer=tracer) as client:
+        with pytest.raises(HttpError):
+            client.get_paste("missing")
+
+    root = tracer.roots[0]
+    assert isinstance(root.error, HttpError)
+    assert isinstance(root.find("http.request")[0].error, HttpError)
+    assert root.find("http.attempt")[0].attributes["status_code"] == 404
+
+
+def test_default_tracer_records_nothing():
+    with Client(transport=TracedTransport()) as client:
+        assert type(client.api.tracer) is Tracer
+        assert not client.api.tracer.enabled
+        assert client.get_paste("abcd1234").title == "traced"
+
+
+def test_opentelemetry_tracer():
+    pytest.importorskip("opentelemetry.sdk")
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+
+    exporter: InMemorySpanExporter = InMemorySpanExporter()
+    provider: TracerProvider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+
+    with Client(transport=TracedTransport(), tracer=OpenTelemetryTracer(provider.get_tracer("test"))) as client:
+        client.get_paste("abcd1234")
+
+    spans: dict = {span.name: span for span in exporter.get_finished_spans()}
+    assert {"pastemyst.get_paste", "http.request", "http.attempt", "http.ttfb", "json.decode", "model.from_dict"} <= set(spans)
+    assert spans["http.request"].parent.span_id == spans["pastemyst.get_paste"].context.span_id
+    assert spans["http.ttfb"].parent.span_id == spans["http.attempt"].context.span_id
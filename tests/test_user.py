@@ -1,15 +1,18 @@
+from typing import Optional
+
 from pastemyst import Client, User
+from pastemyst.testing import FakePasteMyst
 
 
-def test_user_exists():
-    client: Client = Client()
-    user_exists: bool = client.user_exists("munchii")
-    assert user_exists is True
+def test_user_exists(transport: Optional[FakePasteMyst]):
+    with Client(transport=transport) as client:
+        user_exists: bool = client.user_exists("munchii")
+        assert user_exists is True
 
 
-def test_get_user():
-    client: Client = Client()
-    user: User = client.get_user("munchii")
-    assert user.username == "munchii"
-    assert user.is_contributor is True
-    assert user.is_public_profile is True
+def test_get_user(transport: Optional[FakePasteMyst]):
+    with Client(transport=transport) as client:
+        user: User = client.get_user("munchii")
+        assert user.username == "munchii"
+        assert user.is_contributor is True
+        assert user.is_public_profile is True